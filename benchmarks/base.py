@@ -0,0 +1,70 @@
+import json
+import os
+import timeit
+import uuid
+
+import django
+
+
+def setup():
+    """ Configure django and create a throw away test database. """
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def create_form(field_count=10, field_type='singleline', **kwargs):
+    """ Create a form with ``field_count`` fields of ``field_type``. """
+
+    from wagtailstreamforms.models import Form
+
+    fields = []
+    for i in range(field_count):
+        value = {'label': 'Field %s' % i, 'required': False}
+        if field_type in ['dropdown', 'multiselect', 'radio', 'checkboxes']:
+            value['choices'] = ['Option %s' % c for c in range(kwargs.pop('choice_count', 5))]
+        fields.append({'type': field_type, 'value': value, 'id': str(uuid.uuid4())})
+
+    defaults = {
+        'title': 'Benchmark form',
+        'slug': str(uuid.uuid4()),
+        'template_name': 'streamforms/form_block.html',
+        'fields': json.dumps(fields),
+    }
+    defaults.update(kwargs)
+
+    return Form.objects.create(**defaults)
+
+
+def measure(fn, number=100, repeat=5):
+    """ Returns the best time in seconds of a single call to ``fn``. """
+
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def report(title, rows, headings):
+    """ Print a simple aligned table. """
+
+    rows = [[str(c) for c in row] for row in rows]
+    widths = [max(len(str(h)), *(len(r[i]) for r in rows)) for i, h in enumerate(headings)]
+
+    print()
+    print(title)
+    print('  '.join(str(h).ljust(w) for h, w in zip(headings, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(c.ljust(w) for c, w in zip(row, widths)))
+
+
+def format_time(seconds):
+    if seconds < 0.001:
+        return '%.1f us' % (seconds * 1000000)
+    if seconds < 1:
+        return '%.2f ms' % (seconds * 1000)
+    return '%.2f s' % seconds
@@ -0,0 +1,40 @@
+"""
+Compares processing 1,000 submissions one at a time, as separate posts would, against
+processing them as a single batch with the submissions saved by one ``bulk_create``.
+"""
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(count=1000):
+    from django.db import transaction
+
+    from wagtailstreamforms.models import FormSubmission
+    from wagtailstreamforms.utils.batch import process_submission_batch
+
+    form = create_form(10, process_form_submission_hooks=['save_form_submission_data'])
+    items = [{'field-%s' % i: 'value %s %s' % (i, n) for i in range(10)} for n in range(count)]
+
+    def single():
+        for item in items:
+            with transaction.atomic():
+                data = dict(item, form_id=form.pk, form_reference='ref')
+                submitted = form.get_form(data)
+                submitted.is_valid()
+                form.process_form_submission(submitted)
+
+    def batch():
+        with transaction.atomic():
+            process_submission_batch(form, items)
+
+    results = []
+    for name, fn in [('one at a time', single), ('batch', batch)]:
+        FormSubmission.objects.all().delete()
+        seconds = measure(fn, number=1, repeat=3)
+        results.append([name, format_time(seconds), '%.0f/s' % (count / seconds)])
+
+    report('Processing %s submissions' % count, results, ['case', 'time', 'throughput'])
+
+
+if __name__ == '__main__':
+    setup()
+    run()
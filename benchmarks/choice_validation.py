@@ -0,0 +1,53 @@
+"""
+Compares validating large dropdown and multiselect fields with django's choice fields,
+which search the list of choices, against the indexed choice fields of the package.
+
+Each form is given a copy of the fields, so each field is copied before it is validated.
+"""
+import copy
+
+from benchmarks.base import format_time, measure, report, setup
+
+
+def run(choice_counts=(10, 1000, 8000), selected=20):
+    from django import forms
+    from wagtailstreamforms.forms import IndexedChoiceField, IndexedMultipleChoiceField
+
+    results = []
+
+    for choice_count in choice_counts:
+        choices = [('Option %s' % c, 'Option %s' % c) for c in range(choice_count)]
+        # the last choices are the worst case for a search of the list
+        value = choices[-1][0]
+        values = [c[0] for c in choices[-selected:]]
+
+        for name, django_field, indexed_field, data in [
+            ('dropdown', forms.ChoiceField, IndexedChoiceField, value),
+            ('multiselect', forms.MultipleChoiceField, IndexedMultipleChoiceField, values),
+        ]:
+            field = django_field(choices=choices)
+            indexed = indexed_field(choices=choices)
+            assert field.clean(data) == indexed.clean(data)
+
+            number = max(20, 200000 // choice_count)
+            searched = measure(lambda: copy.deepcopy(field).clean(data), number=number)
+            found = measure(lambda: copy.deepcopy(indexed).clean(data), number=number)
+
+            results.append([
+                name,
+                choice_count,
+                format_time(searched),
+                format_time(found),
+                '%.1fx' % (searched / found),
+            ])
+
+    report(
+        'Choice validation',
+        results,
+        ['field', 'choices', 'django', 'indexed', 'speedup']
+    )
+
+
+if __name__ == '__main__':
+    setup()
+    run()
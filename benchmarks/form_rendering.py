@@ -0,0 +1,53 @@
+"""
+Compares rendering a form block with the default template, with its includes flattened
+into a single template and served from the fragment cache.
+"""
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(field_counts=(10, 40, 50, 200)):
+    from django.core.cache import cache
+    from django.test import RequestFactory, override_settings
+
+    from wagtailstreamforms.blocks import WagtailFormBlock
+
+    block = WagtailFormBlock()
+    results = []
+
+    for field_count in field_counts:
+        form = create_form(field_count)
+        value = block.to_python({'form': form.pk, 'form_action': '.', 'form_reference': 'ref'})
+        number = max(2, 400 // field_count)
+
+        def render():
+            block.render(value, {'request': RequestFactory().get('/')})
+
+        default = measure(render, number=number)
+
+        with override_settings(WAGTAILSTREAMFORMS_FLATTEN_FORM_TEMPLATES=True):
+            flattened = measure(render, number=number)
+
+        with override_settings(WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True):
+            cache.clear()
+            render()
+            cached = measure(render, number=number)
+
+        results.append([
+            field_count,
+            format_time(default),
+            format_time(flattened),
+            '%.1fx' % (default / flattened),
+            format_time(cached),
+            '%.1fx' % (default / cached),
+        ])
+
+    report(
+        'Form block rendering',
+        results,
+        ['fields', 'default', 'flattened', 'speedup', 'fragment cache', 'speedup']
+    )
+
+
+if __name__ == '__main__':
+    setup()
+    run()
@@ -0,0 +1,48 @@
+"""
+Compares validating a submission by building the form for it against the compiled
+``FormValidator`` of the form revision.
+"""
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(field_counts=(5, 20, 50)):
+    from wagtailstreamforms.models import Form
+
+    results = []
+
+    for field_count in field_counts:
+        form = Form.objects.get(pk=create_form(field_count).pk)
+        data = {'field-%s' % i: 'value %s' % i for i in range(field_count)}
+        data.update({'form_id': str(form.pk), 'form_reference': 'ref'})
+        number = max(20, 4000 // field_count)
+
+        def with_form():
+            submitted = form.get_form(data)
+            submitted.is_valid()
+            return submitted.cleaned_data
+
+        validator = form.get_validator()
+        assert validator(data) == (with_form(), {})
+
+        built = measure(with_form, number=number)
+        compiled = measure(lambda: validator(data), number=number)
+
+        results.append([
+            field_count,
+            format_time(built),
+            '%.0f/s' % (1 / built),
+            format_time(compiled),
+            '%.0f/s' % (1 / compiled),
+            '%.1fx' % (built / compiled),
+        ])
+
+    report(
+        'Submission validation',
+        results,
+        ['fields', 'form', 'throughput', 'validator', 'throughput', 'speedup']
+    )
+
+
+if __name__ == '__main__':
+    setup()
+    run()
@@ -0,0 +1,49 @@
+"""
+Compares building the form fields StreamField with the registered field blocks built
+from scratch (as before they were cached) against the blocks shared per registry version.
+"""
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run():
+    from django.db.migrations.state import ModelState
+    from django.test import RequestFactory
+
+    from wagtailstreamforms import streamfield
+    from wagtailstreamforms.models import Form
+    from wagtailstreamforms.streamfield import FormFieldsStreamField
+
+    form = create_form(20)
+    field = Form._meta.get_field('fields')
+
+    def edit_page():
+        request = RequestFactory().get('/')
+        edit_handler = Form.edit_handler.bind_to(model=Form, request=request)
+        form_class = edit_handler.get_form_class()
+        edit_handler.bind_to(instance=form, form=form_class(instance=form)).render_form_content()
+
+    cases = [
+        ('construct FormFieldsStreamField', lambda: FormFieldsStreamField([]), 200),
+        ('clone field (migrations, checks)', field.clone, 200),
+        ('ModelState.from_model(Form)', lambda: ModelState.from_model(Form), 50),
+        ('admin edit form build + render', edit_page, 5),
+    ]
+
+    def cold(fn):
+        def wrapped():
+            streamfield._form_blocks = (None, None)
+            fn()
+        return wrapped
+
+    results = []
+    for name, fn, number in cases:
+        uncached = measure(cold(fn), number=number)
+        cached = measure(fn, number=number)
+        results.append([name, format_time(uncached), format_time(cached), '%.1fx' % (uncached / cached)])
+
+    report('FormFieldStreamBlock construction', results, ['case', 'rebuilt', 'shared', 'speedup'])
+
+
+if __name__ == '__main__':
+    setup()
+    run()
@@ -0,0 +1,68 @@
+"""
+Compares saving 1,000 submissions each in its own transaction, as separate requests would,
+against appending them to the submission buffer and the flush that saves them afterwards.
+"""
+import shutil
+import tempfile
+
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(count=1000):
+    from django.db import transaction
+    from django.test import override_settings
+
+    from wagtailstreamforms.models import FormSubmission
+    from wagtailstreamforms.utils.spool import flush_submissions, get_spool
+    from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data
+
+    form = create_form(10)
+    forms = []
+    for n in range(count):
+        data = {'field-%s' % i: 'value %s %s' % (i, n) for i in range(10)}
+        submitted = form.get_form(dict(data, form_id=form.pk, form_reference='ref'))
+        submitted.is_valid()
+        forms.append(submitted)
+
+    def save():
+        for submitted in forms:
+            with transaction.atomic():
+                save_form_submission_data(form, submitted)
+
+    def flush():
+        get_spool().rotate()
+        flush_submissions()
+
+    directory = tempfile.mkdtemp()
+    results = []
+
+    try:
+        for name, fsync in [('saved', False), ('buffered', False), ('buffered with fsync', True)]:
+            settings = override_settings(
+                WAGTAILSTREAMFORMS_SUBMISSION_BUFFER=name != 'saved',
+                WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR=directory,
+                WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FSYNC=fsync,
+                WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_THREAD=False,
+            )
+            with settings:
+                FormSubmission.objects.all().delete()
+                seconds = measure(save, number=1, repeat=3)
+                row = [name, format_time(seconds / count), '%.0f/s' % (count / seconds)]
+
+                if name == 'saved':
+                    row.append('')
+                else:
+                    # the submissions of the three runs are saved by the one flush
+                    row.append(format_time(measure(flush, number=1, repeat=1) / (count * 3)))
+                    get_spool().rotate()
+
+            results.append(row)
+    finally:
+        shutil.rmtree(directory)
+
+    report('Saving %s submissions' % count, results, ['case', 'per submission', 'throughput', 'flush per submission'])
+
+
+if __name__ == '__main__':
+    setup()
+    run()
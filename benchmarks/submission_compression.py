@@ -0,0 +1,80 @@
+"""
+Compares the stored size of form submissions and the cost of decoding them on the
+submission list and csv export paths for each ``WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION``.
+"""
+import json
+import random
+
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+WORDS = (
+    'the quick brown fox jumps over lazy dog we would like to know more about your product '
+    'pricing delivery order support please call me back tomorrow morning regarding invoice '
+    'account number reference thanks kind regards'
+).split()
+
+
+def free_text(rnd, words):
+    return ' '.join(rnd.choice(WORDS) for _ in range(words))
+
+
+def run(rows=1000):
+    from django.contrib.auth.models import User
+    from django.test import RequestFactory
+
+    from wagtailstreamforms.models import FormSubmission
+    from wagtailstreamforms.serializers import encode_form_data
+    from wagtailstreamforms.views import SubmissionListView
+
+    rnd = random.Random(0)
+    form = create_form(5, 'multiline')
+    user = User.objects.create_superuser('bench', 'bench@example.com', 'password')
+    names = [name for name, label in form.get_data_fields()[1:]]
+    payloads = [
+        json.dumps({name: free_text(rnd, rnd.randint(20, 400)) for name in names})
+        for _ in range(rows)
+    ]
+
+    def list_page():
+        request = RequestFactory().get('/')
+        request.user = user
+        response = SubmissionListView.as_view()(request, pk=form.pk)
+        response.render()
+
+    def export():
+        request = RequestFactory().get('/', {'action': 'CSV'})
+        request.user = user
+        SubmissionListView.as_view()(request, pk=form.pk)
+
+    results = []
+    plain_size = None
+
+    for codec in [None, 'zlib', 'lzma']:
+        FormSubmission.objects.all().delete()
+        encoded = [encode_form_data(payload, codec) for payload in payloads]
+        FormSubmission.objects.bulk_create([FormSubmission(form=form, form_data=value) for value in encoded])
+
+        size = sum(len(value) for value in encoded)
+        plain_size = plain_size or size
+        submissions = list(FormSubmission.objects.all())
+
+        results.append([
+            codec or 'none',
+            '%.1f KB' % (size / 1024),
+            '%.0f%%' % (100 - size * 100 / plain_size),
+            format_time(measure(lambda: [s.get_data() for s in submissions], number=1)),
+            format_time(measure(list_page, number=5)),
+            format_time(measure(export, number=1, repeat=3)),
+        ])
+
+    report(
+        'Submission compression (%s rows)' % rows,
+        results,
+        ['codec', 'stored size', 'saved', 'decode all rows', 'list page', 'csv export']
+    )
+
+
+if __name__ == '__main__':
+    setup()
+    run()
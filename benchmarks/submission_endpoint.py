@@ -0,0 +1,53 @@
+"""
+Compares posting valid and invalid submissions to the page the form is on, processed by the
+``before_serve_page`` hook, against posting them to the ``streamforms_submit`` view.
+"""
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(number=200):
+    from django.test import Client
+    from django.urls import reverse
+    from wagtail.core.models import Page, Site
+
+    form = create_form(10, process_form_submission_hooks=['save_form_submission_data'])
+
+    # a page a few levels down the tree like most pages with forms
+    page = Site.objects.get(is_default_site=True).root_page
+    for slug in ['about', 'company', 'contact']:
+        page = page.add_child(instance=Page(title=slug, slug=slug))
+    page_url = page.url
+    submit_url = reverse('streamforms_submit', kwargs={'pk': form.pk})
+    client = Client()
+
+    valid = {'form_id': form.pk, 'form_reference': 'ref'}
+    valid.update({'field-%s' % i: 'value %s' % i for i in range(10)})
+    invalid = {'form_id': form.pk}
+
+    results = []
+    for name, data in [('valid', valid), ('invalid', invalid)]:
+        for url in [page_url, submit_url]:
+            assert client.post(url, data).status_code in [200, 302]
+
+        hook = measure(lambda: client.post(page_url, data), number=number)
+        endpoint = measure(lambda: client.post(submit_url, data), number=number)
+
+        results.append([
+            name,
+            format_time(hook),
+            '%.0f/s' % (1 / hook),
+            format_time(endpoint),
+            '%.0f/s' % (1 / endpoint),
+            '%.1fx' % (hook / endpoint),
+        ])
+
+    report(
+        'Form submission (%s posts)' % number,
+        results,
+        ['submission', 'page hook', 'throughput', 'submit view', 'throughput', 'speedup']
+    )
+
+
+if __name__ == '__main__':
+    setup()
+    run()
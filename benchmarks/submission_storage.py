@@ -0,0 +1,53 @@
+"""
+Compares writing 1,000 submissions one at a time to each submission storage, then counting
+them and reading the first page of the submission listing.
+"""
+import shutil
+import tempfile
+
+from benchmarks.base import create_form, format_time, measure, report, setup
+
+
+def run(count=1000):
+    from django.db import transaction
+    from django.test import override_settings
+
+    from wagtailstreamforms.storage import get_storage_class
+
+    form = create_form(10)
+    submissions = [
+        {'form_data': '{"field-0": "value %s"}' % n, 'field_schema_id': form.field_schema_id}
+        for n in range(count)
+    ]
+
+    directory = tempfile.mkdtemp()
+    results = []
+
+    try:
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR=directory):
+            for name in ['orm', 'sqlite', 'jsonl']:
+                storage = get_storage_class(name)(form)
+
+                def write():
+                    for submission in submissions:
+                        with transaction.atomic():
+                            storage.write([submission])
+
+                seconds = measure(write, number=1, repeat=1)
+                results.append([
+                    name,
+                    format_time(seconds / count),
+                    '%.0f/s' % (count / seconds),
+                    format_time(measure(storage.count, number=10)),
+                    format_time(measure(lambda: list(storage.iterate(limit=25)), number=10)),
+                ])
+                storage.delete()
+    finally:
+        shutil.rmtree(directory)
+
+    report('Storing %s submissions' % count, results, ['storage', 'per write', 'throughput', 'count', 'first page'])
+
+
+if __name__ == '__main__':
+    setup()
+    run()
@@ -1,3 +1,5 @@
+from mock import patch
+
 from wagtailstreamforms.blocks import WagtailFormBlock
 from wagtailstreamforms.models import Form
 
@@ -10,7 +12,8 @@ class TestFormBlockTestCase(AppTestCase):
     def setUp(self):
         self.form = Form.objects.get(pk=1)
 
-    def test_render(self):
+    @patch('wagtailstreamforms.blocks.make_submission_token', return_value='some-token')
+    def test_render(self, make_submission_token):
         block = WagtailFormBlock()
 
         html = block.render(block.to_python({
@@ -25,6 +28,7 @@ class TestFormBlockTestCase(AppTestCase):
             '<input type="hidden" name="hidden" id="id_hidden" />',
             '<input id="id_form_id" name="form_id" type="hidden" value="%s">' % self.form.pk,
             '<input id="id_form_reference" name="form_reference" type="hidden" value="some-ref">',
+            '<input id="id_submission_token" name="submission_token" type="hidden" value="some-token">',
             '<div class="field-row">'
             '<label for="id_singleline">singleline</label>'
             '<input type="text" name="singleline" required id="id_singleline" />'
@@ -0,0 +1,100 @@
+import json
+import re
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import translation
+from mock import patch
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.models import Form
+
+from ..test_case import AppTestCase
+
+
+@override_settings(WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True)
+class TestFormBlockCacheTestCase(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.block = WagtailFormBlock()
+        self.value = self.block.to_python({
+            'form': self.form.pk,
+            'form_action': '.',
+            'form_reference': 'some-ref'
+        })
+
+    def render(self, value=None, **context):
+        request = self.rf.get('/')
+        context.setdefault('request', request)
+        return request, self.block.render(value or self.value, context)
+
+    def test_second_render_is_cached(self):
+        self.render()
+
+        with patch.object(Form, 'get_form') as get_form:
+            self.render()
+
+        get_form.assert_not_called()
+
+    def test_csrf_token_is_per_request(self):
+        request_1, html_1 = self.render()
+        request_2, html_2 = self.render()
+
+        token_1 = re.search('name="csrfmiddlewaretoken" value="(.+?)"', html_1).group(1)
+        token_2 = re.search('name="csrfmiddlewaretoken" value="(.+?)"', html_2).group(1)
+
+        self.assertIn('CSRF_COOKIE', request_1.META)
+        self.assertIn('CSRF_COOKIE', request_2.META)
+        self.assertNotEqual(token_1, token_2)
+        self.assertNotIn('placeholder', html_2)
+
+    def test_key_varies(self):
+        key = self.block.get_fragment_cache_key(self.value)
+
+        other_reference = self.block.to_python({'form': self.form.pk, 'form_action': '.', 'form_reference': 'b'})
+        other_action = self.block.to_python({'form': self.form.pk, 'form_action': '/', 'form_reference': 'some-ref'})
+        self.assertNotEqual(self.block.get_fragment_cache_key(other_reference), key)
+        self.assertNotEqual(self.block.get_fragment_cache_key(other_action), key)
+
+        with translation.override('fr'):
+            self.assertNotEqual(self.block.get_fragment_cache_key(self.value), key)
+
+        self.form.save()
+        self.assertNotEqual(self.block.get_fragment_cache_key(self.block.to_python({
+            'form': self.form.pk, 'form_action': '.', 'form_reference': 'some-ref'
+        })), key)
+
+    def test_invalid_form_is_not_cached(self):
+        self.render()
+        invalid_form = self.form.get_form({'form_id': self.form.pk, 'form_reference': 'some-ref'})
+        assert not invalid_form.is_valid()
+
+        request, html = self.render(invalid_stream_form_reference='some-ref', invalid_stream_form=invalid_form)
+
+        self.assertIn('This field is required.', html)
+
+    @override_settings(WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=False)
+    def test_disabled(self):
+        self.render()
+
+        with patch.object(Form, 'get_form') as get_form:
+            self.render()
+
+        get_form.assert_called_once()
+
+    def test_not_cached_without_request(self):
+        self.block.render(self.value, {})
+
+        with patch.object(Form, 'get_form') as get_form:
+            self.block.render(self.value, {})
+
+        get_form.assert_called_once()
@@ -0,0 +1,83 @@
+import json
+from urllib.parse import urlencode
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+from wagtail.core.models import Page
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.tokens import make_fragment_key
+
+from ..test_case import AppTestCase
+
+
+class TestFormBlockDeferredTestCase(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.block = WagtailFormBlock()
+        self.value = self.block.to_python({
+            'form': self.form.pk,
+            'form_action': '.',
+            'form_reference': 'some-ref'
+        })
+        self.url = '%s?%s' % (
+            reverse('streamforms_fragment', kwargs={'pk': self.form.pk}),
+            urlencode({'key': make_fragment_key(self.form.pk, 'some-ref', '.')})
+        )
+
+    def render(self, **context):
+        context.setdefault('request', self.rf.get('/'))
+        return self.block.render(self.value, context)
+
+    def test_renders_form_by_default(self):
+        self.assertIn('<form', self.render())
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='esi')
+    def test_renders_esi_include(self):
+        self.assertHTMLEqual(
+            self.render(),
+            '<esi:include src="%s" />' % self.url
+        )
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='fetch')
+    def test_renders_fetch_placeholder(self):
+        html = self.render()
+
+        self.assertNotIn('<form', html)
+        self.assertIn('data-streamforms-fragment="%s"' % self.url, html)
+        self.assertIn('/static/streamforms/js/fragments.js', html)
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='esi')
+    def test_fragment_url_includes_the_page(self):
+        page = Page.objects.get(url_path='/home/')
+        key = make_fragment_key(self.form.pk, 'some-ref', '.', page.pk)
+        self.assertIn(urlencode({'key': key}), self.render(page=page))
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='esi')
+    def test_invalid_form_is_rendered_inline(self):
+        invalid_form = self.form.get_form({'form_id': self.form.pk, 'form_reference': 'some-ref'})
+        invalid_form.is_valid()
+
+        html = self.render(invalid_stream_form_reference='some-ref', invalid_stream_form=invalid_form)
+
+        self.assertIn('<form', html)
+        self.assertIn('This field is required.', html)
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='esi')
+    def test_fragment_renders_form(self):
+        self.assertIn('<form', self.render(streamforms_fragment=True))
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='foo')
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.render()
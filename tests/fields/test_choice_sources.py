@@ -0,0 +1,165 @@
+import json
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+from django.urls import reverse
+
+from wagtailstreamforms.choices import FileChoices, QuerysetChoices, SourceChoices, get_choices, invalidate_choices
+from wagtailstreamforms.forms import IndexedChoiceField, IndexedMultipleChoiceField
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.wagtailstreamforms_fields import ChoiceSourceField, get_source_choices
+
+from ..test_case import AppTestCase
+
+
+class ChoiceSourceTests(AppTestCase):
+
+    def setUp(self):
+        self.calls = 0
+        self.colours = ['Red', 'Blue']
+
+    def source(self):
+        self.calls += 1
+        return self.colours
+
+    def test_choices_are_normalized(self):
+        with self.register_choice_source('sizes', lambda: ['S', ('m', 'Medium'), [1, 'One']]):
+            self.assertEqual(get_choices('sizes'), (('S', 'S'), ('m', 'Medium'), ('1', 'One')))
+
+    def test_choices_are_cached(self):
+        with self.register_choice_source('colours', self.source):
+            self.assertIs(get_choices('colours'), get_choices('colours'))
+            self.assertEqual(self.calls, 1)
+
+    def test_choices_expire(self):
+        with self.register_choice_source('colours', self.source, timeout=0):
+            get_choices('colours')
+            get_choices('colours')
+            self.assertEqual(self.calls, 2)
+
+    @override_settings(WAGTAILSTREAMFORMS_CHOICES_CACHE_TIMEOUT=0)
+    def test_timeout_setting(self):
+        with self.register_choice_source('colours', self.source):
+            get_choices('colours')
+            get_choices('colours')
+            self.assertEqual(self.calls, 2)
+
+    def test_invalidate_choices(self):
+        with self.register_choice_source('colours', self.source):
+            get_choices('colours')
+            self.colours = ['Green']
+            invalidate_choices('colours')
+            self.assertEqual(get_choices('colours'), (('Green', 'Green'),))
+            self.assertEqual(self.calls, 2)
+
+    def test_unknown_source_has_no_choices(self):
+        self.assertEqual(get_choices('foo'), ())
+
+    def test_source_choices_are_lazy(self):
+        with self.register_choice_source('colours', self.source):
+            choices = SourceChoices('colours', empty_label='Pick one')
+            self.assertEqual(self.calls, 0)
+            self.assertEqual(list(choices), [('', 'Pick one'), ('Red', 'Red'), ('Blue', 'Blue')])
+            self.assertEqual(choices.get_choice_index(), frozenset(['Red', 'Blue']))
+
+    def test_queryset_choices_invalidated_on_save(self):
+        User.objects.create(username='bill')
+        with self.register_choice_source('users', QuerysetChoices(User.objects.all(), 'username', 'username')):
+            self.assertEqual(get_choices('users'), (('bill', 'bill'),))
+            User.objects.create(username='ben')
+            self.assertEqual(set(get_choices('users')), {('bill', 'bill'), ('ben', 'ben')})
+            User.objects.filter(username='ben').get().delete()
+            self.assertEqual(get_choices('users'), (('bill', 'bill'),))
+
+    def test_queryset_choices_without_label_field(self):
+        user = User.objects.create(username='bill')
+        with self.register_choice_source('users', QuerysetChoices(User.objects.all())):
+            self.assertEqual(get_choices('users'), ((str(user.pk), 'bill'),))
+
+    def test_file_choices(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storage = FileSystemStorage(location=location)
+        storage.save('colours.json', ContentFile(json.dumps(['Red', ['blue', 'Blue']])))
+        storage.save('sizes.csv', ContentFile('s,Small\nm,Medium,ignored\nl\n'))
+
+        with self.register_choice_source('colours', FileChoices('colours.json', storage)):
+            self.assertEqual(get_choices('colours'), (('Red', 'Red'), ('blue', 'Blue')))
+
+        with self.register_choice_source('sizes', FileChoices('sizes.csv', storage)):
+            self.assertEqual(get_choices('sizes'), (('s', 'Small'), ('m', 'Medium'), ('l', 'l')))
+
+
+class ChoiceSourceFieldTests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'choicesource', 'value': {'label': 'Colour', 'required': True, 'source': 'colours',
+                                                   'empty_label': 'Pick one'}, 'id': 'a'},
+                {'type': 'choicesource', 'value': {'label': 'Colours', 'required': False, 'source': 'colours',
+                                                   'multiple': True}, 'id': 'b'},
+            ])
+        )
+
+    def test_formfields(self):
+        with self.register_choice_source('colours', lambda: ['Red', 'Blue']):
+            form = self.form.get_form()
+            self.assertIsInstance(form.fields['colour'], IndexedChoiceField)
+            self.assertIsInstance(form.fields['colours'], IndexedMultipleChoiceField)
+            self.assertEqual(list(form.fields['colour'].choices), [('', 'Pick one'), ('Red', 'Red'), ('Blue', 'Blue')])
+            self.assertEqual(list(form.fields['colours'].choices), [('Red', 'Red'), ('Blue', 'Blue')])
+
+    def test_validation(self):
+        with self.register_choice_source('colours', lambda: ['Red', 'Blue']):
+            data = {'form_id': self.form.pk, 'form_reference': 'ref', 'colour': 'Red', 'colours': ['Blue']}
+            self.assertTrue(self.form.get_form(data).is_valid())
+
+            data.update({'colour': 'Green', 'colours': ['Green']})
+            form = self.form.get_form(data)
+            self.assertFalse(form.is_valid())
+            self.assertEqual(set(form.errors), {'colour', 'colours'})
+
+    def test_choices_change_without_a_new_revision(self):
+        colours = ['Red']
+        with self.register_choice_source('colours', lambda: colours):
+            self.form.get_form()
+            colours.append('Green')
+            invalidate_choices('colours')
+            form = self.form.get_form({'form_id': self.form.pk, 'form_reference': 'ref', 'colour': 'Green'})
+            self.assertTrue(form.is_valid())
+
+    def test_definition_has_the_source_not_the_choices(self):
+        with self.register_choice_source('colours', lambda: ['Red', 'Blue']):
+            field = self.form.get_definition()['fields'][0]
+            self.assertEqual(field['choices_source'], 'colours')
+            self.assertNotIn('choices', field)
+
+    def test_json_schema(self):
+        schema = self.form.get_json_schema()
+        self.assertNotIn('enum', schema['properties']['colour'])
+        self.assertEqual(schema['properties']['colours']['type'], 'array')
+
+    def test_block_choices_are_the_sources(self):
+        with self.register_choice_source('colours', lambda: [], label='Colours'):
+            self.assertIn(('colours', 'Colours'), get_source_choices())
+            block = ChoiceSourceField().get_form_block()
+            self.assertIn(('colours', 'Colours'), list(block.child_blocks['source'].field.choices))
+
+    def test_api_view(self):
+        with self.register_choice_source('colours', lambda: ['Red', 'Blue']):
+            response = self.client.get(reverse('streamforms_api_choices', kwargs={'name': 'colours'}))
+            self.assertEqual(json.loads(response.content.decode()), {
+                'name': 'colours',
+                'choices': [['Red', 'Red'], ['Blue', 'Blue']],
+            })
+
+        response = self.client.get(reverse('streamforms_api_choices', kwargs={'name': 'colours'}))
+        self.assertEqual(response.status_code, 404)
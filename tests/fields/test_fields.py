@@ -108,7 +108,7 @@ class TestFields(AppTestCase):
         self.assertEqual(field.label, data['label'])
         self.assertEqual(field.required, data['required'])
         self.assertEqual(field.help_text, data['help_text'])
-        self.assertEqual(field.choices, [(c, c) for c in data['choices']])
+        self.assertEqual(field.choices, tuple((c, c) for c in data['choices']))
 
         data['empty_label'] = 'Please Select'
         field = cls.get_formfield(data)
@@ -124,7 +124,7 @@ class TestFields(AppTestCase):
         self.assertEqual(field.label, data['label'])
         self.assertEqual(field.required, data['required'])
         self.assertEqual(field.help_text, data['help_text'])
-        self.assertEqual(field.choices, [(c, c) for c in data['choices']])
+        self.assertEqual(field.choices, tuple((c, c) for c in data['choices']))
 
     def test_radio_field(self):
         data = self.get_form_field_data('radio')
@@ -136,7 +136,7 @@ class TestFields(AppTestCase):
         self.assertEqual(field.label, data['label'])
         self.assertEqual(field.required, data['required'])
         self.assertEqual(field.help_text, data['help_text'])
-        self.assertEqual(field.choices, [(c, c) for c in data['choices']])
+        self.assertEqual(field.choices, tuple((c, c) for c in data['choices']))
 
     def test_checkboxes_field(self):
         data = self.get_form_field_data('checkboxes')
@@ -148,7 +148,7 @@ class TestFields(AppTestCase):
         self.assertEqual(field.label, data['label'])
         self.assertEqual(field.required, data['required'])
         self.assertEqual(field.help_text, data['help_text'])
-        self.assertEqual(field.choices, [(c, c) for c in data['choices']])
+        self.assertEqual(field.choices, tuple((c, c) for c in data['choices']))
 
     def test_checkbox_field(self):
         data = self.get_form_field_data('checkbox')
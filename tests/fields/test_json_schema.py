@@ -0,0 +1,154 @@
+import json
+
+from wagtailstreamforms import wagtailstreamforms_fields as wsf_fields
+from wagtailstreamforms.models import Form
+
+from ..test_case import AppTestCase
+
+
+class TestFieldJsonSchema(AppTestCase):
+    fixtures = ['test']
+
+    def setUp(self):
+        self.form = Form.objects.get(pk=1)
+
+    def get_form_field_data(self, name):
+        return [item['value'] for item in self.form.get_form_fields() if item['type'] == name][0]
+
+    def test_singleline_field(self):
+        schema = wsf_fields.SingleLineTextField().get_json_schema(self.get_form_field_data('singleline'))
+        self.assertDictEqual(schema, {
+            'type': 'string', 'title': 'singleline', 'description': 'Help', 'minLength': 1
+        })
+
+    def test_optional_field_has_no_min_length(self):
+        schema = wsf_fields.SingleLineTextField().get_json_schema({'label': 'Name', 'required': False})
+        self.assertDictEqual(schema, {'type': 'string', 'title': 'Name'})
+
+    def test_default_value(self):
+        schema = wsf_fields.SingleLineTextField().get_json_schema({'label': 'Name', 'default_value': 'Bill'})
+        self.assertEqual(schema['default'], 'Bill')
+
+    def test_formats(self):
+        for name, cls, fmt in [
+            ('date', wsf_fields.DateField, 'date'),
+            ('datetime', wsf_fields.DateTimeField, 'date-time'),
+            ('email', wsf_fields.EmailField, 'email'),
+            ('singlefile', wsf_fields.SingleFileField, 'binary'),
+            ('multifile', wsf_fields.MultiFileField, 'binary'),
+        ]:
+            schema = cls().get_json_schema(self.get_form_field_data(name))
+            self.assertEqual(schema['type'], 'string')
+            self.assertEqual(schema['format'], fmt)
+
+    def test_number_field(self):
+        schema = wsf_fields.NumberField().get_json_schema(self.get_form_field_data('number'))
+        self.assertEqual(schema['type'], 'number')
+        self.assertNotIn('minLength', schema)
+
+    def test_optional_fields_can_be_empty(self):
+        for cls, schema in [
+            (wsf_fields.DateField, {'type': 'string', 'format': 'date'}),
+            (wsf_fields.DateTimeField, {'type': 'string', 'format': 'date-time'}),
+            (wsf_fields.EmailField, {'type': 'string', 'format': 'email'}),
+            (wsf_fields.NumberField, {'type': 'number'}),
+        ]:
+            self.assertDictEqual(cls().get_json_schema({'label': 'Field', 'help_text': 'Help', 'required': False}), {
+                'title': 'Field',
+                'description': 'Help',
+                'anyOf': [schema, {'type': 'string', 'maxLength': 0}],
+            })
+
+    def test_optional_field_values_are_valid(self):
+        names = ['date', 'datetime', 'email', 'url', 'number']
+        self.form.fields = json.dumps([
+            {'type': name, 'value': {'label': name, 'required': False}, 'id': name} for name in names
+        ])
+        self.form.save()
+
+        data = dict((name, '') for name in names)
+        data.update(form_id=str(self.form.pk), form_reference='ref')
+        form = self.form.get_form(data)
+        self.assertTrue(form.is_valid(), form.errors)
+        properties = self.form.get_json_schema()['properties']
+        self.assertEqual([properties[name]['anyOf'][1] for name in properties if name != 'url'],
+                         [{'type': 'string', 'maxLength': 0}] * 4)
+
+    def test_schema_date_times_are_valid(self):
+        self.form.fields = json.dumps([
+            {'type': 'datetime', 'value': {'label': 'When', 'required': True}, 'id': 'a'},
+        ])
+        self.form.save()
+        self.assertEqual(self.form.get_json_schema()['properties']['when']['format'], 'date-time')
+
+        for value in ['2020-01-02T03:04:05Z', '2020-01-02T03:04:05+00:00', '2020-01-02T03:04:05.5+01:00']:
+            form = self.form.get_form({'when': value, 'form_id': str(self.form.pk), 'form_reference': 'ref'})
+            self.assertTrue(form.is_valid(), (value, form.errors))
+
+    def test_url_field_accepts_what_the_form_does(self):
+        schema = wsf_fields.URLField().get_json_schema({'label': 'Site', 'required': True})
+        self.assertDictEqual(schema, {'type': 'string', 'title': 'Site', 'minLength': 1})
+
+        self.form.fields = json.dumps([
+            {'type': 'url', 'value': {'label': 'Site', 'required': True}, 'id': 'a'},
+        ])
+        self.form.save()
+        form = self.form.get_form({'site': 'example.com', 'form_id': str(self.form.pk), 'form_reference': 'ref'})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['site'], 'http://example.com')
+
+    def test_dropdown_field(self):
+        data = self.get_form_field_data('dropdown')
+        schema = wsf_fields.DropdownField().get_json_schema(data)
+        self.assertEqual(schema['enum'], ['Option 1', 'Option 2', 'Option 3'])
+
+        data['required'] = False
+        schema = wsf_fields.DropdownField().get_json_schema(data)
+        self.assertEqual(schema['enum'], ['', 'Option 1', 'Option 2', 'Option 3'])
+
+    def test_radio_field(self):
+        schema = wsf_fields.RadioField().get_json_schema(self.get_form_field_data('radio'))
+        self.assertEqual(schema['enum'], ['Option 1', 'Option 2', 'Option 3'])
+
+    def test_multiple_choice_fields(self):
+        for name, cls in [('multiselect', wsf_fields.MultiSelectField), ('checkboxes', wsf_fields.CheckboxesField)]:
+            schema = cls().get_json_schema(self.get_form_field_data(name))
+            self.assertDictEqual(schema, {
+                'type': 'array',
+                'title': name,
+                'description': 'Help',
+                'items': {'type': 'string', 'enum': ['Option 1', 'Option 2', 'Option 3']},
+                'uniqueItems': True,
+                'minItems': 1,
+            })
+
+    def test_checkbox_field(self):
+        data = self.get_form_field_data('checkbox')
+        schema = wsf_fields.CheckboxField().get_json_schema(data)
+        self.assertDictEqual(schema, {'type': 'boolean', 'title': 'checkbox', 'description': 'Help', 'enum': [True]})
+
+        data['required'] = False
+        self.assertNotIn('enum', wsf_fields.CheckboxField().get_json_schema(data))
+
+    def test_form_schema(self):
+        schema = self.form.get_json_schema()
+
+        self.assertEqual(schema['$schema'], 'http://json-schema.org/draft-07/schema#')
+        self.assertEqual(schema['type'], 'object')
+        self.assertEqual(schema['title'], 'Basic Form')
+        self.assertEqual(schema['version'], self.form.revision)
+        self.assertEqual(list(schema['properties']), [
+            'singleline', 'multiline', 'date', 'datetime', 'email', 'url', 'number', 'dropdown',
+            'multiselect', 'radio', 'checkboxes', 'checkbox', 'hidden', 'singlefile', 'multifile'
+        ])
+        self.assertEqual(schema['required'], list(schema['properties']))
+
+    def test_form_schema_is_cached_per_revision(self):
+        schema = self.form.get_json_schema()
+        self.assertEqual(self.form.get_json_schema(), schema)
+
+        self.form.title = 'Changed'
+        self.form.save()
+
+        self.assertEqual(self.form.get_json_schema()['title'], 'Changed')
+        self.assertNotEqual(self.form.get_json_schema()['version'], schema['version'])
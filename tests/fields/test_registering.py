@@ -15,7 +15,21 @@ class TestFieldRegistering(AppTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        del fields._fields['myfield']
+        fields.unregister('myfield')
 
     def test_field(self):
         self.assertIn('myfield', fields.get_fields())
+
+
+class TestFieldsVersion(AppTestCase):
+
+    def test_register_and_unregister_change_version(self):
+        version = fields.get_fields_version()
+
+        fields.register('versioned', MyField)
+        registered_version = fields.get_fields_version()
+        self.assertNotEqual(registered_version, version)
+
+        fields.unregister('versioned')
+        self.assertNotIn('versioned', fields.get_fields())
+        self.assertNotEqual(fields.get_fields_version(), registered_version)
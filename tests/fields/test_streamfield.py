@@ -19,7 +19,7 @@ class TestCorrectTypeRegistering(AppTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        del fields._fields['good']
+        fields.unregister('good')
 
     def test_child_blocks(self):
         field = FormFieldsStreamField([])
@@ -32,6 +32,25 @@ class TestCorrectTypeRegistering(AppTestCase):
             [b.__class__ for b in field.stream_block.child_blocks.values()]
         )
 
+    def test_child_blocks_are_shared(self):
+        first = FormFieldsStreamField([])
+        second = FormFieldsStreamField([])
+        self.assertIsNot(first.stream_block.child_blocks, second.stream_block.child_blocks)
+        self.assertIs(first.stream_block.child_blocks['good'], second.stream_block.child_blocks['good'])
+
+    def test_child_blocks_rebuilt_when_fields_change(self):
+        first = FormFieldsStreamField([])
+        fields.register('other', GoodField)
+        try:
+            second = FormFieldsStreamField([])
+        finally:
+            fields.unregister('other')
+
+        self.assertNotIn('other', first.stream_block.child_blocks)
+        self.assertIn('other', second.stream_block.child_blocks)
+        self.assertIsNot(first.stream_block.child_blocks['good'], second.stream_block.child_blocks['good'])
+        self.assertNotIn('other', FormFieldsStreamField([]).stream_block.child_blocks)
+
 
 class BadField:
     field_class = forms.CharField
@@ -45,7 +64,7 @@ class TestIncorrectTypeRegistering(AppTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        del fields._fields['bad']
+        fields.unregister('bad')
 
     def test_is_invalid_class(self):
         expected_error = "'%s' must be a subclass of '%s'" % (BadField, fields.BaseField)
@@ -36,9 +36,10 @@ class FormBuilderTests(AppTestCase):
 
     def test_get_form_class(self):
         fields = self.form.get_form_fields()
+        fields.append({'type': 'choicesource', 'value': {'label': 'choicesource', 'source': 'colours'}})
         form_class = FormBuilder(fields).get_form_class()
 
-        self.assertEqual(len(form_class().fields), 17)
+        self.assertEqual(len(form_class().fields), 19)
 
         formfields = form_class().fields
 
@@ -48,3 +49,4 @@ class FormBuilderTests(AppTestCase):
 
         self.assertIsInstance(formfields['form_id'], forms.CharField)
         self.assertIsInstance(formfields['form_reference'], forms.CharField)
+        self.assertIsInstance(formfields['submission_token'], forms.CharField)
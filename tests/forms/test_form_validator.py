@@ -0,0 +1,139 @@
+import json
+
+from django.utils.datastructures import MultiValueDict
+
+from wagtailstreamforms.forms import FormValidator
+from wagtailstreamforms.models import Form
+
+from ..test_case import AppTestCase
+
+
+VALID = {
+    'singleline': 'Bill',
+    'multiline': 'Some\ntext',
+    'date': '2018-01-01',
+    'datetime': '2018-01-01 10:00:00',
+    'email': 'email@example.com',
+    'url': 'http://example.com',
+    'number': '1',
+    'dropdown': 'Option 1',
+    'multiselect': ['Option 1', 'Option 2'],
+    'radio': 'Option 1',
+    'checkboxes': ['Option 1'],
+    'checkbox': 'on',
+    'hidden': 'secret',
+    'form_id': '1',
+    'form_reference': 'some-ref'
+}
+
+
+class FormValidatorParityTests(AppTestCase):
+    """ The validator should clean the same values and give the same errors as the form. """
+
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.form = Form.objects.get(pk=1)
+        self.validator = self.form.get_validator()
+
+    def get_files(self, names=('singlefile', 'multifile')):
+        files = MultiValueDict()
+        for name in names:
+            files.appendlist(name, self.get_file())
+        return files
+
+    def assertParity(self, data, files=None):
+        form = self.form.get_form(data, files)
+        form.is_valid()
+
+        cleaned_data, errors = self.validator(data, files)
+
+        self.assertEqual(cleaned_data, form.cleaned_data)
+        self.assertEqual(errors.get_json_data(), form.errors.get_json_data())
+        return cleaned_data, errors
+
+    def test_valid(self):
+        cleaned_data, errors = self.assertParity(VALID, self.get_files())
+        self.assertFalse(errors)
+        self.assertEqual(cleaned_data['number'], 1)
+
+    def test_empty(self):
+        cleaned_data, errors = self.assertParity({})
+        self.assertEqual(len(errors), 17)
+
+    def test_blank_values(self):
+        self.assertParity({name: '' for name in VALID})
+
+    def test_invalid_values(self):
+        data = dict(
+            VALID,
+            date='2018-13-01',
+            datetime='yesterday',
+            email='not an email',
+            url='not a url',
+            number='one',
+            dropdown='Option 9',
+            multiselect=['Option 1', 'Option 9'],
+            radio='',
+            checkboxes='Option 1',
+            checkbox='',
+        )
+        cleaned_data, errors = self.assertParity(data, self.get_files(['singlefile']))
+        self.assertEqual(
+            set(errors),
+            {'date', 'datetime', 'email', 'url', 'number', 'dropdown', 'multiselect', 'radio', 'checkboxes', 'checkbox',
+             'multifile'}
+        )
+
+    def test_json_values(self):
+        data = dict(VALID, number=1.5, checkbox=True, form_id=1, multiselect='Option 1')
+        self.assertParity(data, self.get_files())
+
+    def test_checkbox_strings(self):
+        for value in ['true', 'false', 'True', 'False', '0', '1']:
+            self.assertParity(dict(VALID, checkbox=value), self.get_files())
+
+    def test_surrounding_whitespace(self):
+        cleaned_data, errors = self.assertParity(dict(VALID, singleline='  Bill  '), self.get_files())
+        self.assertEqual(cleaned_data['singleline'], 'Bill')
+
+
+class FormValidatorCacheTests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+
+    def test_is_a_validator(self):
+        self.assertIsInstance(self.form.get_validator(), FormValidator)
+
+    def test_shared_by_instances_of_the_same_revision(self):
+        validator = Form.objects.get(pk=self.form.pk).get_validator()
+        self.assertIs(Form.objects.get(pk=self.form.pk).get_validator(), validator)
+
+    def test_rebuilt_for_new_revision(self):
+        validator = Form.objects.get(pk=self.form.pk).get_validator()
+
+        self.form.fields = json.dumps([
+            {'type': 'singleline', 'value': {'label': 'Other', 'required': True}, 'id': 'a'},
+        ])
+        self.form.save()
+
+        new_validator = Form.objects.get(pk=self.form.pk).get_validator()
+        self.assertIsNot(new_validator, validator)
+        self.assertIn('other', new_validator({})[1])
+
+    def test_unsaved_fields_are_not_shared(self):
+        form = Form.objects.get(pk=self.form.pk)
+        form.fields = json.dumps([
+            {'type': 'singleline', 'value': {'label': 'Other', 'required': True}, 'id': 'a'},
+        ])
+
+        self.assertIn('other', form.get_validator()({})[1])
+        self.assertIn('name', Form.objects.get(pk=self.form.pk).get_validator()({})[1])
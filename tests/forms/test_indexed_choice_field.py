@@ -0,0 +1,92 @@
+import copy
+import json
+
+from django import forms
+from django.core.exceptions import ValidationError
+
+from wagtailstreamforms.forms import IndexedChoiceField, IndexedMultipleChoiceField
+from wagtailstreamforms.models import Form
+
+from ..test_case import AppTestCase
+
+
+class IndexedChoiceFieldTests(AppTestCase):
+
+    def test_choices_are_a_tuple(self):
+        field = IndexedChoiceField(choices=[('a', 'A'), ('b', 'B')])
+        self.assertEqual(field.choices, (('a', 'A'), ('b', 'B')))
+        self.assertIs(field.widget.choices, field.choices)
+
+    def test_valid_value(self):
+        field = IndexedChoiceField(choices=[('a', 'A'), ('b', 'B')])
+        self.assertEqual(field.clean('a'), 'a')
+        with self.assertRaises(ValidationError):
+            field.clean('c')
+
+    def test_valid_value_in_group(self):
+        field = IndexedChoiceField(choices=[('a', 'A'), ('Group', [('b', 'B')])])
+        self.assertTrue(field.valid_value('b'))
+        self.assertFalse(field.valid_value('Group'))
+
+    def test_non_string_values(self):
+        field = IndexedChoiceField(choices=[(1, 'One')])
+        self.assertTrue(field.valid_value(1))
+        self.assertTrue(field.valid_value('1'))
+
+    def test_callable_choices(self):
+        choices = [('a', 'A')]
+        field = IndexedChoiceField(choices=lambda: choices)
+        self.assertTrue(field.valid_value('a'))
+        choices.append(('b', 'B'))
+        self.assertTrue(field.valid_value('b'))
+
+    def test_setting_choices_resets_index(self):
+        field = IndexedChoiceField(choices=[('a', 'A')])
+        self.assertTrue(field.valid_value('a'))
+        field.choices = [('b', 'B')]
+        self.assertFalse(field.valid_value('a'))
+        self.assertTrue(field.valid_value('b'))
+
+    def test_copies_share_choices_and_index(self):
+        field = IndexedChoiceField(choices=[('a', 'A')])
+        copied = copy.deepcopy(field)
+        self.assertIs(copied.choices, field.choices)
+        self.assertIs(copied.get_choice_index(), field.get_choice_index())
+        self.assertIsNot(copied.widget, field.widget)
+
+    def test_multiple_choice(self):
+        field = IndexedMultipleChoiceField(choices=[('a', 'A'), ('b', 'B')])
+        self.assertEqual(field.clean(['a', 'b']), ['a', 'b'])
+        with self.assertRaises(ValidationError):
+            field.clean(['a', 'c'])
+
+
+class FormClassTests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            template_name='streamforms/form_block.html',
+            slug='form',
+            fields=json.dumps([
+                {'type': 'dropdown', 'value': {'label': 'Colour', 'required': True, 'choices': ['Red', 'Blue']},
+                 'id': 'a'},
+            ])
+        )
+
+    def test_form_class_is_shared_per_revision(self):
+        form = Form.objects.get(pk=self.form.pk)
+        self.assertIs(form.get_form_class(), self.form.get_form_class())
+
+        self.form.save()
+        self.assertIsNot(self.form.get_form_class(), form.get_form_class())
+
+    def test_forms_share_the_choices(self):
+        first, second = self.form.get_form(), self.form.get_form()
+        self.assertIsNot(first.fields['colour'], second.fields['colour'])
+        self.assertIs(first.fields['colour'].choices, second.fields['colour'].choices)
+        self.assertIsInstance(first.fields['colour'].widget, forms.Select)
+
+    def test_forms_share_the_choice_index(self):
+        first, second = self.form.get_form(), self.form.get_form()
+        self.assertIs(first.fields['colour'].get_choice_index(), second.fields['colour'].get_choice_index())
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from django.core.exceptions import ValidationError
+from django.test import override_settings
+
+from wagtailstreamforms.forms import ISODateTimeField
+
+from ..test_case import AppTestCase
+
+
+class ISODateTimeFieldTests(AppTestCase):
+
+    def test_input_formats(self):
+        field = ISODateTimeField()
+        self.assertEqual(field.clean('2020-01-02 03:04'), datetime(2020, 1, 2, 3, 4))
+        self.assertEqual(field.clean('01/02/2020 03:04'), datetime(2020, 1, 2, 3, 4))
+
+    @override_settings(USE_TZ=True, TIME_ZONE='UTC')
+    def test_iso_8601(self):
+        field = ISODateTimeField()
+        expected = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        self.assertEqual(field.clean('2020-01-02T03:04:05Z'), expected)
+        self.assertEqual(field.clean('2020-01-02T04:04:05+01:00'), expected)
+        self.assertEqual(field.clean('2020-01-02T03:04:05'), expected)
+
+    @override_settings(USE_TZ=False, TIME_ZONE='UTC')
+    def test_iso_8601_is_naive_without_time_zone_support(self):
+        field = ISODateTimeField()
+        self.assertEqual(field.clean('2020-01-02T04:04:05+01:00'), datetime(2020, 1, 2, 3, 4, 5))
+
+    def test_invalid(self):
+        field = ISODateTimeField()
+        for value in ['2020-13-45T03:04:05Z', '2020-01-02T03:04:05+25', 'tomorrow']:
+            with self.assertRaises(ValidationError):
+                field.clean(value)
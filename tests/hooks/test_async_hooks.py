@@ -0,0 +1,89 @@
+import json
+import threading
+
+from django.test import override_settings
+from mock import patch
+
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils import dispatch
+
+from ..test_case import AppTestCase
+
+
+def run_on_commit(fn):
+    fn()
+
+
+class TestAsyncHooks(AppTestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['async_hook', 'sync_hook'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+
+    def record(self, name):
+        def hook(instance, form):
+            self.calls.append((name, threading.current_thread().name, instance))
+        hook.__name__ = name
+        return hook
+
+    def process(self):
+        async_hook = self.record('async_hook')
+        sync_hook = self.record('sync_hook')
+
+        with self.register_hook('process_form_submission', async_hook, run_async=True), \
+                self.register_hook('process_form_submission', sync_hook, order=1):
+            self.form.process_form_submission(self.form.get_form({'name': 'Bill'}))
+            dispatch.wait_for_hooks(timeout=5)
+
+        return {name: (thread, instance) for name, thread, instance in self.calls}
+
+    def test_register_marks_hook(self):
+        hook = self.record('async_hook')
+
+        with self.register_hook('some_hook', hook, run_async=True):
+            self.assertTrue(hook.run_async)
+
+    def test_async_hooks_run_inline_by_default(self):
+        calls = self.process()
+
+        self.assertEqual(calls['async_hook'][0], threading.current_thread().name)
+        self.assertEqual(calls['sync_hook'][0], threading.current_thread().name)
+
+    @override_settings(WAGTAILSTREAMFORMS_ASYNC_HOOK_WORKERS=2)
+    @patch('wagtailstreamforms.utils.dispatch.transaction.on_commit', run_on_commit)
+    def test_async_hooks_run_in_background(self):
+        calls = self.process()
+
+        self.assertNotEqual(calls['async_hook'][0], threading.current_thread().name)
+        self.assertEqual(calls['async_hook'][1], self.form)
+        self.assertEqual(calls['sync_hook'][0], threading.current_thread().name)
+
+    @override_settings(WAGTAILSTREAMFORMS_ASYNC_HOOK_WORKERS=2)
+    def test_async_hooks_wait_for_commit(self):
+        with patch('wagtailstreamforms.utils.dispatch.transaction.on_commit') as on_commit:
+            calls = self.process()
+
+        self.assertNotIn('async_hook', calls)
+        self.assertIn('sync_hook', calls)
+        self.assertTrue(on_commit.called)
+
+    @override_settings(WAGTAILSTREAMFORMS_ASYNC_HOOK_WORKERS=2)
+    @patch('wagtailstreamforms.utils.dispatch.transaction.on_commit', run_on_commit)
+    def test_errors_in_async_hooks_are_logged(self):
+        def failing_hook(instance, form):
+            raise ValueError('oops')
+        failing_hook.run_async = True
+
+        with patch.object(dispatch.logger, 'exception') as log:
+            dispatch.dispatch_hook(failing_hook, self.form, None)
+            dispatch.wait_for_hooks(timeout=5)
+
+        self.assertTrue(log.called)
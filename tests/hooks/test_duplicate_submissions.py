@@ -0,0 +1,170 @@
+import json
+import re
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings
+from mock import patch
+from wagtail.core.models import Page
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.batch import process_submission_batch
+from wagtailstreamforms.utils.tokens import get_submission_key
+from wagtailstreamforms.wagtail_hooks import process_form
+from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data
+
+from ..test_case import AppTestCase
+
+
+class DuplicateSubmissionTests(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+
+    def post(self, token='abc'):
+        request = self.rf.post('/fake/', {
+            'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token
+        })
+        request.user = AnonymousUser()
+        return process_form(self.page, request)
+
+    def render(self):
+        block = WagtailFormBlock()
+        value = block.to_python({'form': self.form.pk, 'form_action': '.', 'form_reference': 'ref'})
+        return block.render(value, {'request': self.rf.get('/')})
+
+    def test_each_render_has_a_new_token(self):
+        with patch('wagtailstreamforms.blocks.make_submission_token', side_effect=['first', 'second']):
+            self.assertIn('name="submission_token" value="first"', self.render())
+            self.assertIn('name="submission_token" value="second"', self.render())
+
+    @override_settings(WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True)
+    def test_cached_fragments_have_a_new_token(self):
+        with patch('wagtailstreamforms.blocks.make_submission_token', side_effect=['first', 'second']):
+            self.assertIn('value="first"', self.render())
+            self.assertIn('value="second"', self.render())
+
+    def test_duplicate_is_only_processed_once(self):
+        calls = []
+
+        def hook(instance, form):
+            calls.append(form)
+
+        self.form.process_form_submission_hooks = ['save_form_submission_data', 'hook']
+        self.form.save()
+
+        with self.register_hook('process_form_submission', hook):
+            self.assertEqual(self.post().status_code, 302)
+            self.assertEqual(self.post().status_code, 302)
+            self.post(token='other')
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_submissions_without_a_token_are_not_duplicates(self):
+        self.post(token='')
+        self.post(token='')
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_token_is_saved_in_its_own_column(self):
+        self.post()
+        submission = FormSubmission.objects.get()
+        self.assertEqual(submission.submission_token, get_submission_key('abc', {
+            'name': 'Bill', 'form_id': str(self.form.pk), 'form_reference': 'ref'
+        }))
+        self.assertNotIn('submission_token', submission.get_data())
+
+    def test_token_is_released_when_a_hook_fails(self):
+        def failing_hook(instance, form):
+            raise ValueError('failed')
+
+        self.form.process_form_submission_hooks = ['failing_hook']
+        self.form.save()
+
+        with self.register_hook('process_form_submission', failing_hook):
+            with self.assertRaises(ValueError):
+                self.post()
+
+        self.form.process_form_submission_hooks = ['save_form_submission_data']
+        self.form.save()
+        self.post()
+
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_saved_token_is_not_saved_again(self):
+        # after the window the token is only detected by the unique column
+        self.post()
+        cache.clear()
+        self.post()
+
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_batch_duplicates(self):
+        self.post(token='saved')
+        cache.clear()
+
+        results = process_submission_batch(self.form, [
+            {'name': 'a', 'submission_token': 'one'},
+            {'name': 'a', 'submission_token': 'one'},
+            {'name': 'Bill', 'submission_token': 'saved', 'form_reference': 'ref'},
+            {'name': 'd'},
+        ])
+
+        self.assertEqual([result['status'] for result in results], ['processed', 'duplicate', 'processed', 'processed'])
+        # the saved submission is only detected by the unique column
+        self.assertEqual(FormSubmission.objects.count(), 3)
+        self.assertEqual(FormSubmission.objects.filter(submission_token=None).count(), 1)
+
+    def test_batch_save_skips_saved_tokens(self):
+        self.post(token='saved')
+
+        forms = []
+        for token in ['saved', 'new', 'new']:
+            form = self.form.get_form({
+                'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token
+            })
+            assert form.is_valid()
+            forms.append(form)
+
+        save_form_submission_data.process_batch(self.form, forms)
+
+        self.assertEqual(FormSubmission.objects.filter(submission_token=forms[1].cleaned_data['submission_token']).count(), 1)
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_same_token_with_different_values_is_not_a_duplicate(self):
+        # a page served from a cache gives every visitor the same token
+        self.post()
+        request = self.rf.post('/fake/', {
+            'name': 'Ben', 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': 'abc'
+        })
+        request.user = AnonymousUser()
+        process_form(self.page, request)
+        self.post()
+
+        self.assertEqual(sorted(s.get_data()['name'] for s in FormSubmission.objects.all()), ['Ben', 'Bill'])
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True, WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True)
+    def test_visitors_of_a_cached_page_are_not_duplicates(self):
+        html = self.render()
+        token = re.search('name="submission_token" value="([^"]+)"', html).group(1)
+
+        for name in ['Bill', 'Ben']:
+            request = self.rf.post('/fake/', {
+                'name': name, 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token,
+                'form_token': re.search('name="form_token" value="([^"]+)"', html).group(1)
+            })
+            request.user = AnonymousUser()
+            self.assertEqual(process_form(self.page, request).status_code, 302)
+
+        self.assertEqual(FormSubmission.objects.count(), 2)
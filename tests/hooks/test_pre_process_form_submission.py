@@ -0,0 +1,200 @@
+import json
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.test import override_settings
+from django.utils import baseconv
+from django.urls import reverse
+from mock import patch
+from wagtail.core.models import Page
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.tokens import (
+    FORM_RENDERED_SALT,
+    get_form_rendered_age,
+    make_form_rendered,
+    make_fragment_key
+)
+from wagtailstreamforms.wagtail_hooks import process_form
+
+from ..test_case import AppTestCase
+
+
+class PreProcessTestCase(AppTestCase):
+
+    def setUp(self):
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+
+    def post(self, data=None, **extra):
+        post_data = {'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref'}
+        post_data.update(data or {})
+        request = self.rf.post('/fake/', post_data, **extra)
+        request.user = AnonymousUser()
+        return process_form(self.page, request)
+
+    def make_stale_rendered(self, seconds):
+        signer = signing.Signer(salt=FORM_RENDERED_SALT)
+        timestamp = baseconv.base62.encode(int(time.time() - seconds))
+        return signer.sign('%s:%s' % (self.form.pk, timestamp))
+
+
+class PreProcessHookTests(PreProcessTestCase):
+
+    def test_hook_rejects_before_the_form_is_built(self):
+        def reject(instance, request):
+            return 'Go away'
+
+        with self.register_hook('pre_process_form_submission', reject), \
+                patch.object(Form, 'get_form') as get_form:
+            response = self.post()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content, b'Go away')
+        self.assertFalse(get_form.called)
+        self.assertEqual(self.form.get_submission_class().objects.count(), 0)
+
+    def test_json_rejection(self):
+        def reject(instance, request):
+            return 'Go away'
+
+        with self.register_hook('pre_process_form_submission', reject):
+            response = self.post(HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content.decode())['errors'], {
+            '__all__': [{'message': 'Go away', 'code': 'rejected'}]
+        })
+
+    def test_hook_returning_nothing_continues(self):
+        with self.register_hook('pre_process_form_submission', lambda instance, request: None):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.form.get_submission_class().objects.count(), 1)
+
+    def test_submit_view_rejects(self):
+        with self.register_hook('pre_process_form_submission', lambda instance, request: 'Go away'):
+            response = self.client.post(reverse('streamforms_submit', kwargs={'pk': self.form.pk}), {
+                'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref'
+            })
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_fragment_view_rejects(self):
+        with self.register_hook('pre_process_form_submission', lambda instance, request: 'Go away'):
+            url = '%s?key=%s' % (
+                reverse('streamforms_fragment', kwargs={'pk': self.form.pk}), make_fragment_key(self.form.pk, 'ref', '.')
+            )
+            response = self.client.post(url, {
+                'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref'
+            })
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_api_view_rejects(self):
+        with self.register_hook('pre_process_form_submission', lambda instance, request: 'Go away'):
+            response = self.client.post(
+                reverse('streamforms_api_submit', kwargs={'slug': 'form'}),
+                json.dumps({'name': 'Bill'}),
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content.decode())['errors']['__all__'][0]['code'], 'rejected')
+
+
+class BuiltinChecksTests(PreProcessTestCase):
+
+    def test_checks_are_disabled_by_default(self):
+        response = self.post({'website': 'spam'})
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_HONEYPOT_FIELD='website')
+    def test_honeypot(self):
+        self.assertEqual(self.post({'website': 'http://spam.example.com'}).status_code, 400)
+        self.assertEqual(self.post({'website': ''}).status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_HONEYPOT_FIELD='website', WAGTAILSTREAMFORMS_ENABLE_BUILTIN_HOOKS=False)
+    def test_builtin_hooks_setting_disables_checks(self):
+        self.assertEqual(self.post({'website': 'http://spam.example.com'}).status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_MAX_SUBMISSION_SIZE=2000)
+    def test_submission_size(self):
+        self.assertEqual(self.post({'name': 'x' * 4000}).status_code, 400)
+        self.assertEqual(self.post().status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_MIN_FILL_TIME=5)
+    def test_min_fill_time(self):
+        self.assertEqual(self.post({'form_rendered': make_form_rendered(self.form.pk)}).status_code, 400)
+        self.assertEqual(self.post({'form_rendered': self.make_stale_rendered(10)}).status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_MIN_FILL_TIME=5)
+    def test_min_fill_time_rejects_missing_or_invalid_stamps(self):
+        self.assertEqual(self.post().status_code, 400)
+        self.assertEqual(self.post({'form_rendered': 'foo'}).status_code, 400)
+
+    def post_json(self, data):
+        return self.client.post(
+            reverse('streamforms_api_submit', kwargs={'slug': 'form'}),
+            json.dumps(dict({'name': 'Bill'}, **data)),
+            content_type='application/json'
+        )
+
+    @override_settings(WAGTAILSTREAMFORMS_HONEYPOT_FIELD='website')
+    def test_honeypot_json(self):
+        self.assertEqual(self.post_json({'website': 'http://spam.example.com'}).status_code, 400)
+        self.assertEqual(self.post_json({'website': ''}).status_code, 200)
+        self.assertEqual(self.form.get_submission_class().objects.count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_MIN_FILL_TIME=5)
+    def test_min_fill_time_json(self):
+        self.assertEqual(self.post_json({}).status_code, 400)
+        self.assertEqual(self.post_json({'form_rendered': 5}).status_code, 400)
+        self.assertEqual(self.post_json({'form_rendered': make_form_rendered(self.form.pk)}).status_code, 400)
+        self.assertEqual(self.post_json({'form_rendered': self.make_stale_rendered(10)}).status_code, 200)
+        self.assertEqual(self.form.get_submission_class().objects.count(), 1)
+
+
+class FormRenderedTests(PreProcessTestCase):
+
+    def test_age(self):
+        self.assertLess(get_form_rendered_age(make_form_rendered(self.form.pk), self.form.pk), 1)
+        self.assertGreaterEqual(get_form_rendered_age(self.make_stale_rendered(10), self.form.pk), 10)
+
+    def test_other_form(self):
+        self.assertIsNone(get_form_rendered_age(make_form_rendered(self.form.pk + 1), self.form.pk))
+
+    def render(self):
+        block = WagtailFormBlock()
+        value = block.to_python({'form': self.form.pk, 'form_action': '.', 'form_reference': 'ref'})
+        return block.render(value, {'request': self.rf.get('/')})
+
+    def test_fields_are_not_rendered_by_default(self):
+        html = self.render()
+        self.assertNotIn('form_rendered', html)
+        self.assertNotIn('website', html)
+
+    @override_settings(WAGTAILSTREAMFORMS_MIN_FILL_TIME=5, WAGTAILSTREAMFORMS_HONEYPOT_FIELD='website')
+    def test_fields_are_rendered(self):
+        html = self.render()
+        self.assertIn('name="form_rendered"', html)
+        self.assertIn('name="website"', html)
+
+    @override_settings(WAGTAILSTREAMFORMS_MIN_FILL_TIME=5, WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True)
+    def test_cached_fragments_are_given_a_new_stamp(self):
+        self.form.save()
+        with patch('wagtailstreamforms.blocks.make_form_rendered', return_value='first'):
+            self.assertIn('value="first"', self.render())
+        with patch('wagtailstreamforms.blocks.make_form_rendered', return_value='second'):
+            self.assertIn('value="second"', self.render())
@@ -1,3 +1,5 @@
+import json
+
 from django.contrib.auth.models import AnonymousUser
 from django.test import override_settings
 from django.test.client import Client
@@ -247,6 +249,83 @@ class TestHook(AppTestCase):
             }
         )
 
+    def test_invalid_json_request_returns_errors(self):
+        form = self.test_form()
+        form.error_message = 'oops'
+        form.save()
+        fake_request = self.rf.post('/fake/', {
+            'singleline': 'Bill',
+            'form_id': form.pk,
+            'form_reference': 'some-ref'
+        }, HTTP_ACCEPT='application/json')
+        fake_request.user = AnonymousUser()
+
+        with patch.object(Page, 'get_context') as get_context:
+            response = process_form(self.page, fake_request)
+
+        self.assertFalse(get_context.called)
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.content.decode())
+        self.assertEqual(data['message'], 'oops')
+        self.assertNotIn('singleline', data['errors'])
+        self.assertEqual(data['errors']['multiline'], [{'message': 'This field is required.', 'code': 'required'}])
+        assert not self.mock_error_message.called, 'messages.error should not have been called'
+
+    def test_valid_json_request_returns_redirect_url(self):
+        form = self.test_form()
+        form.success_message = 'well done'
+        form.save()
+        fake_request = self.rf.post('/fake/', {
+            'singleline': 'Bill',
+            'multiline': 'Bill',
+            'date': '2018-01-01',
+            'datetime': '2018-01-01 00:00:00',
+            'email': 'email@example.com',
+            'url': 'http://google.co.uk',
+            'number': 1,
+            'dropdown': 'Option 1',
+            'multiselect': 'Option 1',
+            'radio': 'Option 1',
+            'checkboxes': 'Option 1',
+            'checkbox': 'on',
+            'hidden': 'secret',
+            'singlefile': self.get_file(),
+            'multifile': self.get_file(),
+            'form_id': form.pk,
+            'form_reference': 'some-ref'
+        }, HTTP_ACCEPT='application/json')
+        fake_request.user = AnonymousUser()
+
+        response = process_form(self.page, fake_request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(
+            json.loads(response.content.decode()),
+            {'message': 'well done', 'redirect_url': self.page.get_url(fake_request)}
+        )
+        assert not self.mock_success_message.called, 'messages.success should not have been called'
+
+    def test_invalid_ajax_request_returns_only_the_form(self):
+        form = self.test_form()
+        fake_request = self.rf.post('/fake/', {
+            'form_id': form.pk,
+            'form_reference': 'some-ref'
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        fake_request.user = AnonymousUser()
+
+        with patch.object(Page, 'get_context') as get_context:
+            response = process_form(self.page, fake_request)
+
+        self.assertFalse(get_context.called)
+        self.assertEqual(response.status_code, 200)
+
+        html = response.content.decode()
+        self.assertTrue(html.strip().startswith('<h2>'))
+        self.assertIn('action="/fake/"', html)
+        self.assertIn('value="some-ref"', html)
+        self.assertIn('This field is required.', html)
+
     def tearDown(self):
         self.mock_messages_error.stop()
         self.mock_messages_success.stop()
@@ -2,9 +2,11 @@ import json
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.http import QueryDict
+from django.test import override_settings
 
 from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data
 from wagtailstreamforms.models import Form
+from wagtailstreamforms.serializers import get_form_data_codec
 from ..test_case import AppTestCase
 
 
@@ -63,3 +65,59 @@ class TestHook(AppTestCase):
         self.assertEqual(instance.get_submission_class().objects.count(), 1)
         self.assertDictEqual(json.loads(instance.get_submission_class().objects.all()[0].form_data), expected_data)
         self.assertEqual(instance.get_submission_class().objects.all()[0].files.count(), 2)
+        self.assertEqual(instance.get_submission_class().objects.all()[0].field_schema, instance.field_schema)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION='zlib')
+    def test_saves_compressed_record(self):
+        instance = self.test_form()
+
+        data_dict = {
+            'singleline': 'text ' * 100,
+            'form_id': instance.pk,
+            'form_reference': 'some-ref'
+        }
+        files_dict = QueryDict(mutable=True)
+        files_dict.update({'multifile': self.get_file()})
+
+        form_class = instance.get_form(data=data_dict, files=files_dict)
+
+        assert form_class.is_valid()
+
+        save_form_submission_data(instance, form_class)
+
+        submission = instance.get_submission_class().objects.get()
+        self.assertEqual(get_form_data_codec(submission.form_data), 'zlib')
+        self.assertEqual(submission.get_data()['singleline'], data_dict['singleline'].strip())
+
+    def test_batch_saves_records(self):
+        instance = Form.objects.create(
+            title='Form',
+            template_name='streamforms/form_block.html',
+            slug='form',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'singleline', 'required': True}, 'id': 'a'},
+                {'type': 'multifile', 'value': {'label': 'multifile', 'required': False}, 'id': 'b'},
+            ])
+        )
+
+        files_dict = QueryDict(mutable=True)
+        files_dict.update({'multifile': self.get_file()})
+        forms = [
+            instance.get_form(data={'singleline': 'text %s' % i, 'form_id': instance.pk, 'form_reference': 'ref'},
+                              files=files_dict if i == 2 else None)
+            for i in range(3)
+        ]
+        for form in forms:
+            assert form.is_valid()
+
+        # the form with files is saved on its own, the others in a single query
+        with self.assertNumQueries(3):
+            save_form_submission_data.process_batch(instance, forms)
+
+        submissions = instance.get_submission_class().objects.order_by('pk')
+        self.assertEqual(
+            sorted(submission.get_data()['singleline'] for submission in submissions),
+            ['text 0', 'text 1', 'text 2']
+        )
+        self.assertEqual(sum(submission.files.count() for submission in submissions), 1)
+        self.assertTrue(all(submission.field_schema == instance.field_schema for submission in submissions))
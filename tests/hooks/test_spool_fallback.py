@@ -0,0 +1,205 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import IntegrityError, OperationalError
+from django.test import override_settings
+from django.utils.datastructures import MultiValueDict
+from mock import patch
+from wagtail.core.models import Page
+
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.spool import get_fallback_spool, process_form_submission, replay_spool
+from wagtailstreamforms.wagtail_hooks import process_form
+from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data
+
+from ..test_case import AppTestCase
+
+
+class SpoolFallbackTests(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR=self.dir)
+        self.settings.enable()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+                {'type': 'multifile', 'value': {'label': 'Files', 'required': False}, 'id': 'b'},
+            ])
+        )
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def get_form(self, token='abc', files=None):
+        data = {'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token}
+        form = self.form.get_form(data, files or MultiValueDict())
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def database_down(self, target):
+        return patch.object(*target, side_effect=OperationalError('the database is down'))
+
+    def segments(self):
+        return [name for name in os.listdir(self.dir) if name.endswith('.jsonl')]
+
+    def test_save_is_spooled_when_the_database_errors(self):
+        form = self.get_form()
+
+        with self.database_down((FormSubmission.objects, 'create')):
+            with self.assertLogs('wagtailstreamforms.wagtailstreamforms_hooks', 'ERROR'):
+                save_form_submission_data(self.form, form)
+
+        self.assertEqual(FormSubmission.objects.count(), 0)
+        self.assertEqual(len(self.segments()), 1)
+
+        self.assertEqual(replay_spool(), 1)
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(submission.submission_token, form.cleaned_data['submission_token'])
+        self.assertEqual(submission.get_data()['name'], 'Bill')
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_files_are_spooled(self):
+        files = MultiValueDict({'files': [self.get_file(), self.get_file()]})
+
+        with self.database_down((FormSubmission.objects, 'create')):
+            with self.assertLogs('wagtailstreamforms.wagtailstreamforms_hooks', 'ERROR'):
+                save_form_submission_data(self.form, self.get_form(files=files))
+
+        replay_spool()
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(submission.files.count(), 2)
+        self.assertEqual(submission.files.first().file.read(), b'file_content')
+        self.assertEqual(os.listdir(os.path.join(self.dir, 'files')), [])
+
+    def test_save_errors_without_a_spool(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR=None):
+            with self.database_down((FormSubmission.objects, 'create')):
+                with self.assertRaises(OperationalError):
+                    save_form_submission_data(self.form, self.get_form())
+
+    def test_integrity_errors_are_not_spooled(self):
+        with patch.object(FormSubmission.objects, 'create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                save_form_submission_data(self.form, self.get_form(token=''))
+
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_process_form_is_spooled_when_the_database_errors(self):
+        request = self.rf.post('/fake/', {
+            'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': 'abc'
+        })
+        request.user = AnonymousUser()
+
+        with self.database_down((Form, 'process_form_submission')):
+            with self.assertLogs('wagtailstreamforms.utils.spool', 'ERROR'):
+                response = process_form(self.page, request)
+
+        # the submitter is shown the usual success
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+        self.assertEqual(replay_spool(), 1)
+
+        # the replayed form is keyed by the spooled token
+        submission = FormSubmission.objects.get()
+        self.assertIsNotNone(submission.submission_token)
+        self.assertEqual(submission.get_data()['name'], 'Bill')
+
+    def test_replayed_form_is_not_processed_twice(self):
+        form = self.get_form(token='')
+
+        with self.database_down((Form, 'process_form_submission')):
+            with self.assertLogs('wagtailstreamforms.utils.spool', 'ERROR'):
+                process_form_submission(self.form, form)
+
+        # the segment is read again as if the replay stopped before removing it
+        segment = os.path.join(self.dir, self.segments()[0])
+        with open(segment) as f:
+            content = f.read()
+        replay_spool()
+        with open(segment, 'w') as f:
+            f.write(content)
+        replay_spool()
+
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def post_while_the_database_dies(self, **data):
+        """ Posts a form whose save and a later hook both fail, so both spool it. """
+
+        def after_save(instance, form):
+            if database_down:
+                raise OperationalError('the database is down')
+
+        data.update(name='Bill', form_id=self.form.pk, form_reference='ref')
+        request = self.rf.post('/fake/', data)
+        request.user = AnonymousUser()
+        self.form.process_form_submission_hooks = ['save_form_submission_data', 'after_save']
+        self.form.save()
+
+        database_down = True
+        with self.register_hook('process_form_submission', after_save, order=1):
+            with self.database_down((FormSubmission.objects, 'create')):
+                with self.assertLogs('wagtailstreamforms', 'ERROR') as logs:
+                    self.assertEqual(process_form(self.page, request).status_code, 302)
+
+            self.assertEqual(len(logs.records), 2)
+            database_down = False
+            replay_spool()
+
+    def test_form_spooled_by_the_save_and_the_processing_is_saved_once(self):
+        self.post_while_the_database_dies(submission_token='abc')
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_form_without_a_token_spooled_by_the_save_and_the_processing_is_saved_once(self):
+        self.post_while_the_database_dies()
+        self.assertEqual(FormSubmission.objects.count(), 1)
+        self.assertIsNotNone(FormSubmission.objects.get().submission_token)
+
+    def test_replayed_form_that_is_no_longer_valid_is_saved(self):
+        with self.database_down((Form, 'process_form_submission')):
+            with self.assertLogs('wagtailstreamforms.utils.spool', 'ERROR'):
+                process_form_submission(self.form, self.get_form())
+
+        self.form.fields = json.dumps([
+            {'type': 'singleline', 'value': {'label': 'Email', 'required': True}, 'id': 'c'},
+        ])
+        self.form.save()
+
+        with self.assertLogs('wagtailstreamforms.utils.spool', 'WARNING'):
+            self.assertEqual(replay_spool(), 1)
+
+        self.assertEqual(FormSubmission.objects.get().get_data()['name'], 'Bill')
+
+    def test_replay_keeps_the_spool_while_the_database_errors(self):
+        with self.database_down((FormSubmission.objects, 'create')):
+            with self.assertLogs('wagtailstreamforms.wagtailstreamforms_hooks', 'ERROR'):
+                save_form_submission_data(self.form, self.get_form())
+
+        with patch('wagtailstreamforms.utils.spool.save_records', side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                replay_spool()
+
+        self.assertEqual(len(self.segments()), 1)
+        self.assertEqual(replay_spool(), 1)
+
+    def test_processing_errors_without_a_spool(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR=None):
+            self.assertIsNone(get_fallback_spool())
+
+            with self.database_down((Form, 'process_form_submission')):
+                with self.assertRaises(OperationalError):
+                    process_form_submission(self.form, self.get_form())
@@ -0,0 +1,57 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.utils.six import StringIO
+
+from tests.test_case import AppTestCase
+from wagtailstreamforms.models import Form, FormSubmission
+
+
+class Tests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, data):
+        path = os.path.join(self.dir, 'submissions.json')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def test_processes_submissions(self):
+        path = self.write([{'name': 'Bill %s' % i} for i in range(5)] + [{}])
+        report = os.path.join(self.dir, 'report.json')
+        out = StringIO()
+
+        call_command('batchsubmissions', 'form', path, batch_size=2, report=report, stdout=out)
+
+        self.assertIn('Successfully processed 5 of 6 form submissions', out.getvalue())
+        self.assertEqual(FormSubmission.objects.count(), 5)
+
+        with open(report) as f:
+            results = json.load(f)
+        self.assertEqual([result['index'] for result in results], list(range(6)))
+        self.assertEqual(results[5]['status'], 'invalid')
+
+    def test_invalid_form(self):
+        with self.assertRaises(CommandError):
+            call_command('batchsubmissions', 'foo', self.write([]))
+
+    def test_must_be_a_list(self):
+        with self.assertRaises(CommandError):
+            call_command('batchsubmissions', 'form', self.write({}))
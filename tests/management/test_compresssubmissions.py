@@ -0,0 +1,45 @@
+import json
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from tests.test_case import AppTestCase
+from wagtailstreamforms.models import FormSubmission, Form
+from wagtailstreamforms.serializers import get_form_data_codec
+
+
+class Tests(AppTestCase):
+    fixtures = ['test']
+
+    def setUp(self):
+        form = Form.objects.get(pk=1)
+        self.data = json.dumps({'message': 'some long free text ' * 50})
+        self.submissions = [FormSubmission.objects.create(form=form, form_data=self.data) for _ in range(3)]
+        self.small = FormSubmission.objects.create(form=form, form_data='{}')
+
+    def test_compresses(self):
+        call_command('compresssubmissions', codec='zlib', batch_size=2)
+
+        for submission in self.submissions:
+            submission.refresh_from_db()
+            self.assertEqual(get_form_data_codec(submission.form_data), 'zlib')
+            self.assertEqual(submission.get_form_data_json(), self.data)
+
+        self.small.refresh_from_db()
+        self.assertEqual(self.small.form_data, '{}')
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION='lzma')
+    def test_uses_setting(self):
+        call_command('compresssubmissions')
+
+        for submission in self.submissions:
+            submission.refresh_from_db()
+            self.assertEqual(get_form_data_codec(submission.form_data), 'lzma')
+
+    def test_decompresses(self):
+        call_command('compresssubmissions', codec='zlib')
+        call_command('compresssubmissions', codec='none')
+
+        for submission in self.submissions:
+            submission.refresh_from_db()
+            self.assertEqual(submission.form_data, self.data)
@@ -0,0 +1,78 @@
+import shutil
+import tempfile
+import time
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils.six import StringIO
+from mock import patch
+
+from tests.test_case import AppTestCase
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.spool import get_spool, make_record
+
+
+class Tests(AppTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR=self.dir)
+        self.settings.enable()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields='[]'
+        )
+
+    def tearDown(self):
+        get_spool().rotate()
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def call(self, *args, **kwargs):
+        out = StringIO()
+        call_command('flushsubmissions', *args, stdout=out, stderr=StringIO(), **kwargs)
+        return out.getvalue()
+
+    def test_saves_buffered_submissions(self):
+        for token in ['a', 'b']:
+            get_spool().append(make_record(self.form, '{}', token))
+        get_spool().rotate()
+
+        self.assertIn('Successfully saved 2 buffered form submissions', self.call())
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_loop_flushes_until_stopped(self):
+        with patch('wagtailstreamforms.management.commands.flushsubmissions.time.sleep',
+                   side_effect=[None, None, KeyboardInterrupt]), \
+                patch('wagtailstreamforms.management.commands.flushsubmissions.flush_submissions',
+                      return_value=0) as flush:
+            with self.assertRaises(KeyboardInterrupt):
+                self.call('--loop')
+
+        self.assertEqual(flush.call_count, 3)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_THREAD=False,
+                       WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FLUSH_INTERVAL=0.1)
+    def test_loop_saves_the_idle_open_segment(self):
+        # the segment is left open in this process as it would be by an idle web process
+        get_spool().append(make_record(self.form, '{}', 'a'))
+        sleep = time.sleep
+        calls = []
+
+        def wait(seconds):
+            if calls:
+                raise KeyboardInterrupt
+            calls.append(seconds)
+            sleep(0.3)
+
+        with patch('wagtailstreamforms.management.commands.flushsubmissions.time.sleep', side_effect=wait):
+            with self.assertRaises(KeyboardInterrupt):
+                self.call('--loop')
+
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_interval_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            self.call('--interval', '-1')
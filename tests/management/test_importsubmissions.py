@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
+from mock import patch
+
+from tests.test_case import AppTestCase
+from wagtailstreamforms.models import Form, FormSubmission
+
+
+class Tests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+                {'type': 'multiline', 'value': {'label': 'Your Message', 'required': False}, 'id': 'b'},
+            ])
+        )
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def call(self, *args, **kwargs):
+        out = StringIO()
+        call_command('importsubmissions', *args, stdout=out, stderr=StringIO(), **kwargs)
+        return out.getvalue()
+
+    def test_imports_csv_by_label(self):
+        path = self.write('export.csv', (
+            'Submission date,Name,Your Message\n'
+            '2017-01-02 10:00:00,Bill,"Hello, there"\n'
+            '2017-01-03,Ben,\n'
+        ))
+
+        out = self.call('form', path, batch_size=1)
+
+        self.assertIn('Successfully imported 2 form submissions', out)
+        submissions = FormSubmission.objects.order_by('submit_time')
+        self.assertEqual(
+            [s.get_data()['name'] for s in submissions], ['Bill', 'Ben']
+        )
+        self.assertEqual(submissions[0].get_data()['your-message'], 'Hello, there')
+        self.assertEqual(submissions[0].submit_time, datetime(2017, 1, 2, 10))
+        self.assertEqual(submissions[1].submit_time, datetime(2017, 1, 3))
+        self.assertEqual(submissions[0].field_schema, self.form.field_schema)
+
+    def test_imports_jsonl_by_name(self):
+        path = self.write('export.jsonl', (
+            '{"name": "Bill", "your-message": "Hi", "submit_time": "2017-01-02T10:00:00+00:00"}\n'
+            '\n'
+            '{"name": "Ben", "other": "skipped"}\n'
+        ))
+
+        self.call('form', path)
+
+        submissions = FormSubmission.objects.order_by('submit_time')
+        self.assertEqual(submissions[0].get_data()['name'], 'Bill')
+        self.assertEqual(submissions[0].submit_time.year, 2017)
+        self.assertEqual(submissions[1].get_data()['name'], 'Ben')
+        self.assertNotIn('other', submissions[1].get_data())
+        self.assertEqual(submissions[1].submit_time.date(), timezone.now().date())
+
+    def test_submit_time_is_still_set_for_new_submissions(self):
+        self.call('form', self.write('export.csv', 'Name,Submission date\nBill,2017-01-02\n'))
+
+        submission = FormSubmission.objects.create(form=self.form, form_data='{}')
+
+        self.assertEqual(submission.submit_time.date(), timezone.now().date())
+
+    def test_resumes_from_checkpoint(self):
+        path = self.write('export.csv', 'Name\nBill\nBen\nBob\n')
+        self.write('export.csv.checkpoint', json.dumps({'file': path, 'rows': 2}))
+
+        out = self.call('form', path)
+
+        self.assertIn('Resuming after 2 imported rows', out)
+        self.assertEqual([s.get_data()['name'] for s in FormSubmission.objects.all()], ['Bob'])
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+    def test_checkpoint_is_saved_after_each_batch(self):
+        path = self.write('export.csv', 'Name\nBill\nBen\nBob\n')
+        checkpoints = []
+
+        def write_checkpoint(command, checkpoint, source, rows):
+            checkpoints.append(rows)
+            if rows == 2:
+                raise KeyboardInterrupt
+
+        with patch('wagtailstreamforms.management.commands.importsubmissions.Command.write_checkpoint',
+                   write_checkpoint):
+            with self.assertRaises(KeyboardInterrupt):
+                self.call('form', path, batch_size=1)
+
+        # the batch is rolled back with its checkpoint
+        self.assertEqual(checkpoints, [1, 2])
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_checkpoint_is_not_saved_when_the_batch_fails(self):
+        path = self.write('export.csv', 'Name\nBill\nBen\nBob\n')
+
+        with patch('wagtailstreamforms.storage.orm.OrmSubmissionStorage.write', side_effect=[1, DatabaseError]):
+            with self.assertRaises(DatabaseError):
+                self.call('form', path, batch_size=2)
+
+        with open(path + '.checkpoint') as f:
+            self.assertEqual(json.load(f)['rows'], 2)
+
+    def test_rows_imported_again_are_skipped(self):
+        path = self.write('export.csv', 'Name\nBill\nBen\n')
+        self.call('form', path)
+        self.call('form', path)
+
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+        self.call('form', self.write('export.csv', 'Name\nBill\nBob\n'))
+
+        self.assertEqual(sorted(s.get_data()['name'] for s in FormSubmission.objects.all()), ['Ben', 'Bill', 'Bob'])
+
+    def test_imports_to_the_form_storage(self):
+        path = self.write('export.csv', 'Name,Submission date\nBill,2017-01-02 10:00:00\nBen,\n')
+
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite',
+                               WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR=self.dir):
+            self.call('form', path)
+            submissions = list(self.form.get_submission_storage().iterate())
+
+        self.assertEqual(FormSubmission.objects.count(), 0)
+        self.assertEqual([s.get_data()['name'] for s in submissions], ['Ben', 'Bill'])
+        self.assertEqual(submissions[1].submit_time, datetime(2017, 1, 2, 10))
+        self.assertEqual(submissions[0].submit_time.date(), timezone.now().date())
+
+    def test_checkpoint_for_other_file(self):
+        path = self.write('export.csv', 'Name\nBill\n')
+        self.write('export.csv.checkpoint', json.dumps({'file': '/other.csv', 'rows': 2}))
+
+        with self.assertRaises(CommandError):
+            self.call('form', path)
+
+    def test_unknown_format(self):
+        with self.assertRaises(CommandError):
+            self.call('form', self.write('export.txt', ''))
+
+    def test_invalid_json(self):
+        with self.assertRaises(CommandError):
+            self.call('form', self.write('export.jsonl', '{"name": \n'))
+
+    def test_invalid_form(self):
+        with self.assertRaises(CommandError):
+            self.call('foo', self.write('export.csv', ''))
@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.utils.six import StringIO
+from mock import patch
+
+from tests.test_case import AppTestCase
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.spool import spool_submission
+
+
+class Tests(AppTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR=self.dir)
+        self.settings.enable()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields='[]'
+        )
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def call(self, *args, **kwargs):
+        out = StringIO()
+        call_command('replayspool', *args, stdout=out, stderr=StringIO(), **kwargs)
+        return out.getvalue()
+
+    def test_replays_spooled_submissions(self):
+        spool_submission(self.form, '{}', 'a')
+        spool_submission(self.form, '{}', 'b')
+        spool_submission(self.form, '{}', 'a')
+
+        self.assertIn('Successfully replayed 2 spooled form submissions', self.call())
+        self.assertEqual(FormSubmission.objects.count(), 2)
+
+    def test_spool_dir_is_required(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR=None):
+            with self.assertRaises(CommandError):
+                self.call()
+
+    def test_errors_are_reported(self):
+        spool_submission(self.form, '{}', 'a')
+
+        with patch('wagtailstreamforms.utils.spool.save_records', side_effect=ValueError('down')):
+            with self.assertRaisesMessage(CommandError, 'down'):
+                self.call()
@@ -1,5 +1,9 @@
 from django.db import models
+from wagtail.core import blocks
+from wagtail.core.fields import StreamField
+from wagtail.core.models import Page
 
+from wagtailstreamforms.blocks import WagtailFormBlock
 from wagtailstreamforms.fields import HookSelectField
 from wagtailstreamforms.models import AbstractFormSetting
 
@@ -15,3 +19,10 @@ class InvalidFormSettingsModel(models.Model):
 
 class HookSelectModel(models.Model):
     hooks = HookSelectField(null=True, blank=True, help_text='Some hooks')
+
+
+class FormPage(Page):
+    body = StreamField([
+        ('form', WagtailFormBlock()),
+        ('section', blocks.StructBlock([('forms', blocks.ListBlock(WagtailFormBlock()))])),
+    ], blank=True)
@@ -1,3 +1,6 @@
+import json
+
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.test import override_settings
@@ -5,9 +8,11 @@ from django.utils.translation import ugettext_lazy as _
 
 from wagtail.core.models import Page
 
+from mock import patch
+
 from wagtailstreamforms.conf import get_setting
 from wagtailstreamforms.fields import HookSelectField
-from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.models import Form, FormFieldSchema, FormSubmission
 
 from ..test_case import AppTestCase
 
@@ -65,6 +70,17 @@ class ModelFieldTests(AppTestCase):
         field = self.get_field(Form, 'process_form_submission_hooks')
         self.assertModelField(field, HookSelectField, False, True)
 
+    def test_revision(self):
+        field = self.get_field(Form, 'revision')
+        self.assertModelField(field, models.CharField, False, True)
+        self.assertEqual(field.max_length, 32)
+        self.assertFalse(field.editable)
+
+    def test_field_schema(self):
+        field = self.get_field(Form, 'field_schema')
+        self.assertModelPKField(field, FormFieldSchema, models.SET_NULL, True, True)
+        self.assertFalse(field.editable)
+
 
 class ModelPropertyTests(AppTestCase):
     fixtures = ['test']
@@ -157,6 +173,46 @@ class ModelPropertyTests(AppTestCase):
         ]
         self.assertEqual(self.test_form.get_data_fields(), expected_fields)
 
+    def test_save_sets_field_schema(self):
+        self.test_form.save()
+
+        self.assertEqual(self.test_form.field_schema.get_data_fields(), [
+            (name, str(label)) for name, label in self.test_form.get_data_fields()[1:]
+        ])
+
+    def test_save_shares_field_schema_of_identical_fields(self):
+        self.test_form.save()
+        copied = self.test_form.copy()
+
+        self.assertEqual(copied.field_schema, self.test_form.field_schema)
+
+    def test_get_field_schema_creates_missing_schema(self):
+        self.assertIsNone(self.test_form.field_schema)
+
+        schema = self.test_form.get_field_schema()
+
+        self.assertIsNotNone(schema)
+        self.assertEqual(Form.objects.get(pk=self.test_form.pk).field_schema, schema)
+
+    def test_get_submission_data_fields_includes_historical_fields(self):
+        old_schema = FormFieldSchema.objects.get_for_fields([('singleline', 'singleline'), ('removed', 'Removed')])
+        FormSubmission.objects.create(form_data='{}', form=self.test_form, field_schema=old_schema)
+        FormSubmission.objects.create(form_data='{}', form=self.test_form, field_schema=None)
+        self.test_form.save()
+
+        data_fields = self.test_form.get_submission_data_fields()
+
+        self.assertEqual(data_fields[:-1], self.test_form.get_data_fields())
+        self.assertEqual(data_fields[-1], ('removed', 'Removed'))
+
+    def test_get_submission_data_fields_only_uses_queryset(self):
+        old_schema = FormFieldSchema.objects.get_for_fields([('removed', 'Removed')])
+        FormSubmission.objects.create(form_data='{}', form=self.test_form, field_schema=old_schema)
+
+        data_fields = self.test_form.get_submission_data_fields(FormSubmission.objects.none())
+
+        self.assertEqual(data_fields, self.test_form.get_data_fields())
+
     def test_get_form(self):
         actual_fields = [f for f in self.test_form.get_form().fields]
         expected_fields = [
@@ -176,10 +232,16 @@ class ModelPropertyTests(AppTestCase):
             'singlefile',
             'multifile',
             'form_id',
-            'form_reference'
+            'form_reference',
+            'submission_token'
         ]
         self.assertEqual(actual_fields, expected_fields)
 
+    def test_get_form_fields_returns_a_copy(self):
+        self.test_form.get_form_fields().pop()
+
+        self.assertEqual(len(self.test_form.get_form_fields()), 15)
+
     def test_get_form_fields(self):
         self.assertListEqual(
             [field['type'] for field in self.test_form.get_form_fields()],
@@ -222,3 +284,126 @@ class ModelPropertyTests(AppTestCase):
 
             self.test_form.process_form_submission(form_class)
             self.assertTrue(self.test_form._completed)
+
+    def test_process_form_submissions(self):
+        calls = []
+
+        def batch_hook(instance, form):
+            calls.append(('single', form))
+
+        def process_batch(instance, forms):
+            calls.append(('batch', forms))
+
+        batch_hook.process_batch = process_batch
+
+        def single_hook(instance, form):
+            if form == 'b':
+                raise ValueError('failed')
+            calls.append(('single', form))
+
+        def last_hook(instance, form):
+            calls.append(('last', form))
+
+        self.test_form.process_form_submission_hooks = ['batch_hook', 'single_hook', 'last_hook']
+
+        with self.register_hook('process_form_submission', batch_hook, order=-3), \
+                self.register_hook('process_form_submission', single_hook, order=-2), \
+                self.register_hook('process_form_submission', last_hook, order=-1):
+            with patch('wagtailstreamforms.models.form.logger'):
+                errors = self.test_form.process_form_submissions(['a', 'b', 'c'])
+
+        # the failed form is not given to the hooks after the one that failed
+        self.assertEqual(calls, [
+            ('batch', ['a', 'b', 'c']),
+            ('single', 'a'),
+            ('single', 'c'),
+            ('last', 'a'),
+            ('last', 'c'),
+        ])
+        self.assertEqual(errors, [{}, {'single_hook': 'failed'}, {}])
+
+    def test_process_form_submissions_batch_error(self):
+        def batch_hook(instance, form):
+            pass
+
+        def process_batch(instance, forms):
+            raise ValueError('failed')
+
+        batch_hook.process_batch = process_batch
+        self.test_form.process_form_submission_hooks = ['batch_hook']
+
+        with self.register_hook('process_form_submission', batch_hook):
+            with patch('wagtailstreamforms.models.form.logger'):
+                errors = self.test_form.process_form_submissions(['a', 'b'])
+
+        self.assertEqual(errors, [{'batch_hook': 'failed'}, {'batch_hook': 'failed'}])
+
+
+class ModelCacheTests(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name'}, 'id': 'a'},
+                {'type': 'email', 'value': {'label': 'Email'}, 'id': 'b'},
+            ])
+        )
+
+    def test_save_sets_new_revision(self):
+        revision = self.form.revision
+        self.assertEqual(len(revision), 32)
+
+        self.form.save()
+
+        self.assertNotEqual(self.form.revision, revision)
+
+    def test_get_data_fields_cached_on_instance(self):
+        self.form.get_data_fields()
+
+        with patch.object(Form, 'build_data_fields') as build:
+            self.form.get_data_fields()
+
+        build.assert_not_called()
+
+    def test_get_data_fields_cached_for_revision(self):
+        form = Form.objects.get(pk=self.form.pk)
+        form.get_data_fields()
+
+        with patch.object(Form, 'build_data_fields') as build:
+            self.assertEqual(
+                Form.objects.get(pk=self.form.pk).get_data_fields(),
+                [('submit_time', 'Submission date'), ('name', 'Name'), ('email', 'Email')]
+            )
+
+        build.assert_not_called()
+
+    def test_save_invalidates(self):
+        form = Form.objects.get(pk=self.form.pk)
+        form.get_data_fields()
+
+        form.fields = json.dumps([{'type': 'singleline', 'value': {'label': 'Other'}, 'id': 'a'}])
+        self.assertEqual(form.get_data_fields()[1:], [('other', 'Other')])
+        form.save()
+
+        self.assertEqual(Form.objects.get(pk=self.form.pk).get_data_fields()[1:], [('other', 'Other')])
+
+    def test_reassigned_fields_not_shared(self):
+        form = Form.objects.get(pk=self.form.pk)
+        form.fields = json.dumps([{'type': 'singleline', 'value': {'label': 'Other'}, 'id': 'a'}])
+        form.get_data_fields()
+
+        self.assertEqual(Form.objects.get(pk=self.form.pk).get_data_fields()[1:], [('name', 'Name'), ('email', 'Email')])
+
+    def test_get_form_fields_normalises_stream_values(self):
+        form = Form.objects.get(pk=self.form.pk)
+        form.fields = form.fields.stream_block.to_python(form.get_form_fields())
+        form.fields[0]
+
+        self.assertEqual(
+            [(field['type'], field['value']['label']) for field in form.get_form_fields()],
+            [('singleline', 'Name'), ('email', 'Email')]
+        )
@@ -0,0 +1,37 @@
+from django.db import models
+
+from wagtailstreamforms.models import FormFieldSchema
+
+from ..test_case import AppTestCase
+
+
+class ModelGenericTests(AppTestCase):
+
+    def test_str(self):
+        model = FormFieldSchema(hash='abc')
+        self.assertEqual(model.__str__(), model.hash)
+
+
+class ModelFieldTests(AppTestCase):
+
+    def test_hash(self):
+        field = self.get_field(FormFieldSchema, 'hash')
+        self.assertModelField(field, models.CharField)
+        self.assertEqual(field.max_length, 40)
+        self.assertTrue(field.unique)
+
+    def test_fields(self):
+        field = self.get_field(FormFieldSchema, 'fields')
+        self.assertModelField(field, models.TextField)
+
+
+class ModelPropertyTests(AppTestCase):
+
+    def test_get_for_fields_creates(self):
+        schema = FormFieldSchema.objects.get_for_fields([('name', 'Name'), ('email', 'Email')])
+        self.assertEqual(schema.get_data_fields(), [('name', 'Name'), ('email', 'Email')])
+
+    def test_get_for_fields_shares_identical_fields(self):
+        schema = FormFieldSchema.objects.get_for_fields([('name', 'Name')])
+        self.assertEqual(FormFieldSchema.objects.get_for_fields([('name', 'Name')]), schema)
+        self.assertNotEqual(FormFieldSchema.objects.get_for_fields([('name', 'Full name')]), schema)
@@ -1,6 +1,9 @@
+import json
+
 from django.db import models
 
 from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.serializers import encode_form_data
 
 from ..test_case import AppTestCase
 
@@ -45,3 +48,13 @@ class ModelPropertyTests(AppTestCase):
         model = FormSubmission.objects.create(form_data='{}', form=form)
         expected_data = {"submit_time": model.submit_time}
         self.assertEqual(model.get_data(), expected_data)
+
+    def test_get_data_compressed(self):
+        form = Form.objects.get(pk=1)
+        data = {"foo": "bar " * 100}
+        model = FormSubmission.objects.create(form_data=encode_form_data(json.dumps(data), 'zlib'), form=form)
+        model.refresh_from_db()
+        expected_data = {"foo": "bar " * 100, "submit_time": model.submit_time}
+        self.assertNotEqual(model.form_data, json.dumps(data))
+        self.assertEqual(model.get_data(), expected_data)
+        self.assertEqual(str(model), json.dumps(data))
@@ -2,9 +2,16 @@ import json
 from datetime import datetime, date
 
 from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
 
 from tests.test_case import AppTestCase
-from wagtailstreamforms.serializers import FormSubmissionSerializer
+from wagtailstreamforms.serializers import (
+    FormSubmissionSerializer,
+    decode_form_data,
+    encode_form_data,
+    get_form_data_codec
+)
 
 
 class TestSerializer(AppTestCase):
@@ -32,3 +39,33 @@ class TestSerializer(AppTestCase):
         json_data = json.dumps(data_to_serialize, cls=FormSubmissionSerializer)
 
         self.assertEqual(json_data, json.dumps(expected_data))
+
+
+class TestFormDataEncoding(AppTestCase):
+    data = json.dumps({'message': 'some long repeated free text answer ' * 20})
+
+    def test_plain_by_default(self):
+        self.assertEqual(encode_form_data(self.data), self.data)
+
+    def test_encodes_with_codec(self):
+        for codec in ['zlib', 'lzma']:
+            encoded = encode_form_data(self.data, codec)
+            self.assertLess(len(encoded), len(self.data))
+            self.assertEqual(get_form_data_codec(encoded), codec)
+            self.assertEqual(decode_form_data(encoded), self.data)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION='zlib')
+    def test_encodes_with_setting(self):
+        encoded = encode_form_data(self.data)
+        self.assertEqual(get_form_data_codec(encoded), 'zlib')
+
+    def test_small_values_stay_plain(self):
+        self.assertEqual(encode_form_data('{"foo": 1}', 'zlib'), '{"foo": 1}')
+
+    def test_decode_plain(self):
+        self.assertIsNone(get_form_data_codec(self.data))
+        self.assertEqual(decode_form_data(self.data), self.data)
+
+    def test_invalid_codec(self):
+        with self.assertRaises(ImproperlyConfigured):
+            encode_form_data(self.data, 'foo')
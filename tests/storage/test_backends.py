@@ -0,0 +1,291 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from mock import patch
+
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.storage import JsonlSubmissionStorage, OrmSubmissionStorage, SqliteSubmissionStorage
+
+from ..test_case import AppTestCase
+
+
+class StorageTests:
+    """ The tests every storage passes. """
+
+    storage_class = None
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(
+            WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR=os.path.join(self.dir, 'submissions'),
+            MEDIA_ROOT=os.path.join(self.dir, 'media')
+        )
+        self.settings.enable()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([{'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'}])
+        )
+        self.storage = self.storage_class(self.form)
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def write(self, *names, **kwargs):
+        """ Writes a submission for each name, one at a time so they are in order. """
+
+        return sum(
+            self.storage.write([
+                dict({'form_data': json.dumps({'name': name}), 'field_schema_id': self.form.field_schema_id}, **kwargs)
+            ])
+            for name in names
+        )
+
+    def names(self, submissions):
+        return [s.get_data()['name'] for s in submissions]
+
+    def test_write_and_iterate(self):
+        self.assertEqual(self.write('a', 'b', 'c'), 3)
+
+        submissions = list(self.storage.iterate())
+        self.assertEqual(self.names(submissions), ['c', 'b', 'a'])
+        self.assertEqual(submissions[0].field_schema_id, self.form.field_schema_id)
+        self.assertIsNotNone(submissions[0].submit_time)
+
+    def test_write_with_submit_time(self):
+        submit_time = datetime(2017, 1, 2, 10)
+        self.write('a', submit_time=submit_time)
+        self.storage.write([
+            {'form_data': json.dumps({'name': name}), 'submission_token': token, 'submit_time': submit_time}
+            for name, token in [('b', None), ('c', 'c'), ('d', None)]
+        ])
+        self.write('e')
+
+        submissions = list(self.storage.iterate())
+        self.assertEqual(self.names(submissions)[0], 'e')
+        self.assertEqual([s.submit_time for s in submissions[1:]], [submit_time] * 4)
+
+    def test_iterate_offset_and_limit(self):
+        self.write('a', 'b', 'c', 'd')
+
+        self.assertEqual(self.names(self.storage.iterate(offset=1, limit=2)), ['c', 'b'])
+        self.assertEqual(self.names(self.storage.iterate(offset=3)), ['a'])
+
+    def test_count(self):
+        self.write('a', 'b')
+
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.count(since=timezone.now() + timedelta(hours=1)), 0)
+        self.assertEqual(self.storage.count(until=timezone.now() + timedelta(hours=1)), 2)
+
+    def test_filter_by_ids(self):
+        self.write('a', 'b', 'c')
+        pks = [s.pk for s in self.storage.iterate()]
+
+        self.assertEqual(self.names(self.storage.iterate(ids=[pks[0], pks[2]])), ['c', 'a'])
+        self.assertEqual(self.storage.count(ids=[]), 0)
+        self.assertEqual(self.storage.get(pks[1]).get_data()['name'], 'b')
+        self.assertIsNone(self.storage.get(0))
+
+    def test_duplicate_tokens_are_skipped(self):
+        self.assertEqual(self.write('a', submission_token='abc'), 1)
+        self.assertEqual(self.write('a', submission_token='abc'), 0)
+        self.assertEqual(self.storage.write([
+            {'form_data': '{}', 'submission_token': 'def'},
+            {'form_data': '{}', 'submission_token': 'def'},
+        ]), 1)
+
+        self.assertEqual(self.storage.count(), 2)
+
+    def test_delete(self):
+        self.write('a', 'b', 'c')
+        pks = [s.pk for s in self.storage.iterate()]
+
+        self.assertEqual(self.storage.delete(ids=[pks[1]]), 1)
+        self.assertEqual(self.names(self.storage.iterate()), ['c', 'a'])
+
+        self.assertEqual(self.storage.delete(until=timezone.now() + timedelta(hours=1)), 2)
+        self.assertEqual(self.storage.count(), 0)
+
+    def test_files(self):
+        files = MultiValueDict({'files': [self.get_file(), self.get_file()]})
+        self.write('a', files=files)
+
+        stored = list(self.storage.get(self.storage.iterate()[0].pk).get_files())
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(stored[0].field, 'files')
+        self.assertTrue(stored[0].url)
+
+        with default_storage.open(str(stored[0])) as f:
+            self.assertEqual(f.read(), b'file_content')
+
+    def test_field_schema_ids(self):
+        self.write('a')
+
+        self.assertEqual(set(Form.objects.filter(field_schema__in=self.storage.get_field_schema_ids())
+                             .values_list('pk', flat=True)), {self.form.pk})
+
+    def test_submission_list(self):
+        self.write('a', 'b', 'c')
+        submissions = self.storage.filter()
+
+        self.assertEqual(len(submissions), 3)
+        self.assertEqual(submissions.count(), 3)
+        self.assertEqual(self.names(submissions[1:]), ['b', 'a'])
+        self.assertEqual(submissions[0].get_data()['name'], 'c')
+        with self.assertRaises(IndexError):
+            submissions[3]
+
+        self.assertEqual(submissions.delete(), 3)
+        self.assertEqual(len(submissions), 0)
+
+
+class OrmStorageTests(StorageTests, AppTestCase):
+    storage_class = OrmSubmissionStorage
+
+    def test_submissions_are_saved_in_the_database(self):
+        self.write('a')
+
+        self.assertEqual(FormSubmission.objects.get(form=self.form).get_data()['name'], 'a')
+
+
+class FileStorageTests(StorageTests):
+    """ The tests of the storages that keep the submissions in files. """
+
+    def test_directory_is_required(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR=None):
+            with self.assertRaises(ImproperlyConfigured):
+                self.write('a')
+
+    def test_deleted_files_are_removed(self):
+        self.write('a', files=MultiValueDict({'files': [self.get_file()]}))
+        name = str(self.storage.iterate()[0].get_files()[0])
+
+        self.storage.delete()
+
+        self.assertFalse(default_storage.exists(name))
+
+    def test_times_are_stored_in_utc(self):
+        with override_settings(USE_TZ=True):
+            self.write('a')
+            submit_time = self.storage.iterate()[0].submit_time
+
+            self.assertTrue(timezone.is_aware(submit_time))
+            self.assertEqual(self.storage.count(since=submit_time), 1)
+            self.assertEqual(self.storage.count(until=submit_time), 0)
+
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+
+class SqliteStorageTests(FileStorageTests, AppTestCase):
+    storage_class = SqliteSubmissionStorage
+
+    def test_each_form_has_a_database(self):
+        self.write('a')
+
+        self.assertIn('form-%s.sqlite3' % self.form.pk, os.listdir(os.path.join(self.dir, 'submissions')))
+
+
+class JsonlStorageTests(FileStorageTests, AppTestCase):
+    storage_class = JsonlSubmissionStorage
+
+    def setUp(self):
+        super().setUp()
+        self.storage.segment_size = 2
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.storage.get_dir()) if name.endswith('.jsonl'))
+
+    def test_segments_are_rotated(self):
+        self.write('a', 'b', 'c')
+
+        self.assertEqual(self.segments(), ['segment-000001.jsonl', 'segment-000002.jsonl'])
+
+    def test_deleted_segments_are_removed(self):
+        self.write('a', 'b', 'c', 'd', 'e')
+        pks = [s.pk for s in self.storage.iterate()]
+
+        # the first segment is removed once all its submissions are deleted
+        self.storage.delete(ids=pks[3:])
+
+        self.assertEqual(self.segments(), ['segment-000002.jsonl', 'segment-000003.jsonl'])
+        self.assertEqual(self.names(self.storage.iterate()), ['e', 'd', 'c'])
+
+    def test_tombstones_of_removed_segments_are_kept(self):
+        self.write('a', 'b', 'c')
+        # a tombstone in the second segment of a submission of the first
+        self.storage.delete(ids=[self.storage.iterate()[1].pk])
+        self.write('d', 'e')
+
+        # the second segment is removed with the tombstone
+        self.storage.delete(ids=[s.pk for s in self.storage.iterate(offset=1, limit=2)])
+
+        self.assertEqual(self.segments(), ['segment-000001.jsonl', 'segment-000003.jsonl'])
+        self.assertEqual(self.names(self.storage.iterate()), ['e', 'a'])
+
+    def test_partly_written_lines_are_skipped(self):
+        self.write('a')
+
+        with open(os.path.join(self.storage.get_dir(), 'segment-000001.jsonl'), 'a') as f:
+            f.write('{"id": 2, "sub')
+
+        with self.assertLogs('wagtailstreamforms.storage.jsonl', 'ERROR'):
+            self.assertEqual(self.names(self.storage.iterate()), ['a'])
+
+    def test_ids_are_not_reused(self):
+        self.write('a', 'b')
+        self.storage.delete()
+        self.write('c')
+
+        self.assertEqual(self.storage.iterate()[0].pk, 3)
+
+    def test_segments_are_only_read_once(self):
+        self.write('a', 'b', 'c')
+        self.storage.iterate()
+
+        with patch.object(self.storage, 'parse_lines', wraps=self.storage.parse_lines) as parse_lines:
+            self.assertEqual(self.storage.count(), 3)
+            self.assertEqual(self.names(self.storage.iterate(offset=1)), ['b', 'a'])
+            parse_lines.assert_not_called()
+
+            # only the appended line is read
+            self.write('d')
+            self.assertEqual(self.names(self.storage.iterate()), ['d', 'c', 'b', 'a'])
+            self.assertEqual(parse_lines.call_count, 1)
+
+    def test_writes_of_other_processes_are_read(self):
+        self.write('a', 'b', 'c')
+        self.storage.iterate()
+
+        # another process deleting and writing through its own instance
+        other = self.storage_class(self.form)
+        other.segment_size = 2
+        other.delete(ids=[s.pk for s in other.iterate()[1:]])
+        other.write([{'form_data': json.dumps({'name': 'd'})}])
+
+        self.assertEqual(self.names(self.storage.iterate()), ['d', 'c'])
+        self.assertEqual(self.segments(), ['segment-000002.jsonl'])
+
+    def test_replaced_segments_are_read_again(self):
+        self.write('a')
+        self.storage.iterate()
+
+        path = os.path.join(self.storage.get_dir(), 'segment-000001.jsonl')
+        with open(path + '.tmp', 'w') as f:
+            f.write(json.dumps({
+                'id': 1, 'submit_time': '2017-01-01T00:00:00', 'form_data': json.dumps({'name': 'b'}),
+                'field_schema_id': None, 'submission_token': None, 'files': []
+            }) + '\n')
+        os.replace(path + '.tmp', path)
+
+        self.assertEqual(self.names(self.storage.iterate()), ['b'])
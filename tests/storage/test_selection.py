@@ -0,0 +1,244 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from django.utils.six import StringIO
+from mock import patch
+
+from tests.models import ValidFormSettingsModel
+from wagtailstreamforms import storage
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.storage import (
+    JsonlSubmissionStorage,
+    OrmSubmissionStorage,
+    SqliteSubmissionStorage,
+    get_storage_class
+)
+from wagtailstreamforms.storage.base import to_stored_time
+from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data, save_form_submission_data_batch
+
+from ..test_case import AppTestCase
+
+
+def run_on_commit(fn):
+    fn()
+
+
+class RegistryTests(AppTestCase):
+
+    def test_backends(self):
+        self.assertEqual(get_storage_class('orm'), OrmSubmissionStorage)
+        self.assertEqual(get_storage_class('sqlite'), SqliteSubmissionStorage)
+        self.assertEqual(get_storage_class('jsonl'), JsonlSubmissionStorage)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_storage_class('foo')
+
+    def test_register(self):
+        @storage.register('foo')
+        class FooSubmissionStorage(OrmSubmissionStorage):
+            pass
+
+        try:
+            self.assertEqual(get_storage_class('foo'), FooSubmissionStorage)
+        finally:
+            del storage._backends['foo']
+
+
+class SelectionTests(AppTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR=self.dir)
+        self.settings.enable()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([{'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'}])
+        )
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def get_form(self, name='Bill', token=''):
+        form = self.form.get_form({
+            'name': name, 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def test_default_is_the_orm(self):
+        self.assertIsInstance(self.form.get_submission_storage(), OrmSubmissionStorage)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite')
+    def test_setting(self):
+        self.assertIsInstance(self.form.get_submission_storage(), SqliteSubmissionStorage)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite')
+    def test_advanced_settings(self):
+        advanced_settings = SimpleNamespace(submission_storage='jsonl')
+
+        with patch.object(ValidFormSettingsModel, 'submission_storage', None, create=True):
+            with patch.object(Form, 'get_advanced_settings', return_value=advanced_settings):
+                self.assertIsInstance(self.form.get_submission_storage(), JsonlSubmissionStorage)
+
+            with patch.object(Form, 'get_advanced_settings', return_value=None):
+                self.assertIsInstance(self.form.get_submission_storage(), SqliteSubmissionStorage)
+
+    def test_advanced_settings_without_a_storage_are_not_queried(self):
+        with patch.object(Form, 'get_advanced_settings') as get_advanced_settings:
+            self.form.get_submission_storage()
+
+        get_advanced_settings.assert_not_called()
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite')
+    def test_hook_writes_to_the_storage(self):
+        form = self.get_form(token='abc')
+        save_form_submission_data(self.form, form)
+        save_form_submission_data(self.form, self.get_form(token='abc'))
+        save_form_submission_data_batch(self.form, [self.get_form('Ben'), self.get_form('Bob')])
+
+        submissions = list(self.form.get_submission_storage().iterate())
+        self.assertEqual([s.get_data()['name'] for s in submissions], ['Bob', 'Ben', 'Bill'])
+        self.assertEqual(submissions[2].submission_token, form.cleaned_data['submission_token'])
+        self.assertEqual(submissions[2].field_schema_id, self.form.field_schema_id)
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='jsonl', WAGTAILSTREAMFORMS_SUBMISSION_BUFFER=True)
+    def test_submissions_outside_the_database_are_not_buffered(self):
+        with patch('wagtailstreamforms.wagtailstreamforms_hooks.buffer_submission') as buffer_submission:
+            save_form_submission_data(self.form, self.get_form())
+
+        buffer_submission.assert_not_called()
+        self.assertEqual(self.form.get_submission_storage().count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite')
+    def test_admin_views(self):
+        User.objects.create_superuser('user', 'user@test.com', 'password')
+        self.client.login(username='user', password='password')
+        save_form_submission_data_batch(self.form, [self.get_form('Bill'), self.get_form('Ben')])
+
+        list_url = reverse('wagtailstreamforms:streamforms_submissions', kwargs={'pk': self.form.pk})
+        response = self.client.get(list_url)
+        self.assertEqual([row['fields'][1] for row in response.context['data_rows']], ['Ben', 'Bill'])
+
+        response = self.client.get(list_url + '?action=CSV')
+        self.assertEqual(len(response.content.decode().splitlines()), 3)
+
+        response = self.client.get('/cms/wagtailstreamforms/form/')
+        self.assertContains(response, '<td class="field-saved_submissions">2</td>', html=True)
+
+        pk = self.form.get_submission_storage().iterate()[0].pk
+        delete_url = reverse('wagtailstreamforms:streamforms_delete_submissions', kwargs={'pk': self.form.pk})
+        self.client.post('{}?selected-submissions={}'.format(delete_url, pk))
+        self.assertEqual(self.form.get_submission_storage().count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite')
+    def test_prunesubmissions(self):
+        save_form_submission_data(self.form, self.get_form('Bill'))
+
+        submit_time = to_stored_time(timezone.now() - timedelta(days=2))
+        with patch('wagtailstreamforms.storage.sqlite.now', return_value=submit_time):
+            save_form_submission_data(self.form, self.get_form('Ben'))
+
+        out = StringIO()
+        call_command('prunesubmissions', 1, stdout=out)
+
+        self.assertIn('Successfully deleted 1 form submissions', out.getvalue())
+        self.assertEqual([s.get_data()['name'] for s in self.form.get_submission_storage().iterate()], ['Bill'])
+
+    def test_prunesubmissions_deletes_through_the_storage_of_each_form(self):
+        other = self.form.copy()
+
+        with patch.object(OrmSubmissionStorage, 'delete', autospec=True, return_value=1) as delete:
+            out = StringIO()
+            call_command('prunesubmissions', 1, stdout=out)
+
+        self.assertEqual(sorted(call[0][0].form.pk for call in delete.call_args_list), [self.form.pk, other.pk])
+        self.assertEqual(delete.call_args[1], {'until': datetime.today().date() - timedelta(days=1)})
+        self.assertIn('Successfully deleted 2 form submissions', out.getvalue())
+
+    @patch('wagtailstreamforms.models.form.transaction.on_commit', run_on_commit)
+    def test_deleting_the_form_removes_its_storage(self):
+        for name in ['sqlite', 'jsonl']:
+            with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE=name, MEDIA_ROOT=self.dir):
+                form = self.form.copy()
+                form.get_submission_storage().write([
+                    {'form_data': '{}', 'files': MultiValueDict({'file': [self.get_file()]})}
+                ])
+                stored = form.get_submission_storage().iterate()[0].get_files()[0].name
+                self.assertTrue(default_storage.exists(stored))
+
+                form.delete()
+
+                self.assertFalse(default_storage.exists(stored))
+                self.assertEqual([name for name in os.listdir(self.dir) if name.startswith('form-')], [])
+
+    def test_deleting_a_form_in_the_database_keeps_other_storages(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_STORAGE='sqlite'):
+            self.form.get_submission_storage().write([{'form_data': '{}'}])
+
+        with patch('wagtailstreamforms.models.form.transaction.on_commit') as on_commit:
+            self.form.delete()
+
+        on_commit.assert_not_called()
+
+
+class AdvancedSettingsQueryTests(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(title='Form', slug='form', template_name='streamforms/form_block.html')
+
+    def test_selected_with_the_form(self):
+        advanced_settings = ValidFormSettingsModel.objects.create(form=self.form, name='foo', number=1)
+        form = Form.objects.with_advanced_settings().get(pk=self.form.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(form.get_advanced_settings(), advanced_settings)
+
+    def test_selected_without_settings(self):
+        form = Form.objects.with_advanced_settings().get(pk=self.form.pk)
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(form.get_advanced_settings())
+
+    def test_queried_when_not_selected(self):
+        advanced_settings = ValidFormSettingsModel.objects.create(form=self.form, name='foo', number=1)
+        form = Form.objects.get(pk=self.form.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(form.get_advanced_settings(), advanced_settings)
+
+    @patch.object(ValidFormSettingsModel, 'submission_storage', None, create=True)
+    def test_admin_list_does_not_query_each_form(self):
+        User.objects.create_superuser('user', 'user@test.com', 'password')
+        self.client.login(username='user', password='password')
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get('/cms/wagtailstreamforms/form/').status_code, 200)
+            return len(queries)
+
+        queries = count_queries()
+        for i in range(3):
+            self.form.copy()
+
+        # each form is still counted and has its latest submission read
+        self.assertEqual(count_queries(), queries + 3 * 2)
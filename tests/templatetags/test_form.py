@@ -1,3 +1,5 @@
+from mock import patch
+
 from wagtailstreamforms.models import Form
 
 from ..test_case import AppTestCase
@@ -9,7 +11,8 @@ class TemplateTagTests(AppTestCase):
     def setUp(self):
         self.form = Form.objects.get(pk=1)
 
-    def test_render(self):
+    @patch('wagtailstreamforms.blocks.make_submission_token', return_value='some-token')
+    def test_render(self, make_submission_token):
         fake_request = self.rf.get('/')
         html = self.render_template(
             """{% load streamforms_tags %}{% streamforms_form "basic-form" "some-ref" "." %}""",
@@ -22,6 +25,7 @@ class TemplateTagTests(AppTestCase):
             '<input type="hidden" name="hidden" id="id_hidden" />',
             '<input id="id_form_id" name="form_id" type="hidden" value="%s">' % self.form.pk,
             '<input id="id_form_reference" name="form_reference" type="hidden" value="some-ref">',
+            '<input id="id_submission_token" name="submission_token" type="hidden" value="some-token">',
             '<div class="field-row">'
             '<label for="id_singleline">singleline</label>'
             '<input type="text" name="singleline" required id="id_singleline" />'
@@ -0,0 +1,48 @@
+import json
+import re
+
+from wagtailstreamforms.models import Form
+
+from ..test_case import AppTestCase
+
+
+class JsonSchemaTagTests(AppTestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.form = Form.objects.get(pk=1)
+
+    def get_schema(self, html):
+        return json.loads(re.search(r'<script[^>]*>(.*)</script>', html).group(1))
+
+    def test_render_by_slug(self):
+        html = self.render_template(
+            """{% load streamforms_tags %}{% streamforms_json_schema "basic-form" %}""", {}
+        )
+
+        self.assertTrue(html.startswith(
+            '<script id="streamforms-schema-basic-form" type="application/schema+json">'
+        ))
+        self.assertEqual(self.get_schema(html), json.loads(json.dumps(self.form.get_json_schema())))
+
+    def test_render_by_form_with_element_id(self):
+        html = self.render_template(
+            """{% load streamforms_tags %}{% streamforms_json_schema form "schema" %}""", {'form': self.form}
+        )
+
+        self.assertTrue(html.startswith('<script id="schema" type="application/schema+json">'))
+
+    def test_script_tag_is_escaped(self):
+        self.form.title = '</script><script>alert(1)</script>'
+        self.form.save()
+
+        html = self.render_template(
+            """{% load streamforms_tags %}{% streamforms_json_schema form %}""", {'form': self.form}
+        )
+
+        self.assertEqual(html.count('</script>'), 1)
+        self.assertEqual(self.get_schema(html)['title'], self.form.title)
+
+    def test_invalid_slug_renders_nothing(self):
+        html = self.render_template("""{% load streamforms_tags %}{% streamforms_json_schema "foo" %}""", {})
+        self.assertEqual(html, '')
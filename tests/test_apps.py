@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.core.management import call_command
+from django.utils.six import StringIO
+from mock import patch
+
+from wagtailstreamforms import fields, hooks
+from wagtailstreamforms.apps import WagtailStreamFormsConfig
+from wagtailstreamforms.utils.apps import get_registry_timings, import_registry_modules
+
+from .test_case import AppTestCase
+
+
+class AppConfigTests(AppTestCase):
+
+    def test_app_config(self):
+        self.assertIsInstance(apps.get_app_config('wagtailstreamforms'), WagtailStreamFormsConfig)
+
+    def test_registries_populated_when_ready(self):
+        self.assertTrue(fields._searched_for_fields)
+        self.assertTrue(hooks._searched_for_hooks)
+
+
+class RegistryModuleTests(AppTestCase):
+
+    def test_searches_installed_apps(self):
+        modules = import_registry_modules('wagtailstreamforms_fields')
+
+        self.assertEqual([m.__name__ for m in modules], ['wagtailstreamforms.wagtailstreamforms_fields'])
+        self.assertEqual(get_registry_timings()['wagtailstreamforms_fields'][-2][0], 'search installed apps')
+
+    def test_declared_modules_skip_search(self):
+        with patch('wagtailstreamforms.utils.apps.get_app_modules') as get_app_modules:
+            modules = import_registry_modules('wagtailstreamforms_hooks', ['tests.urls'])
+
+        get_app_modules.assert_not_called()
+        self.assertEqual(
+            [m.__name__ for m in modules],
+            ['wagtailstreamforms.wagtailstreamforms_hooks', 'tests.urls']
+        )
+        self.assertEqual(get_registry_timings()['wagtailstreamforms_hooks'][-1][0], 'tests.urls')
+
+    def test_command(self):
+        out = StringIO()
+        call_command('registrytimings', stdout=out)
+
+        self.assertIn('wagtailstreamforms.wagtailstreamforms_fields', out.getvalue())
+        self.assertIn('wagtailstreamforms.wagtailstreamforms_hooks', out.getvalue())
+        self.assertIn('Registries took', out.getvalue())
@@ -36,13 +36,23 @@ class AppTestCase(TestCase):
         try:
             yield
         finally:
-            fields._fields[field_type].remove(cls)
+            fields.unregister(field_type)
 
     @contextmanager
-    def register_hook(self, hook_name, fn, order=0):
+    def register_choice_source(self, name, source, **kwargs):
+        from wagtailstreamforms import choices
+
+        choices.register(name, source, **kwargs)
+        try:
+            yield
+        finally:
+            choices.unregister(name)
+
+    @contextmanager
+    def register_hook(self, hook_name, fn, order=0, run_async=False):
         from wagtailstreamforms import hooks
 
-        hooks.register(hook_name, fn, order)
+        hooks.register(hook_name, fn, order, run_async=run_async)
         try:
             yield
         finally:
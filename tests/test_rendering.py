@@ -0,0 +1,72 @@
+from django.template import engines
+from django.test import override_settings
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils import rendering
+from wagtailstreamforms.utils.rendering import flatten_template_source, get_flattened_template
+
+from .test_case import AppTestCase
+
+
+class FlattenTemplateTests(AppTestCase):
+
+    def setUp(self):
+        self.engine = engines['django'].engine
+
+    def test_inlines_literal_includes(self):
+        source = "{% for field in form %}{% include 'streamforms/partials/form_field.html' %}{% endfor %}"
+
+        flattened = flatten_template_source(source, self.engine)
+
+        self.assertNotIn('include', flattened)
+        self.assertIn('{{ field.label_tag }}', flattened)
+
+    def test_keeps_variable_and_missing_includes(self):
+        source = "{% include template_name %}{% include 'does/not/exist.html' %}"
+        self.assertEqual(flatten_template_source(source, self.engine), source)
+
+    def test_compiled_once(self):
+        rendering._flattened_templates.clear()
+
+        template = get_flattened_template('streamforms/form_block.html')
+
+        self.assertIs(get_flattened_template('streamforms/form_block.html'), template)
+
+    @override_settings(DEBUG=True)
+    def test_not_kept_when_debug(self):
+        rendering._flattened_templates.clear()
+
+        get_flattened_template('streamforms/form_block.html')
+
+        self.assertNotIn('streamforms/form_block.html', rendering._flattened_templates)
+
+
+class FlattenedRenderTests(AppTestCase):
+    fixtures = ['test.json']
+
+    def test_same_markup_as_default_renderer(self):
+        form = Form.objects.get(pk=1)
+        block = WagtailFormBlock()
+        value = block.to_python({'form': form.pk, 'form_action': '.', 'form_reference': 'some-ref'})
+        context = {'request': self.rf.get('/'), 'csrf_token': 'token', 'submission_token': 'token'}
+
+        default_html = block.render(value, context)
+
+        with override_settings(WAGTAILSTREAMFORMS_FLATTEN_FORM_TEMPLATES=True):
+            flattened_html = block.render(value, context)
+
+        self.assertEqual(flattened_html, default_html)
+
+    @override_settings(WAGTAILSTREAMFORMS_FLATTEN_FORM_TEMPLATES=True)
+    def test_invalid_form_errors_rendered(self):
+        form = Form.objects.get(pk=1)
+        invalid_form = form.get_form({'form_id': form.pk, 'form_reference': 'some-ref'})
+        assert not invalid_form.is_valid()
+        block = WagtailFormBlock()
+
+        html = block.render(block.to_python({
+            'form': form.pk, 'form_action': '.', 'form_reference': 'some-ref'
+        }), {'invalid_stream_form_reference': 'some-ref', 'invalid_stream_form': invalid_form})
+
+        self.assertIn('This field is required.', html)
@@ -0,0 +1,266 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from django.test import override_settings
+from django.utils.datastructures import MultiValueDict
+from mock import patch
+
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils import spool
+from wagtailstreamforms.utils.spool import Spool, flush_submissions, get_spool, make_record
+from wagtailstreamforms.wagtailstreamforms_hooks import save_form_submission_data, save_form_submission_data_batch
+
+from .test_case import AppTestCase
+
+
+class SpoolTests(AppTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.spool = Spool(self.dir, max_rows=3, max_age=60)
+
+    def tearDown(self):
+        self.spool.rotate()
+        shutil.rmtree(self.dir)
+
+    def names(self):
+        return sorted(os.path.splitext(name)[1] for name in os.listdir(self.dir))
+
+    def drain(self):
+        drained = []
+        self.spool.drain(drained.append)
+        return drained
+
+    def test_records_are_appended_to_an_open_segment(self):
+        self.assertFalse(self.spool.append({'a': 1}))
+        self.assertFalse(self.spool.append({'a': 2}))
+
+        self.assertEqual(self.names(), ['.open'])
+        self.assertEqual(self.drain(), [])
+
+    def test_segment_is_closed_when_full(self):
+        self.spool.append({'a': 1})
+        self.spool.append({'a': 2})
+        self.assertTrue(self.spool.append({'a': 3}))
+
+        self.assertEqual(self.names(), ['.jsonl'])
+
+    def test_segment_is_closed_when_old(self):
+        self.spool.max_age = 0
+        self.assertTrue(self.spool.append({'a': 1}))
+
+    def test_rotate_closes_old_segments(self):
+        self.spool.append({'a': 1})
+
+        self.spool.rotate(60)
+        self.assertEqual(self.names(), ['.open'])
+
+        self.spool.rotate()
+        self.assertEqual(self.names(), ['.jsonl'])
+
+    def test_drain_reads_and_removes_closed_segments(self):
+        for i in range(4):
+            self.spool.append({'a': i})
+        self.spool.rotate()
+
+        self.assertEqual(self.drain(), [[{'a': 0}, {'a': 1}, {'a': 2}], [{'a': 3}]])
+        self.assertEqual(self.names(), [])
+
+    def test_drain_keeps_segment_when_fn_errors(self):
+        self.spool.append({'a': 1})
+        self.spool.rotate()
+
+        with self.assertRaises(ValueError):
+            self.spool.drain(lambda records: int('x'))
+
+        self.assertEqual(self.names(), ['.jsonl'])
+        self.assertEqual(self.drain(), [[{'a': 1}]])
+
+    def test_drain_skips_segments_being_read(self):
+        self.spool.append({'a': 1})
+        self.spool.rotate()
+        name = os.listdir(self.dir)[0]
+
+        with open(os.path.join(self.dir, name)) as f:
+            spool.lock_file(f)
+            self.assertEqual(self.drain(), [])
+
+        self.assertEqual(self.drain(), [[{'a': 1}]])
+
+    def test_drain_skips_lines_cut_short(self):
+        with open(os.path.join(self.dir, '1-host-1.jsonl'), 'w') as f:
+            f.write('{"a": 1}\n{"a": ')
+
+        with self.assertLogs('wagtailstreamforms.utils.spool', 'ERROR'):
+            self.assertEqual(self.drain(), [[{'a': 1}]])
+
+    def test_idle_segment_is_closed(self):
+        self.spool.max_age = 0.1
+        self.spool.append({'a': 1})
+        self.assertEqual(self.names(), ['.open'])
+
+        time.sleep(0.3)
+
+        self.assertEqual(self.names(), ['.jsonl'])
+
+        # the next record is appended to a new segment
+        self.spool.append({'a': 2})
+        self.assertEqual(self.names(), ['.jsonl', '.open'])
+
+    def test_recovers_segments_of_dead_processes(self):
+        for name in ['1-host-1.open', '2-host-1.flushing']:
+            with open(os.path.join(self.dir, name), 'w') as f:
+                f.write('{"a": 1}\n')
+
+        with self.assertLogs('wagtailstreamforms.utils.spool', 'WARNING'):
+            self.spool.recover()
+
+        self.assertEqual(self.names(), ['.jsonl', '.jsonl'])
+
+    def test_does_not_recover_segments_of_live_processes(self):
+        other = Spool(self.dir)
+        other.append({'a': 1})
+
+        self.spool.recover()
+
+        self.assertEqual(self.names(), ['.open'])
+        other.rotate()
+
+
+class BufferedSubmissionTests(AppTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.settings = override_settings(
+            WAGTAILSTREAMFORMS_SUBMISSION_BUFFER=True,
+            WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR=self.dir,
+            WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_THREAD=False,
+            WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FLUSH_INTERVAL=60,
+        )
+        self.settings.enable()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+                {'type': 'singlefile', 'value': {'label': 'File', 'required': False}, 'id': 'b'},
+            ])
+        )
+
+    def tearDown(self):
+        get_spool().rotate()
+        self.settings.disable()
+        shutil.rmtree(self.dir)
+
+    def get_form(self, name='Bill', token='', files=None):
+        data = {'name': name, 'form_id': self.form.pk, 'form_reference': 'ref', 'submission_token': token}
+        form = self.form.get_form(data, files or {})
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def flush(self):
+        get_spool().rotate()
+        return flush_submissions()
+
+    def test_submission_is_saved_by_the_flush(self):
+        form = self.get_form(token='abc')
+        save_form_submission_data(self.form, form)
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+        self.assertEqual(self.flush(), 1)
+
+        submission = FormSubmission.objects.get()
+        self.assertEqual(submission.form, self.form)
+        self.assertEqual(submission.field_schema, self.form.get_field_schema())
+        self.assertEqual(submission.submission_token, form.cleaned_data['submission_token'])
+        self.assertEqual(submission.get_data()['name'], 'Bill')
+
+    def test_submissions_are_saved_in_one_insert(self):
+        for i in range(5):
+            save_form_submission_data(self.form, self.get_form(name='Name %s' % i))
+        get_spool().rotate()
+
+        # the form, existing tokens, then the insert and submit times in a savepoint
+        with self.assertNumQueries(6):
+            self.assertEqual(flush_submissions(), 5)
+
+        self.assertEqual(len(set(FormSubmission.objects.values_list('submission_token', flat=True))), 5)
+
+    def test_batch_is_buffered(self):
+        save_form_submission_data_batch(self.form, [self.get_form(), self.get_form()])
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+        self.assertEqual(self.flush(), 2)
+
+    def test_submit_time_is_kept(self):
+        submit_time = datetime(2017, 1, 2, 10, 0)
+        get_spool().append(make_record(self.form, '{"name": "Bill"}', 'abc', submit_time))
+
+        self.flush()
+
+        self.assertEqual(FormSubmission.objects.get().submit_time, submit_time)
+
+    def test_submissions_with_files_are_saved_now(self):
+        form = self.get_form(files=MultiValueDict({'file': [self.get_file()]}))
+
+        save_form_submission_data(self.form, form)
+
+        self.assertEqual(FormSubmission.objects.get().files.count(), 1)
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_submissions_already_saved_are_skipped(self):
+        save_form_submission_data(self.form, self.get_form(token='abc'))
+        save_form_submission_data(self.form, self.get_form(token='abc'))
+        self.flush()
+
+        save_form_submission_data(self.form, self.get_form(token='abc'))
+        self.assertEqual(self.flush(), 0)
+
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    def test_submissions_of_deleted_forms_are_dropped(self):
+        save_form_submission_data(self.form, self.get_form())
+        self.form.delete()
+
+        with self.assertLogs('wagtailstreamforms.utils.spool', 'WARNING'):
+            self.assertEqual(self.flush(), 0)
+
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_segment_is_kept_when_the_save_errors(self):
+        save_form_submission_data(self.form, self.get_form())
+        get_spool().rotate()
+
+        with patch('wagtailstreamforms.utils.spool.save_records', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                flush_submissions()
+
+        self.assertEqual(flush_submissions(), 1)
+
+    def test_fsync(self):
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FSYNC=True):
+            with patch('wagtailstreamforms.utils.spool.os.fsync') as fsync:
+                save_form_submission_data(self.form, self.get_form())
+                get_spool().rotate()
+
+        self.assertEqual(fsync.call_count, 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_THREAD=True, WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FLUSH_SIZE=1)
+    def test_flusher_thread_is_woken_by_a_closed_segment(self):
+        with patch('wagtailstreamforms.utils.spool.flush_submissions') as flush:
+            save_form_submission_data(self.form, self.get_form())
+            spool.stop_flusher(timeout=5)
+
+        self.assertTrue(flush.called)
+
+    def test_buffer_dir_is_required(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        with override_settings(WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR=None):
+            with self.assertRaises(ImproperlyConfigured):
+                save_form_submission_data(self.form, self.get_form())
@@ -0,0 +1,217 @@
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Barrier, Thread
+from types import SimpleNamespace
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+from mock import patch
+from wagtail.core.models import Page
+
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils import throttle
+from wagtailstreamforms.wagtail_hooks import process_form
+
+from .test_case import AppTestCase
+
+
+class TokenBucketTests(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(throttle.parse_rate('10/m'), (10, 60))
+        self.assertEqual(throttle.parse_rate('5/second'), (5, 1))
+        self.assertEqual(throttle.parse_rate('100/h'), (100, 3600))
+        self.assertIsNone(throttle.parse_rate(None))
+
+    def test_parse_invalid_rate(self):
+        for rate in ['10', 'ten/m', '10/w', '10/']:
+            with self.assertRaises(ImproperlyConfigured):
+                throttle.parse_rate(rate)
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT_CACHE=None)
+    @patch('wagtailstreamforms.utils.throttle.time.time')
+    def test_bucket_empties_and_refills(self, now):
+        now.return_value = 1000
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+        self.assertEqual(throttle.take_token('bucket', 2, 60), 30)
+
+        now.return_value = 1030
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+        self.assertIsNotNone(throttle.take_token('bucket', 2, 60))
+
+    @patch('wagtailstreamforms.utils.throttle.time.time')
+    def test_cache_counts_each_period(self, now):
+        now.return_value = 1000
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+        self.assertEqual(throttle.take_token('bucket', 2, 60), 20)
+        self.assertEqual(cache.get('bucket:16'), 3)
+
+        now.return_value = 1020
+        self.assertIsNone(throttle.take_token('bucket', 2, 60))
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT_CACHE=None)
+    def test_local_buckets(self):
+        self.assertIs(throttle.get_buckets(), throttle.local_buckets)
+        throttle.take_token('local', 1, 60)
+        self.assertIsNotNone(throttle.local_buckets.get('local'))
+        self.assertIsNone(cache.get('local'))
+
+    def test_falls_back_to_local_buckets_when_the_cache_fails(self):
+        with patch.object(cache, 'add', side_effect=ConnectionError), \
+                self.assertLogs('wagtailstreamforms.utils.throttle', 'ERROR'):
+            self.assertIsNone(throttle.take_token('failing', 1, 60))
+            self.assertIsNotNone(throttle.take_token('failing', 1, 60))
+
+    def take_tokens_concurrently(self, key, number, threads=20):
+        barrier = Barrier(threads)
+        results = []
+
+        def take():
+            barrier.wait()
+            results.append(throttle.take_token(key, number, 60))
+
+        workers = [Thread(target=take) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        return results
+
+    @contextmanager
+    def slow_reads(self):
+        """ Reading a bucket gives the other threads time to read it as well. """
+
+        class SlowDict(OrderedDict):
+            def get(self, key, default=None):
+                value = super().get(key, default)
+                time.sleep(0.01)
+                return value
+
+            def pop(self, key, *args):
+                value = super().pop(key, *args)
+                time.sleep(0.01)
+                return value
+
+        get = LocMemCache.get
+
+        def slow_get(*args, **kwargs):
+            value = get(*args, **kwargs)
+            time.sleep(0.01)
+            return value
+
+        # each thread has its own instance of the cache
+        with patch.object(throttle.local_buckets, 'buckets', SlowDict()), \
+                patch.object(LocMemCache, 'get', slow_get):
+            yield
+
+    def test_concurrent_tokens_are_only_taken_once(self):
+        with self.slow_reads():
+            self.assertEqual(self.take_tokens_concurrently('concurrent', 5).count(None), 5)
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT_CACHE=None)
+    def test_concurrent_local_tokens_are_only_taken_once(self):
+        with self.slow_reads():
+            self.assertEqual(self.take_tokens_concurrently('concurrent', 5).count(None), 5)
+
+
+class ThrottleSubmissionTests(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        throttle.reset_throttle_counts()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+
+    def post(self, data=None, ip='127.0.0.1', **extra):
+        post_data = {'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'ref'}
+        post_data.update(data or {})
+        request = self.rf.post('/fake/', post_data, REMOTE_ADDR=ip, **extra)
+        request.user = AnonymousUser()
+        return process_form(self.page, request)
+
+    def test_not_throttled_by_default(self):
+        for i in range(5):
+            self.assertEqual(self.post().status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT='2/m')
+    def test_form_rate_limit(self):
+        self.assertEqual(self.post(ip='1.1.1.1').status_code, 302)
+        self.assertEqual(self.post(ip='2.2.2.2').status_code, 302)
+
+        with patch.object(Form, 'get_form') as get_form:
+            response = self.post(ip='3.3.3.3')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertFalse(get_form.called)
+        self.assertEqual(self.form.get_submission_class().objects.count(), 2)
+
+    @override_settings(WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT='1/m')
+    def test_client_rate_limit(self):
+        self.assertEqual(self.post(ip='1.1.1.1').status_code, 302)
+        self.assertEqual(self.post(ip='1.1.1.1').status_code, 429)
+        self.assertEqual(self.post(ip='2.2.2.2').status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT='1/m')
+    def test_rate_limit_is_per_form(self):
+        other = Form.objects.create(title='Other', slug='other', fields=self.form.fields)
+        self.assertEqual(self.post().status_code, 302)
+        self.assertEqual(self.post({'form_id': other.pk}).status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_RATE_LIMIT='10/m')
+    def test_advanced_settings_rate_limit(self):
+        advanced = SimpleNamespace(rate_limit='1/m', client_rate_limit=None)
+        with patch.object(Form, 'get_advanced_settings', return_value=advanced):
+            self.assertEqual(self.post().status_code, 302)
+            self.assertEqual(self.post().status_code, 429)
+
+    @override_settings(WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT='1/m')
+    def test_json_response(self):
+        self.post()
+        response = self.post(HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(json.loads(response.content.decode())['errors']['__all__'][0]['code'], 'throttled')
+
+    @override_settings(WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT='1/m')
+    def test_api_view_is_throttled(self):
+        url = reverse('streamforms_api_submit', kwargs={'slug': 'form'})
+        self.client.post(url, json.dumps({'name': 'Bill'}), content_type='application/json')
+        response = self.client.post(url, json.dumps({'name': 'Bill'}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT='1/m', WAGTAILSTREAMFORMS_HONEYPOT_FIELD='website')
+    def test_spam_does_not_use_the_rate_limit(self):
+        self.assertEqual(self.post({'website': 'spam'}).status_code, 400)
+        self.assertEqual(self.post().status_code, 302)
+
+    @override_settings(WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT='1/m')
+    def test_counts(self):
+        self.post()
+        self.post()
+
+        self.assertEqual(throttle.get_throttle_counts(), {
+            (self.form.pk, 'client', 'allowed'): 1,
+            (self.form.pk, 'client', 'throttled'): 1,
+        })
@@ -0,0 +1,260 @@
+import json
+
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.core.cache import cache
+from django.conf import settings
+from django.test import Client, override_settings
+from mock import patch
+from wagtail.core.models import Page
+from wagtail.core.views import serve
+
+from wagtailstreamforms.blocks import WagtailFormBlock
+from tests.models import FormPage
+from wagtailstreamforms.middleware import FormTokenMiddleware
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.tokens import (
+    FORM_TOKEN_SALT,
+    check_form_token,
+    claim_request_form_token,
+    consume_request_form_token,
+    make_form_token
+)
+from wagtailstreamforms.views import FormFragmentView, SubmitFormView
+from wagtailstreamforms.wagtail_hooks import process_form
+
+from .test_case import AppTestCase
+
+
+class TestFormTokens(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_token_is_valid_for_its_form(self):
+        token = make_form_token(1, 'some-ref')
+        self.assertTrue(check_form_token(token, 1, 'some-ref'))
+        self.assertTrue(check_form_token(token, '1', 'some-ref'))
+
+    def test_token_is_invalid_for_other_forms(self):
+        token = make_form_token(1, 'some-ref')
+        self.assertFalse(check_form_token(token, 2, 'some-ref'))
+        self.assertFalse(check_form_token(token, 1, 'other-ref'))
+
+    def test_missing_or_tampered_token_is_invalid(self):
+        self.assertFalse(check_form_token(None, 1, 'some-ref'))
+        self.assertFalse(check_form_token('', 1, 'some-ref'))
+        self.assertFalse(check_form_token(make_form_token(1, 'some-ref') + 'x', 1, 'some-ref'))
+
+    def test_token_signed_with_another_salt_is_invalid(self):
+        token = signing.TimestampSigner(salt=FORM_TOKEN_SALT + 'x').sign('1:some-ref')
+        self.assertFalse(check_form_token(token, 1, 'some-ref'))
+
+    @override_settings(WAGTAILSTREAMFORMS_FORM_TOKEN_MAX_AGE=-1)
+    def test_expired_token_is_invalid(self):
+        token = make_form_token(1, 'some-ref')
+        self.assertFalse(check_form_token(token, 1, 'some-ref'))
+
+    def test_token_can_only_be_consumed_once_with_the_same_data(self):
+        data = {'form_token': make_form_token(1, 'some-ref'), 'form_id': 1, 'form_reference': 'some-ref', 'a': 'b'}
+
+        self.assertTrue(consume_request_form_token(self.rf.post('/', data)))
+        self.assertFalse(consume_request_form_token(self.rf.post('/', data)))
+
+        data['a'] = 'c'
+        self.assertTrue(consume_request_form_token(self.rf.post('/', data)))
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_claimed_token_is_released_if_processing_fails(self):
+        data = {'form_token': make_form_token(1, 'some-ref'), 'form_id': 1, 'form_reference': 'some-ref'}
+
+        with self.assertRaises(ValueError):
+            with claim_request_form_token(self.rf.post('/', data)) as claimed:
+                self.assertTrue(claimed)
+                raise ValueError
+
+        with claim_request_form_token(self.rf.post('/', data)) as claimed:
+            self.assertTrue(claimed)
+        with claim_request_form_token(self.rf.post('/', data)) as claimed:
+            self.assertFalse(claimed)
+
+    def test_request_without_a_token_is_always_claimed(self):
+        with claim_request_form_token(self.rf.post('/', {'form_id': 1})) as claimed:
+            self.assertTrue(claimed)
+
+
+@override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+class TestFormTokenMiddleware(AppTestCase):
+
+    def process_view(self, request, callback=serve, path='/'):
+        return FormTokenMiddleware().process_view(request, callback, (path,), {})
+
+    def post(self, form_id=1):
+        return self.rf.post('/', {
+            'form_token': make_form_token(form_id, 'some-ref'), 'form_id': form_id, 'form_reference': 'some-ref'
+        })
+
+    def test_invalid_token_does_not_skip_csrf_checks(self):
+        request = self.rf.post('/', {
+            'form_token': make_form_token(2, 'some-ref'), 'form_id': 1, 'form_reference': 'some-ref'
+        })
+        with patch.object(FormTokenMiddleware, 'is_form_view', return_value=True):
+            self.process_view(request)
+        self.assertFalse(getattr(request, '_dont_enforce_csrf_checks', False))
+
+    def test_valid_token_skips_csrf_checks_of_the_submit_view(self):
+        request = self.post()
+        FormTokenMiddleware().process_view(request, SubmitFormView.as_view(), (), {'pk': 1})
+        self.assertTrue(getattr(request, '_dont_enforce_csrf_checks', False))
+
+    def test_valid_token_skips_csrf_checks_of_the_fragment_view(self):
+        request = self.post()
+        FormTokenMiddleware().process_view(request, FormFragmentView.as_view(), (), {'pk': 1})
+        self.assertTrue(getattr(request, '_dont_enforce_csrf_checks', False))
+
+    def test_token_of_another_form_does_not_skip_csrf_checks(self):
+        request = self.post(form_id=2)
+        FormTokenMiddleware().process_view(request, FormFragmentView.as_view(), (), {'pk': 1})
+        self.assertFalse(getattr(request, '_dont_enforce_csrf_checks', False))
+
+    def test_other_views_do_not_skip_csrf_checks(self):
+        request = self.post()
+        self.process_view(request, lambda request: None)
+        self.assertFalse(getattr(request, '_dont_enforce_csrf_checks', False))
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=False)
+    def test_does_nothing_when_setting_false(self):
+        request = self.post()
+        with patch.object(FormTokenMiddleware, 'is_form_view', return_value=True):
+            self.process_view(request)
+        self.assertFalse(getattr(request, '_dont_enforce_csrf_checks', False))
+
+
+@override_settings(
+    WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True,
+    MIDDLEWARE=['wagtailstreamforms.middleware.FormTokenMiddleware'] + settings.MIDDLEWARE
+)
+class TestFormTokenMiddlewareViews(AppTestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client(enforce_csrf_checks=True)
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.page = Page.objects.get(url_path='/home/').add_child(instance=FormPage(
+            title='Form page',
+            slug='form-page',
+            body=json.dumps([{'type': 'section', 'value': {'forms': [
+                {'form': self.form.pk, 'form_action': '', 'form_reference': 'some-ref'}
+            ]}}])
+        ))
+
+    def post(self, url, form_reference='some-ref'):
+        return self.client.post(url, {
+            'name': 'Bill',
+            'form_id': self.form.pk,
+            'form_reference': form_reference,
+            'form_token': make_form_token(self.form.pk, form_reference)
+        })
+
+    def test_page_with_the_form_is_not_csrf_checked(self):
+        self.assertEqual(self.post(self.page.url).status_code, 302)
+
+    def test_page_without_the_form_is_csrf_checked(self):
+        self.assertEqual(self.post('/', 'some-ref').status_code, 403)
+        self.assertEqual(self.post(self.page.url, 'other-ref').status_code, 403)
+
+    def test_other_views_are_csrf_checked(self):
+        self.assertEqual(self.post('/cms/login/').status_code, 403)
+
+
+@override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+class TestFormBlockFormToken(AppTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.block = WagtailFormBlock()
+        self.value = self.block.to_python({
+            'form': self.form.pk,
+            'form_action': '.',
+            'form_reference': 'some-ref'
+        })
+
+    def test_renders_form_token_instead_of_csrf_token(self):
+        request = self.rf.get('/')
+        html = self.block.render(self.value, {'request': request})
+
+        token = make_form_token(self.form.pk, 'some-ref')
+        self.assertIn('<input type="hidden" name="form_token" value="%s">' % token, html)
+        self.assertNotIn('csrfmiddlewaretoken', html)
+        self.assertNotIn('CSRF_COOKIE', request.META)
+
+    @override_settings(WAGTAILSTREAMFORMS_CACHE_FORM_FRAGMENTS=True)
+    def test_cached_fragment_has_a_fresh_form_token(self):
+        self.block.render(self.value, {'request': self.rf.get('/')})
+
+        with patch('wagtailstreamforms.blocks.make_form_token', return_value='fresh-token'):
+            html = self.block.render(self.value, {'request': self.rf.get('/')})
+
+        self.assertIn('<input type="hidden" name="form_token" value="fresh-token">', html)
+        self.assertNotIn('csrfmiddlewaretoken', html)
+
+
+@override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+class TestProcessFormToken(AppTestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.get(pk=1)
+        self.mock_messages = patch('django.contrib.messages.error')
+        self.mock_messages.start()
+
+    def tearDown(self):
+        self.mock_messages.stop()
+
+    def post(self, form_token):
+        request = self.rf.post('/fake/', {
+            'form_token': form_token,
+            'form_id': self.form.pk,
+            'form_reference': 'some-ref'
+        })
+        request.user = AnonymousUser()
+        return process_form(self.page, request)
+
+    def test_invalid_token_is_forbidden(self):
+        response = self.post(make_form_token(self.form.pk, 'other-ref'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_form_can_be_posted_again_with_the_token(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+
+        self.assertEqual(self.post(token).status_code, 200)
+        self.assertEqual(self.post(token).status_code, 200)
+
+    def test_replayed_token_is_answered_like_a_duplicate(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+        self.form.fields = json.dumps([])
+        self.form.save()
+
+        with patch('wagtailstreamforms.wagtail_hooks.process_form_submission') as process:
+            self.assertEqual(self.post(token).status_code, 302)
+            self.assertEqual(self.post(token).status_code, 302)
+
+        self.assertEqual(process.call_count, 1)
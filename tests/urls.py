@@ -8,5 +8,6 @@ from wagtail.core import urls as wagtail_urls
 urlpatterns = [
     url(r'^admin/', admin.site.urls),
     url(r'^cms/', include(wagtailadmin_urls)),
+    url(r'^streamforms/', include('wagtailstreamforms.public_urls')),
     url(r'', include(wagtail_urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,232 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from wagtailstreamforms.models import Form, FormSubmission
+
+from ..test_case import AppTestCase
+
+
+class ApiTestCase(AppTestCase):
+
+    def setUp(self):
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            success_message='well done',
+            error_message='oops',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True, 'help_text': 'Your name'},
+                 'id': 'a'},
+                {'type': 'multiselect', 'value': {'label': 'Colours', 'required': False,
+                                                  'choices': ['Red', 'Blue']}, 'id': 'b'},
+            ])
+        )
+
+
+class FormDefinitionViewTestCase(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('streamforms_api_form', kwargs={'slug': 'form'})
+
+    def test_returns_definition(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(json.loads(response.content.decode()), {
+            'id': self.form.pk,
+            'slug': 'form',
+            'title': 'Form',
+            'revision': self.form.revision,
+            'submit_button_text': 'Submit',
+            'fields': [
+                {'name': 'name', 'type': 'singleline', 'label': 'Name', 'help_text': 'Your name',
+                 'required': True, 'initial': None, 'input_type': 'text'},
+                {'name': 'colours', 'type': 'multiselect', 'label': 'Colours', 'help_text': None,
+                 'required': False, 'initial': None, 'input_type': 'select',
+                 'choices': [['Red', 'Red'], ['Blue', 'Blue']]},
+            ]
+        })
+
+    def test_definition_is_cached_per_revision(self):
+        self.assertIs(self.form.get_definition(), self.form.get_definition())
+
+        definition = self.form.get_definition()
+        self.form.title = 'Changed'
+        self.form.save()
+
+        self.assertIsNot(self.form.get_definition(), definition)
+        self.assertEqual(self.form.get_definition()['title'], 'Changed')
+
+    def test_etag_is_the_revision(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['ETag'], '"%s"' % self.form.revision)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=0', response['Cache-Control'])
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"%s"' % self.form.revision)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_old_etag_is_modified(self):
+        etag = '"%s"' % self.form.revision
+        self.form.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFINITION_MAX_AGE=300)
+    def test_max_age_setting(self):
+        response = self.client.get(self.url)
+        self.assertIn('max-age=300', response['Cache-Control'])
+
+    def test_invalid_form_404s(self):
+        response = self.client.get(reverse('streamforms_api_form', kwargs={'slug': 'foo'}))
+        self.assertEqual(response.status_code, 404)
+
+
+class FormJsonSchemaViewTestCase(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('streamforms_api_schema', kwargs={'slug': 'form'})
+
+    def test_returns_schema(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/schema+json')
+        self.assertDictEqual(json.loads(response.content.decode()), {
+            '$schema': 'http://json-schema.org/draft-07/schema#',
+            'type': 'object',
+            'title': 'Form',
+            'version': self.form.revision,
+            'properties': {
+                'name': {'type': 'string', 'title': 'Name', 'description': 'Your name', 'minLength': 1},
+                'colours': {'type': 'array', 'title': 'Colours', 'uniqueItems': True,
+                            'items': {'type': 'string', 'enum': ['Red', 'Blue']}},
+            },
+            'required': ['name'],
+        })
+
+    def test_matching_etag_is_not_modified(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"%s"' % self.form.revision)
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_form_404s(self):
+        response = self.client.get(reverse('streamforms_api_schema', kwargs={'slug': 'foo'}))
+        self.assertEqual(response.status_code, 404)
+
+
+class FormSubmissionApiViewTestCase(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('streamforms_api_submit', kwargs={'slug': 'form'})
+
+    def post(self, data, content_type='application/json'):
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        return self.client.post(self.url, data, content_type=content_type)
+
+    def test_valid_submission_is_processed(self):
+        response = self.post({'name': 'Bill', 'colours': ['Red', 'Blue']})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(json.loads(response.content.decode()), {'message': 'well done', 'redirect_url': None})
+
+        data = FormSubmission.objects.get().get_data()
+        self.assertEqual(data['name'], 'Bill')
+        self.assertEqual(data['colours'], ['Red', 'Blue'])
+
+    def test_invalid_submission_returns_errors(self):
+        response = self.post({'colours': ['Green']})
+
+        self.assertEqual(response.status_code, 400)
+
+        data = json.loads(response.content.decode())
+        self.assertEqual(data['message'], 'oops')
+        self.assertEqual(data['errors']['name'][0]['code'], 'required')
+        self.assertEqual(data['errors']['colours'][0]['code'], 'invalid_choice')
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+    def test_csrf_is_not_required(self):
+        self.client.handler.enforce_csrf_checks = True
+
+        response = self.post({'name': 'Bill'})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_only_json_is_accepted(self):
+        response = self.client.post(self.url, {'name': 'Bill'})
+        self.assertEqual(response.status_code, 415)
+
+    def test_invalid_json_is_bad_request(self):
+        self.assertEqual(self.post('{').status_code, 400)
+        self.assertEqual(self.post('[]').status_code, 400)
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    @override_settings(WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING=False)
+    def test_404s_when_processing_disabled(self):
+        self.assertEqual(self.post({'name': 'Bill'}).status_code, 404)
+
+
+class FormSubmissionBatchApiViewTestCase(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('streamforms_api_submit_batch', kwargs={'slug': 'form'})
+        User.objects.create_superuser('user', 'user@test.com', 'password')
+        self.client.login(username='user', password='password')
+
+    def post(self, data):
+        return self.client.post(self.url, json.dumps(data), content_type='application/json')
+
+    def test_valid_submissions_are_processed(self):
+        response = self.post([{'name': 'Bill %s' % i} for i in range(5)])
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content.decode())
+        self.assertEqual(data['processed'], 5)
+        self.assertEqual([result['status'] for result in data['results']], ['processed'] * 5)
+        self.assertEqual(
+            sorted(submission.get_data()['name'] for submission in FormSubmission.objects.all()),
+            ['Bill %s' % i for i in range(5)]
+        )
+
+    def test_each_submission_is_reported(self):
+        response = self.post([{'name': 'Bill'}, {'colours': ['Green']}, 'foo'])
+
+        data = json.loads(response.content.decode())
+        self.assertEqual(data['processed'], 1)
+        self.assertEqual(data['results'][0], {'index': 0, 'status': 'processed'})
+        self.assertEqual(data['results'][1]['status'], 'invalid')
+        self.assertEqual(data['results'][1]['errors']['name'][0]['code'], 'required')
+        self.assertEqual(data['results'][2]['status'], 'invalid')
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_BATCH_MAX_SIZE=2)
+    def test_too_many_submissions(self):
+        response = self.post([{'name': 'Bill'}] * 3)
+        self.assertEqual(response.status_code, 413)
+
+    def test_requires_permission(self):
+        self.client.logout()
+
+        response = self.post([{'name': 'Bill'}])
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_must_be_a_list(self):
+        self.assertEqual(self.post({'name': 'Bill'}).status_code, 400)
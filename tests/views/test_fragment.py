@@ -0,0 +1,125 @@
+import json
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from wagtail.core.models import Page
+
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.tokens import make_form_token, make_fragment_key
+
+from ..test_case import AppTestCase
+
+
+class FormFragmentViewTestCase(AppTestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.url = self.get_url(page_id=self.page.pk)
+
+    def get_url(self, form_id=None, form_reference='some-ref', form_action='.', page_id=None):
+        key = make_fragment_key(form_id or self.form.pk, form_reference, form_action, page_id)
+        return '%s?key=%s' % (reverse('streamforms_fragment', kwargs={'pk': self.form.pk}), key)
+
+    def post(self, **data):
+        extra = data.pop('extra', {})
+        data.setdefault('form_id', self.form.pk)
+        data.setdefault('form_reference', 'some-ref')
+        return self.client.post(self.url, data, **extra)
+
+    def test_get_renders_only_the_form(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<form')
+        self.assertContains(response, 'name="form_reference" value="some-ref"')
+        self.assertNotContains(response, '<html')
+
+    @override_settings(WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS='esi')
+    def test_get_renders_the_form_when_deferred(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, '<form')
+
+    def test_invalid_form_404s(self):
+        url = '%s?key=%s' % (reverse('streamforms_fragment', kwargs={'pk': 100}), make_fragment_key(100, 'ref', '.'))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_or_changed_key_404s(self):
+        url = reverse('streamforms_fragment', kwargs={'pk': self.form.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url + '?reference=some-ref&action=.').status_code, 404)
+        self.assertEqual(self.client.get(self.url.replace('key=', 'key=x')).status_code, 404)
+
+    def test_key_of_another_form_404s(self):
+        self.assertEqual(self.client.get(self.get_url(form_id=self.form.pk + 1)).status_code, 404)
+
+    def test_action_is_from_the_key(self):
+        response = self.client.get(self.get_url(form_action='/contact/') + '&action=http://example.com/')
+        self.assertContains(response, 'action="/contact/"')
+
+    def test_invalid_post_renders_errors(self):
+        response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'This field is required.')
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+    def test_json_responses(self):
+        response = self.post(extra={'HTTP_ACCEPT': 'application/json'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', json.loads(response.content.decode())['errors'])
+
+        response = self.post(name='Bill', extra={'HTTP_ACCEPT': 'application/json'})
+        self.assertEqual(json.loads(response.content.decode())['redirect_url'], self.page.url)
+
+    def test_valid_post_redirects_to_the_page(self):
+        response = self.post(name='Bill')
+
+        self.assertRedirects(response, self.page.url, fetch_redirect_response=False)
+        self.assertEqual(FormSubmission.objects.get().get_data()['name'], 'Bill')
+
+    def test_valid_post_without_page_renders_new_form(self):
+        self.url = self.get_url()
+
+        response = self.post(name='Bill')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<form')
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING=False)
+    def test_post_not_allowed_when_processing_disabled(self):
+        response = self.post(name='Bill')
+        self.assertEqual(response.status_code, 405)
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_replayed_form_token_is_answered_like_a_duplicate(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+
+        self.assertEqual(self.post(name='Bill', form_token=token).status_code, 302)
+        self.assertEqual(self.post(name='Bill', form_token=token).status_code, 302)
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_invalid_post_with_a_form_token_can_be_posted_again(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+
+        self.assertContains(self.post(form_token=token), 'This field is required.')
+        self.assertContains(self.post(form_token=token), 'This field is required.')
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_invalid_form_token_is_forbidden(self):
+        token = make_form_token(self.form.pk, 'other-ref')
+        self.assertEqual(self.post(name='Bill', form_token=token).status_code, 403)
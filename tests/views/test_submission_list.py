@@ -3,7 +3,7 @@ from datetime import datetime
 from django.contrib.auth.models import User, Permission
 from django.urls import reverse
 
-from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.models import Form, FormFieldSchema, FormSubmission
 
 from ..test_case import AppTestCase
 
@@ -57,6 +57,23 @@ class SubmissionListViewTestCase(AppTestCase):
         response = self.client.get(self.csv_url)
         self.assertEqual(response.get('Content-Disposition'), "attachment;filename=export.csv")
 
+    def test_get_includes_historical_fields(self):
+        schema = FormFieldSchema.objects.get_for_fields([('foo', 'Old foo')])
+        FormSubmission.objects.update(field_schema=schema)
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.context['data_headings'][-1], 'Old foo')
+        self.assertEqual(response.context['data_rows'][0]['fields'][-1], 1)
+
+    def test_get_csv_includes_historical_fields(self):
+        schema = FormFieldSchema.objects.get_for_fields([('foo', 'Old foo')])
+        FormSubmission.objects.update(field_schema=schema)
+
+        response = self.client.get(self.csv_url)
+        lines = response.content.decode().splitlines()
+        self.assertTrue(lines[0].endswith(',Old foo'))
+        self.assertTrue(lines[1].endswith(',1'))
+
 
 class ListViewPermissionTestCase(AppTestCase):
     fixtures = ['test.json']
@@ -0,0 +1,128 @@
+import json
+
+from django.core.cache import cache
+from django.test import override_settings
+from mock import patch
+from django.urls import reverse
+from wagtail.core.models import Page
+
+from wagtailstreamforms.models import Form, FormSubmission
+from wagtailstreamforms.utils.tokens import make_form_token
+
+from ..test_case import AppTestCase
+
+
+class SubmitFormViewTestCase(AppTestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        cache.clear()
+        self.page = Page.objects.get(url_path='/home/')
+        self.form = Form.objects.create(
+            title='Form',
+            slug='form',
+            template_name='streamforms/form_block.html',
+            process_form_submission_hooks=['save_form_submission_data'],
+            success_message='well done',
+            error_message='oops',
+            fields=json.dumps([
+                {'type': 'singleline', 'value': {'label': 'Name', 'required': True}, 'id': 'a'},
+            ])
+        )
+        self.url = reverse('streamforms_submit', kwargs={'pk': self.form.pk})
+
+    def post(self, url=None, **data):
+        data.setdefault('form_id', self.form.pk)
+        data.setdefault('form_reference', 'some-ref')
+        return self.client.post(url or self.url, data, HTTP_REFERER='http://testserver/contact/')
+
+    def test_get_not_allowed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_invalid_form_404s(self):
+        response = self.post(reverse('streamforms_submit', kwargs={'pk': 100}))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING=False)
+    def test_404s_when_processing_disabled(self):
+        response = self.post(name='Bill')
+        self.assertEqual(response.status_code, 404)
+
+    def test_valid_post_redirects_to_referring_page(self):
+        response = self.post(name='Bill')
+
+        self.assertRedirects(response, 'http://testserver/contact/', fetch_redirect_response=False)
+        self.assertEqual(FormSubmission.objects.get().get_data()['name'], 'Bill')
+
+    def test_valid_post_redirects_to_next_url(self):
+        response = self.post(name='Bill', next='/thanks/')
+        self.assertRedirects(response, '/thanks/', fetch_redirect_response=False)
+
+    def test_valid_post_does_not_redirect_to_other_hosts(self):
+        response = self.client.post(self.url, {
+            'name': 'Bill', 'form_id': self.form.pk, 'form_reference': 'some-ref', 'next': 'http://example.com/'
+        })
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+
+    def test_valid_post_redirects_to_forms_redirect_page(self):
+        self.form.post_redirect_page = self.page
+        self.form.save()
+
+        response = self.post(name='Bill')
+
+        self.assertRedirects(response, self.page.url, fetch_redirect_response=False)
+
+    def test_valid_post_sets_success_message(self):
+        response = self.post(name='Bill')
+        self.assertEqual([str(m) for m in response.wsgi_request._messages], ['well done'])
+
+    def test_invalid_post_renders_form_with_errors(self):
+        response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'streamforms/submit_form.html')
+        self.assertContains(response, 'This field is required.')
+        self.assertContains(response, 'action="%s?next=http%%3A%%2F%%2Ftestserver%%2Fcontact%%2F"' % self.url)
+        self.assertEqual([str(m) for m in response.wsgi_request._messages], ['oops'])
+        self.assertEqual(FormSubmission.objects.count(), 0)
+
+    def test_invalid_json_post_returns_errors(self):
+        response = self.client.post(self.url, {'form_id': self.form.pk, 'form_reference': 'some-ref'}, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content.decode())['errors']['name'][0]['code'], 'required')
+
+    def test_valid_json_post_returns_redirect_url(self):
+        response = self.client.post(self.url, {'form_id': self.form.pk, 'form_reference': 'some-ref', 'name': 'Bill', 'next': '/thanks/'},
+                                    HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertDictEqual(json.loads(response.content.decode()), {'message': 'well done', 'redirect_url': '/thanks/'})
+
+    def test_invalid_ajax_post_returns_only_the_form(self):
+        response = self.client.post(self.url, {'form_id': self.form.pk, 'form_reference': 'some-ref'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateNotUsed(response, 'streamforms/submit_form.html')
+        self.assertContains(response, 'This field is required.')
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_replayed_form_token_is_answered_like_a_duplicate(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+
+        for i in range(2):
+            response = self.post(name='Bill', form_token=token)
+            self.assertRedirects(response, 'http://testserver/contact/', fetch_redirect_response=False)
+        self.assertEqual(FormSubmission.objects.count(), 1)
+
+    @override_settings(WAGTAILSTREAMFORMS_SIGNED_FORM_TOKENS=True)
+    def test_form_token_is_released_when_processing_fails(self):
+        token = make_form_token(self.form.pk, 'some-ref')
+
+        with patch.object(Form, 'process_form_submission', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                self.post(name='Bill', form_token=token)
+
+        self.assertEqual(self.post(name='Bill', form_token=token).status_code, 302)
+        self.assertEqual(FormSubmission.objects.count(), 1)
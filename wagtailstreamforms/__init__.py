@@ -5,3 +5,5 @@ from wagtailstreamforms.utils.version import get_version
 VERSION = (3, 6, 1, 'final', 1)
 
 __version__ = get_version(VERSION)
+
+default_app_config = 'wagtailstreamforms.apps.WagtailStreamFormsConfig'
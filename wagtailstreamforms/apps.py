@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.utils.translation import ugettext_lazy as _
+
+
+class WagtailStreamFormsConfig(AppConfig):
+    name = 'wagtailstreamforms'
+    verbose_name = _('Wagtail Streamforms')
+
+    def ready(self):
+        from wagtailstreamforms.fields import search_for_fields
+        from wagtailstreamforms.hooks import search_for_hooks
+
+        # populate the registries at startup rather than part way through the first request
+        search_for_fields()
+        search_for_hooks()
@@ -1,10 +1,28 @@
+import hashlib
 import uuid
+from urllib.parse import urlencode
 
 from django import forms
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import escape
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
 from wagtail.core import blocks
+from wagtail.core.fields import StreamField
+from wagtailstreamforms.conf import get_setting
 from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.rendering import get_flattened_template
+from wagtailstreamforms.utils.tokens import (
+    make_form_rendered,
+    make_form_token,
+    make_fragment_key,
+    make_submission_token
+)
 
 
 class InfoBlock(blocks.CharBlock):
@@ -38,6 +56,12 @@ class FormChooserBlock(blocks.ChooserBlock):
                 return None
 
 
+DEFERRED_FORM_TEMPLATES = {
+    'esi': 'streamforms/deferred_form_esi.html',
+    'fetch': 'streamforms/deferred_form_fetch.html',
+}
+
+
 class WagtailFormBlock(blocks.StructBlock):
     form = FormChooserBlock()
     form_action = blocks.CharBlock(
@@ -63,7 +87,131 @@ class WagtailFormBlock(blocks.StructBlock):
         else:
             self.meta.template = 'streamforms/non_existent_form.html'
 
-        return super().render(value, context)
+        if form and self.is_deferred(value, context):
+            return self.render_deferred(value, context)
+
+        if form and self.is_fragment_cacheable(value, context):
+            return self.render_cached(value, context)
+
+        return self.render_form(value, context)
+
+    def render_form(self, value, context=None):
+        """ Render the template, with its includes flattened if enabled. """
+
+        if not value.get('form') or not get_setting('FLATTEN_FORM_TEMPLATES'):
+            return super().render(value, context)
+
+        if context is None:
+            new_context = self.get_context(value)
+        else:
+            new_context = self.get_context(value, parent_context=dict(context))
+
+        return mark_safe(get_flattened_template(self.meta.template).render(new_context))
+
+    def is_deferred(self, value, context):
+        """ Should a placeholder be rendered in place of the form, invalid forms are always rendered. """
+
+        if not get_setting('DEFERRED_FORM_FRAGMENTS') or context is None or context.get('streamforms_fragment'):
+            return False
+
+        invalid_form_reference = context.get('invalid_stream_form_reference')
+
+        return not (invalid_form_reference and invalid_form_reference == value.get('form_reference'))
+
+    def get_fragment_url(self, value, context):
+        """ The url of the view that renders just this form, with its values signed so they can not be changed. """
+
+        form = value.get('form')
+        page = context.get('page')
+        key = make_fragment_key(
+            form.pk,
+            str(value.get('form_reference') or ''),
+            value.get('form_action') or '',
+            page.pk if page is not None else None
+        )
+
+        url = reverse('streamforms_fragment', kwargs={'pk': form.pk})
+        return '%s?%s' % (url, urlencode({'key': key}))
+
+    def render_deferred(self, value, context):
+        """ Render the placeholder the form is loaded into by an ESI processor or javascript. """
+
+        mode = get_setting('DEFERRED_FORM_FRAGMENTS')
+
+        try:
+            template_name = DEFERRED_FORM_TEMPLATES[mode]
+        except KeyError:
+            raise ImproperlyConfigured(
+                "'%s' is not a valid deferred form fragment mode, choose from %s" % (
+                    mode, ', '.join(sorted(DEFERRED_FORM_TEMPLATES)))
+            )
+
+        return mark_safe(render_to_string(template_name, {
+            'value': value,
+            'fragment_url': self.get_fragment_url(value, context),
+        }))
+
+    def is_fragment_cacheable(self, value, context):
+        """ Can the unbound form html be cached, invalid forms are always rendered. """
+
+        if not get_setting('CACHE_FORM_FRAGMENTS') or not context or not context.get('request'):
+            return False
+
+        form = value.get('form')
+        invalid_form_reference = context.get('invalid_stream_form_reference')
+
+        return bool(form.revision) and not (
+            invalid_form_reference and invalid_form_reference == value.get('form_reference')
+        )
+
+    def get_fragment_cache_key(self, value):
+        form = value.get('form')
+        parts = [form.pk, form.revision, value.get('form_reference'), value.get('form_action'), get_language()]
+        digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+        return 'wagtailstreamforms:fragment:%s' % digest
+
+    def get_fragment_placeholders(self, value, context):
+        """
+        The context values that differ for each visitor.
+
+        Returns a dict of the context name to a tuple of (placeholder, value), the fragment is
+        rendered and cached with the placeholders which are replaced with the values when served.
+        """
+
+        form = value.get('form')
+
+        if get_setting('SIGNED_FORM_TOKENS'):
+            form_token = make_form_token(form.id, value.get('form_reference'))
+            placeholders = {
+                'form_token': ('streamformsformtokenplaceholder', form_token),
+            }
+        else:
+            placeholders = {
+                'csrf_token': ('streamformscsrftokenplaceholder', get_token(context['request'])),
+            }
+
+        placeholders['submission_token'] = ('streamformssubmissiontokenplaceholder', make_submission_token())
+
+        if get_setting('MIN_FILL_TIME'):
+            placeholders['form_rendered'] = ('streamformsformrenderedplaceholder', make_form_rendered(form.id))
+
+        return placeholders
+
+    def render_cached(self, value, context):
+        placeholders = self.get_fragment_placeholders(value, context)
+        key = self.get_fragment_cache_key(value)
+        html = cache.get(key)
+
+        if html is None:
+            render_context = dict(context)
+            render_context.update({name: placeholder for name, (placeholder, _) in placeholders.items()})
+            html = str(self.render_form(value, render_context))
+            cache.set(key, html, get_setting('CACHE_TIMEOUT'))
+
+        for placeholder, placeholder_value in placeholders.values():
+            html = html.replace(placeholder, escape(placeholder_value))
+
+        return mark_safe(html)
 
     def get_context(self, value, parent_context=None):
         context = super().get_context(value, parent_context)
@@ -81,7 +229,21 @@ class WagtailFormBlock(blocks.StructBlock):
             if invalid_form_reference and invalid_form and invalid_form_reference == form_reference:
                 context['form'] = invalid_form
             else:
-                context['form'] = form.get_form(initial={'form_id': form.id, 'form_reference': form_reference})
+                context['form'] = form.get_form(initial={
+                    'form_id': form.id,
+                    'form_reference': form_reference,
+                    'submission_token': context.get('submission_token') or make_submission_token(),
+                })
+
+            # a signed token posted in place of the csrf token, so the page is the same for every visitor
+            if get_setting('SIGNED_FORM_TOKENS') and 'form_token' not in context:
+                context['form_token'] = make_form_token(form.id, form_reference)
+
+            # a signed time the form was rendered, submissions posted too soon after it are rejected
+            if get_setting('MIN_FILL_TIME') and 'form_rendered' not in context:
+                context['form_rendered'] = make_form_rendered(form.id)
+
+            context['honeypot_field'] = get_setting('HONEYPOT_FIELD')
 
         return context
 
@@ -94,3 +256,37 @@ class WagtailFormBlock(blocks.StructBlock):
             result['form_reference'] = uuid.uuid4()
 
         return result
+
+
+def iter_form_block_values(block, value):
+    """ Yields the value of each ``WagtailFormBlock`` in the value of a block, including those nested in others. """
+
+    if isinstance(block, WagtailFormBlock):
+        yield value
+    elif isinstance(block, blocks.StreamBlock):
+        for child in value or []:
+            yield from iter_form_block_values(child.block, child.value)
+    elif isinstance(block, blocks.StructBlock):
+        for name, child_block in block.child_blocks.items():
+            yield from iter_form_block_values(child_block, value.get(name))
+    elif isinstance(block, blocks.ListBlock):
+        for item in value or []:
+            yield from iter_form_block_values(block.child_block, item)
+
+
+def get_page_form_block_value(page, form_id, form_reference):
+    """ Returns the value of the form block on the page with the form and reference, or None if it has none. """
+
+    if not form_reference:
+        return None
+
+    page = page.specific
+
+    for field in page._meta.get_fields():
+        if not isinstance(field, StreamField):
+            continue
+
+        for value in iter_form_block_values(field.stream_block, getattr(page, field.name)):
+            form = value.get('form')
+            if form and str(form.pk) == str(form_id) and str(value.get('form_reference')) == str(form_reference):
+                return value
@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+import logging
+import os
+import time
+import uuid
+from threading import Lock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_delete, post_save
+
+from wagtailstreamforms.conf import get_setting
+
+
+logger = logging.getLogger(__name__)
+
+_sources = {}
+_loaded = {}
+_load_lock = Lock()
+
+
+def register(name, source=None, label=None, timeout=None):
+    """
+    Register a source of choices for the ``choicesource`` field. Can be used as a decorator::
+        @register('sizes', label='Sizes')
+        def sizes():
+            return ['Small', 'Medium', 'Large']
+    or as a function call with a callable such as a ``QuerysetChoices`` or ``FileChoices``::
+        register('products', QuerysetChoices(Product.objects.all(), 'sku', 'name'), label='Products')
+
+    The choices are loaded once and cached in the process for ``timeout`` seconds, or
+    ``WAGTAILSTREAMFORMS_CHOICES_CACHE_TIMEOUT``, or until the source is invalidated.
+    """
+
+    if source is None:
+        def decorator(source):
+            register(name, source, label=label, timeout=timeout)
+            return source
+        return decorator
+
+    _sources[name] = (source, label or name, timeout)
+    _loaded.pop(name, None)
+
+    if hasattr(source, 'connect'):
+        source.connect(name)
+
+
+def unregister(name):
+    """ Remove the source of choices registered for ``name``. """
+
+    source = _sources.pop(name)[0]
+    _loaded.pop(name, None)
+
+    if hasattr(source, 'disconnect'):
+        source.disconnect(name)
+
+
+def get_choice_sources():
+    """ Return the registered sources of choices. """
+
+    # the sources are registered in the field modules
+    from wagtailstreamforms.fields import search_for_fields
+
+    search_for_fields()
+    return _sources
+
+
+def get_version_key(name):
+    return 'wagtailstreamforms:choices:%s:version' % name
+
+
+def invalidate_choices(name):
+    """ Reload the choices of the source ``name`` the next time they are used, in every process. """
+
+    cache.set(get_version_key(name), uuid.uuid4().hex, None)
+    _loaded.pop(name, None)
+
+
+def normalize_choice(choice):
+    if isinstance(choice, (list, tuple)):
+        value, label = choice
+        return str(value), str(label)
+    return str(choice), str(choice)
+
+
+def load_choices(name):
+    """ Returns a tuple of the (value, label) of each choice of the source and a set of their values. """
+
+    if name not in get_choice_sources():
+        # a form can still use a source that has since been removed
+        logger.warning('There is no registered source of choices named %s', name)
+        return (), frozenset()
+
+    version = cache.get(get_version_key(name))
+    loaded = _loaded.get(name)
+
+    if loaded is not None and loaded[0] == version and loaded[1] > time.monotonic():
+        return loaded[2], loaded[3]
+
+    with _load_lock:
+        loaded = _loaded.get(name)
+        if loaded is None or loaded[0] != version or loaded[1] <= time.monotonic():
+            source, label, timeout = get_choice_sources()[name]
+            if timeout is None:
+                timeout = get_setting('CHOICES_CACHE_TIMEOUT')
+            choices = tuple(normalize_choice(choice) for choice in source())
+            index = frozenset(value for value, label in choices)
+            loaded = _loaded[name] = (version, time.monotonic() + timeout, choices, index)
+
+    return loaded[2], loaded[3]
+
+
+def get_choices(name):
+    """ Returns a tuple of the (value, label) of each choice of the source ``name``. """
+
+    return load_choices(name)[0]
+
+
+class SourceChoices:
+    """
+    The choices of a registered source for a form field, these are only loaded
+    when the field is validated or its widget rendered.
+    """
+
+    def __init__(self, name, empty_label=None):
+        self.name = name
+        self.empty_label = empty_label
+
+    def __iter__(self):
+        if self.empty_label:
+            yield '', self.empty_label
+        yield from get_choices(self.name)
+
+    def __len__(self):
+        return len(get_choices(self.name)) + (1 if self.empty_label else 0)
+
+    def get_choice_index(self):
+        return load_choices(self.name)[1]
+
+
+class QuerysetChoices:
+    """ Choices of the ``value_field`` and ``label_field`` of each object of a queryset. """
+
+    def __init__(self, queryset, value_field='pk', label_field=None):
+        self.queryset = queryset
+        self.value_field = value_field
+        self.label_field = label_field
+
+    def __call__(self):
+        if self.label_field is None:
+            return ((getattr(obj, self.value_field), obj) for obj in self.queryset.all())
+
+        return self.queryset.values_list(self.value_field, self.label_field).iterator()
+
+    def connect(self, name):
+        """ Invalidate the choices when an object of the model is saved or deleted. """
+
+        def receiver(**kwargs):
+            invalidate_choices(name)
+
+        for signal in [post_save, post_delete]:
+            signal.connect(
+                receiver,
+                sender=self.queryset.model,
+                weak=False,
+                dispatch_uid='wagtailstreamforms_choices_%s' % name
+            )
+
+    def disconnect(self, name):
+        for signal in [post_save, post_delete]:
+            signal.disconnect(sender=self.queryset.model, dispatch_uid='wagtailstreamforms_choices_%s' % name)
+
+
+class FileChoices:
+    """
+    Choices read from a json or csv file in storage.
+
+    A json file is a list of values or ``[value, label]`` lists, each row of a csv file
+    is a value and optional label.
+    """
+
+    def __init__(self, path, storage=None):
+        self.path = path
+        self.storage = storage
+
+    def __call__(self):
+        storage = self.storage or default_storage
+
+        with storage.open(self.path) as f:
+            content = f.read()
+
+        if isinstance(content, bytes):
+            content = content.decode('utf-8-sig')
+
+        if os.path.splitext(self.path)[1].lower() == '.json':
+            return json.loads(content)
+
+        return [row[:2] if len(row) > 1 else row[0] for row in csv.reader(io.StringIO(content)) if row]
@@ -7,11 +7,40 @@ SETTINGS_DEFAULTS = {
     'ADMIN_MENU_LABEL': _('Streamforms'),
     'ADMIN_MENU_ORDER': None,
     'ADVANCED_SETTINGS_MODEL': None,
+    'ASYNC_HOOK_WORKERS': 0,
+    'BATCH_MAX_SIZE': 1000,
+    'CACHE_FORM_FRAGMENTS': False,
+    'CACHE_TIMEOUT': 60 * 60 * 24,
+    'CHOICES_CACHE_TIMEOUT': 60 * 5,
+    'CLIENT_RATE_LIMIT': None,
+    'DEFERRED_FORM_FRAGMENTS': None,
+    'DEFINITION_MAX_AGE': 0,
+    'DUPLICATE_SUBMISSION_WINDOW': 60 * 60,
     'ENABLE_FORM_PROCESSING': True,
     'ENABLE_BUILTIN_HOOKS': True,
+    'FIELD_MODULES': None,
+    'FLATTEN_FORM_TEMPLATES': False,
     'FORM_TEMPLATES': (
         ('streamforms/form_block.html', 'Default Form Template'),
     ),
+    'FORM_TOKEN_MAX_AGE': 60 * 60 * 24,
+    'HONEYPOT_FIELD': None,
+    'HOOK_MODULES': None,
+    'MAX_SUBMISSION_SIZE': None,
+    'MIN_FILL_TIME': 0,
+    'RATE_LIMIT': None,
+    'RATE_LIMIT_CACHE': 'default',
+    'SIGNED_FORM_TOKENS': False,
+    'SUBMISSION_BUFFER': False,
+    'SUBMISSION_BUFFER_DIR': None,
+    'SUBMISSION_BUFFER_FLUSH_INTERVAL': 1,
+    'SUBMISSION_BUFFER_FLUSH_SIZE': 500,
+    'SUBMISSION_BUFFER_FSYNC': False,
+    'SUBMISSION_BUFFER_THREAD': True,
+    'SUBMISSION_COMPRESSION': None,
+    'SUBMISSION_SPOOL_DIR': None,
+    'SUBMISSION_STORAGE': 'orm',
+    'SUBMISSION_STORAGE_DIR': None,
 }
 
 
@@ -6,10 +6,12 @@ from django.utils.text import capfirst
 from wagtail.core import blocks
 
 from wagtailstreamforms import hooks
-from wagtailstreamforms.utils.apps import get_app_submodules
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.apps import import_registry_modules
 
 
 _fields = {}
+_fields_version = 0
 _searched_for_fields = False
 
 
@@ -25,6 +27,8 @@ def register(field_name, cls=None):
         register('singleline', SingleLineTextField)
     """
 
+    global _fields_version
+
     if cls is None:
         def decorator(cls):
             register(field_name, cls)
@@ -32,12 +36,22 @@ def register(field_name, cls=None):
         return decorator
 
     _fields[field_name] = cls
+    _fields_version += 1
+
+
+def unregister(field_name):
+    """ Remove the field registered for ``field_name``. """
+
+    global _fields_version
+
+    del _fields[field_name]
+    _fields_version += 1
 
 
 def search_for_fields():
     global _searched_for_fields
     if not _searched_for_fields:
-        list(get_app_submodules('wagtailstreamforms_fields'))
+        import_registry_modules('wagtailstreamforms_fields', get_setting('FIELD_MODULES'))
         _searched_for_fields = True
 
 
@@ -48,6 +62,13 @@ def get_fields():
     return _fields
 
 
+def get_fields_version():
+    """ Return a number that changes each time a field is registered or unregistered. """
+
+    search_for_fields()
+    return _fields_version
+
+
 class BaseField:
     """A base form field class, all form fields must inherit this class.
 
@@ -101,6 +122,28 @@ class BaseField:
             'initial': block_value.get('default_value')
         }
 
+    def get_json_schema(self, block_value):
+        """The JSON Schema of the field's value.
+
+        Override this to describe the values the field accepts, the required fields are listed
+        by the form so only the value itself needs describing.
+
+        :param block_value: The StreamValue for this field from the StreamField
+        :return: A dict of the JSON Schema, ie ``{'type': 'string', 'format': 'email'}``
+        """
+
+        schema = {
+            'type': 'string',
+            'title': block_value.get('label'),
+        }
+        if block_value.get('help_text'):
+            schema['description'] = block_value.get('help_text')
+        if block_value.get('default_value'):
+            schema['default'] = block_value.get('default_value')
+        if block_value.get('required'):
+            schema['minLength'] = 1
+        return schema
+
     def get_form_block(self):
         """The StreamField StructBlock.
 
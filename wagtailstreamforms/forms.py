@@ -1,10 +1,17 @@
 from collections import OrderedDict
 
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.forms.fields import CallableChoiceIterator
+from django.forms.utils import ErrorDict, ErrorList, from_current_timezone
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext_lazy as _
 
 from wagtailstreamforms.fields import get_fields
 from wagtailstreamforms.utils.general import get_slug_from_string
+from wagtailstreamforms.utils.tokens import get_submission_key
 
 
 class BaseForm(forms.Form):
@@ -16,6 +23,21 @@ class BaseForm(forms.Form):
 
         super().__init__(*args, **kwargs)
 
+    def clean(self):
+        cleaned_data = super().clean()
+        # the token as it was rendered, a spooled form is cleaned again from it
+        self.rendered_submission_token = cleaned_data.get('submission_token')
+        return clean_submission_token(cleaned_data)
+
+
+def clean_submission_token(cleaned_data):
+    """ Replaces the rendered form's ``submission_token`` with the key of the submitted values. """
+
+    if cleaned_data.get('submission_token'):
+        cleaned_data['submission_token'] = get_submission_key(cleaned_data['submission_token'], cleaned_data)
+
+    return cleaned_data
+
 
 class FormBuilder:
 
@@ -58,11 +80,166 @@ class FormBuilder:
         formfields['form_id'] = forms.CharField(widget=forms.HiddenInput)
         formfields['form_reference'] = forms.CharField(widget=forms.HiddenInput)
 
+        # a unique token of each rendered form to detect it being submitted more than once
+        formfields['submission_token'] = forms.CharField(widget=forms.HiddenInput, required=False, max_length=64)
+
         return formfields
 
     def get_form_class(self):
         return type(str('StreamformsForm'), (BaseForm,), self.formfields)
 
+    def get_validator(self):
+        return FormValidator(self.formfields)
+
+    def get_json_schema(self):
+        """ Return the JSON Schema of the values of the fields from the registered fields. """
+
+        properties = OrderedDict()
+        required = []
+
+        registered_fields = get_fields()
+
+        for field in self.fields:
+            field_type = field.get('type')
+            field_value = field.get('value')
+
+            if field_type not in registered_fields:
+                raise AttributeError(
+                    'Could not find a registered field of type %s' % field_type
+                )
+
+            field_name = get_slug_from_string(field_value.get('label'))
+            properties[field_name] = registered_fields[field_type]().get_json_schema(field_value)
+            if field_value.get('required'):
+                required.append(field_name)
+
+        return OrderedDict([
+            ('$schema', 'http://json-schema.org/draft-07/schema#'),
+            ('type', 'object'),
+            ('properties', properties),
+            ('required', required),
+        ])
+
+
+class FormValidator:
+    """
+    Cleans a dict of values with the fields of a form as the form would, without
+    building the form and its bound fields for each submission.
+
+    Calling it returns a tuple of the cleaned data and an ``ErrorDict`` of each field's errors.
+    """
+
+    def __init__(self, formfields):
+        self.fields = [
+            (name, field, field.widget.value_from_datadict, isinstance(field, forms.FileField))
+            for name, field in formfields.items()
+        ]
+
+    def __call__(self, data, files=None):
+        files = files or {}
+        cleaned_data = {}
+        errors = ErrorDict()
+
+        for name, field, value_from_datadict, is_file in self.fields:
+            if field.disabled:
+                value = field.initial() if callable(field.initial) else field.initial
+            else:
+                value = value_from_datadict(data, files, name)
+
+            try:
+                if is_file:
+                    cleaned_data[name] = field.clean(value, field.initial)
+                else:
+                    cleaned_data[name] = field.clean(value)
+            except ValidationError as e:
+                errors[name] = ErrorList(e.error_list)
+
+        return clean_submission_token(cleaned_data), errors
+
+
+class IndexedChoiceMixin:
+    """
+    Validates values against a set of the choices instead of searching the list of them,
+    the choices are stored as a tuple that is shared, along with the set, by copies of the field.
+
+    Choices with their own ``get_choice_index()``, such as the choices of a registered
+    source, are kept as they are so they are only loaded when they are used.
+    """
+
+    def _set_choices(self, value):
+        if callable(value):
+            value = CallableChoiceIterator(value)
+        elif not hasattr(value, 'get_choice_index'):
+            value = tuple(value)
+
+        self._choices = self.widget.choices = value
+        self._choice_index = None
+
+    choices = property(forms.ChoiceField._get_choices, _set_choices)
+
+    def __deepcopy__(self, memo):
+        # the index is built on the field the copies of each form are made from
+        if isinstance(self._choices, tuple):
+            self.get_choice_index()
+
+        result = super(forms.ChoiceField, self).__deepcopy__(memo)
+        result._choices = self._choices
+        return result
+
+    def get_choice_index(self):
+        """ Returns a set of the string of each choice value, including those in groups. """
+
+        if hasattr(self._choices, 'get_choice_index'):
+            return self._choices.get_choice_index()
+
+        if self._choice_index is None:
+            index = set()
+            for key, value in self._choices:
+                if isinstance(value, (list, tuple)):
+                    index.update(str(k) for k, v in value)
+                else:
+                    index.add(str(key))
+            self._choice_index = frozenset(index)
+
+        return self._choice_index
+
+    def valid_value(self, value):
+        if not isinstance(self._choices, tuple) and not hasattr(self._choices, 'get_choice_index'):
+            return super().valid_value(value)
+
+        return str(value) in self.get_choice_index()
+
+
+class IndexedChoiceField(IndexedChoiceMixin, forms.ChoiceField):
+    pass
+
+
+class IndexedMultipleChoiceField(IndexedChoiceMixin, forms.MultipleChoiceField):
+    pass
+
+
+class ISODateTimeField(forms.DateTimeField):
+    """
+    Accepts ISO 8601 date times, such as the RFC 3339 ``date-time`` of the form's json schema,
+    as well as the ``DATETIME_INPUT_FORMATS``.
+    """
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            try:
+                result = parse_datetime(value.strip())
+            except ValueError:
+                raise ValidationError(self.error_messages['invalid'], code='invalid')
+
+            if result is not None:
+                if timezone.is_naive(result):
+                    return from_current_timezone(result)
+                if not settings.USE_TZ:
+                    return timezone.make_naive(result)
+                return result
+
+        return super().to_python(value)
+
 
 class SelectDateForm(forms.Form):
     date_from = forms.DateTimeField(
@@ -1,13 +1,13 @@
 from operator import itemgetter
 
 from wagtailstreamforms.conf import get_setting
-from wagtailstreamforms.utils.apps import get_app_submodules
+from wagtailstreamforms.utils.apps import import_registry_modules
 
 
 _hooks = {}
 
 
-def register(hook_name, fn=None, order=0):
+def register(hook_name, fn=None, order=0, run_async=False):
     """
     Register hook for ``hook_name``. Can be used as a decorator::
         @register('hook_name')
@@ -17,15 +17,21 @@ def register(hook_name, fn=None, order=0):
         def my_hook(...):
             pass
         register('hook_name', my_hook)
+
+    Hooks registered with ``run_async=True`` are run in a background thread
+    when ``WAGTAILSTREAMFORMS_ASYNC_HOOK_WORKERS`` is set.
     """
 
     # Pretend to be a decorator if fn is not supplied
     if fn is None:
         def decorator(fn):
-            register(hook_name, fn, order=order)
+            register(hook_name, fn, order=order, run_async=run_async)
             return fn
         return decorator
 
+    if run_async:
+        fn.run_async = True
+
     if hook_name not in _hooks:
         _hooks[hook_name] = []
     _hooks[hook_name].append((fn, order))
@@ -37,7 +43,7 @@ _searched_for_hooks = False
 def search_for_hooks():
     global _searched_for_hooks
     if not _searched_for_hooks:
-        list(get_app_submodules('wagtailstreamforms_hooks'))
+        import_registry_modules('wagtailstreamforms_hooks', get_setting('HOOK_MODULES'))
         _searched_for_hooks = True
 
 
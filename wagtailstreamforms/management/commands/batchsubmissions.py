@@ -0,0 +1,74 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.batch import process_submission_batch
+
+
+class Command(BaseCommand):
+    help = 'Validates and processes a json list of form submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('form', help='The slug of the form')
+        parser.add_argument('file', help='The json file of a list of field values, "-" to read from stdin')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='The number of submissions to process per transaction'
+        )
+        parser.add_argument(
+            '--report',
+            help='Write the status of each submission as json to this file'
+        )
+
+    def load(self, path):
+        try:
+            if path == '-':
+                items = json.load(sys.stdin)
+            else:
+                with open(path, encoding='utf-8') as f:
+                    items = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError('Could not read %s: %s' % (path, e))
+
+        if not isinstance(items, list):
+            raise CommandError('%s must contain a list of submissions' % path)
+
+        return items
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        try:
+            form = Form.objects.get(slug=options['form'])
+        except Form.DoesNotExist:
+            raise CommandError('There is no form with the slug %s' % options['form'])
+
+        items = self.load(options['file'])
+        batch_size = options['batch_size']
+        results = []
+
+        for start in range(0, len(items), batch_size):
+            with transaction.atomic():
+                batch = process_submission_batch(form, items[start:start + batch_size])
+
+            for result in batch:
+                result['index'] += start
+                if result['status'] != 'processed' and options['verbosity'] > 1:
+                    self.stdout.write('Submission %s %s: %s' % (
+                        result['index'], result['status'], json.dumps(result['errors'])
+                    ))
+            results += batch
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+        processed = sum(1 for result in results if result['status'] == 'processed')
+        msg = 'Successfully processed %s of %s form submissions' % (processed, len(results))
+        self.stdout.write(self.style.SUCCESS(msg))
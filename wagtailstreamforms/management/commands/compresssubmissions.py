@@ -0,0 +1,99 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.models import FormSubmission
+from wagtailstreamforms.serializers import (
+    CODECS,
+    decode_form_data,
+    encode_form_data,
+    get_form_data_codec
+)
+
+
+class Command(BaseCommand):
+    help = 'Re-encodes stored form submission data using the configured compression'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--codec',
+            choices=sorted(CODECS) + ['none'],
+            help='The compression to encode with, defaults to WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION. '
+                 'Use "none" to store plain json.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='The number of submissions to re-encode per transaction'
+        )
+        parser.add_argument(
+            '--form',
+            help='Only re-encode the submissions of the form with this slug'
+        )
+
+    def get_queryset(self, form_slug=None):
+        queryset = FormSubmission.objects.all()
+        if form_slug:
+            queryset = queryset.filter(form__slug=form_slug)
+        return queryset.order_by('pk')
+
+    def get_codec(self, options):
+        codec = options['codec'] or get_setting('SUBMISSION_COMPRESSION')
+        if not codec or codec == 'none':
+            return None
+        return codec
+
+    def reencode(self, value, codec):
+        """ Returns the value encoded with the codec, or None if it is already encoded as required. """
+
+        if codec is None and get_form_data_codec(value) is None:
+            return None
+
+        if codec is None:
+            return decode_form_data(value)
+
+        encoded = encode_form_data(decode_form_data(value), codec)
+        if encoded == value:
+            return None
+
+        return encoded
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        codec = self.get_codec(options)
+        queryset = self.get_queryset(options['form'])
+
+        last_pk = 0
+        processed = updated = size_before = size_after = 0
+
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk).values_list('pk', 'form_data')[:options['batch_size']]
+            )
+            if not batch:
+                break
+
+            with transaction.atomic():
+                for pk, value in batch:
+                    encoded = self.reencode(value, codec)
+                    size_before += len(value)
+                    if encoded is None:
+                        size_after += len(value)
+                        continue
+                    FormSubmission.objects.filter(pk=pk).update(form_data=encoded)
+                    size_after += len(encoded)
+                    updated += 1
+
+            processed += len(batch)
+            last_pk = batch[-1][0]
+
+            if options['verbosity'] > 1:
+                self.stdout.write('Processed %s form submissions' % processed)
+
+        msg = 'Successfully re-encoded %s of %s form submissions (%s to %s characters)' % (
+            updated, processed, size_before, size_after
+        )
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.spool import flush_submissions, get_spool
+
+
+class Command(BaseCommand):
+    help = 'Saves the buffered form submissions in WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep flushing the buffer every interval until stopped'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='The seconds between each flush with --loop, '
+                 'defaults to WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_FLUSH_INTERVAL'
+        )
+
+    def flush(self, spool, options):
+        saved = flush_submissions(spool)
+        if saved or not options['loop']:
+            self.stdout.write(self.style.SUCCESS('Successfully saved %s buffered form submissions' % saved))
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or get_setting('SUBMISSION_BUFFER_FLUSH_INTERVAL')
+        if interval <= 0:
+            raise CommandError('--interval must be greater than 0')
+
+        spool = get_spool()
+        self.flush(spool, options)
+
+        while options['loop']:
+            time.sleep(interval)
+            try:
+                self.flush(spool, options)
+            except Exception as e:
+                # the segments are kept and retried after the next interval
+                self.stderr.write('Could not save the buffered form submissions: %s' % e)
+                connections.close_all()
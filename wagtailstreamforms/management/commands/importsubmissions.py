@@ -0,0 +1,217 @@
+import csv
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.serializers import FormSubmissionSerializer, encode_form_data
+from wagtailstreamforms.utils.general import get_slug_from_string
+
+
+class Command(BaseCommand):
+    help = 'Imports form submissions from a csv or jsonl file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('form', help='The slug of the form')
+        parser.add_argument('file', help='The csv or jsonl file to import')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='The format of the file, defaults to the file extension'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='The number of submissions to create per transaction'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='The file the number of imported rows is saved to, the import resumes from it if it exists. '
+                 'Defaults to the file with a .checkpoint extension'
+        )
+
+    def get_format(self, options):
+        file_format = options['format'] or os.path.splitext(options['file'])[1].lstrip('.').lower()
+        if file_format not in ['csv', 'jsonl']:
+            raise CommandError('Could not tell the format of %s, use --format' % options['file'])
+        return file_format
+
+    def read_rows(self, f, file_format):
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+            return
+
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise CommandError('Line %s is not valid json: %s' % (line_number, e))
+            if not isinstance(row, dict):
+                raise CommandError('Line %s is not a json object' % line_number)
+            yield row
+
+    def get_field_names(self, form):
+        """ The name of each field by its name and label. """
+
+        names = {}
+        for name, label in form.get_submission_data_fields():
+            names[name] = name
+            names[str(label)] = name
+        return names
+
+    def get_column_name(self, column):
+        """ Maps a column, by the field name or label, to the name of the field. """
+
+        if column not in self.column_names:
+            name = self.field_names.get(column) or self.field_names.get(get_slug_from_string(column))
+            if name is None:
+                self.stderr.write('Skipping the column %s that is not a field of the form' % column)
+            self.column_names[column] = name
+
+        return self.column_names[column]
+
+    def parse_submit_time(self, value):
+        if not value:
+            return timezone.now()
+
+        if not isinstance(value, str):
+            raise CommandError('Could not read the submission date %r' % value)
+
+        submit_time = parse_datetime(value)
+        if submit_time is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError('Could not read the submission date %r' % value)
+            submit_time = datetime(date.year, date.month, date.day)
+
+        if settings.USE_TZ and timezone.is_naive(submit_time):
+            submit_time = timezone.make_aware(submit_time)
+        elif not settings.USE_TZ and timezone.is_aware(submit_time):
+            submit_time = timezone.make_naive(submit_time)
+
+        return submit_time
+
+    def get_submission_token(self, source, number, row):
+        """ A token of the row, so a row that is imported again is skipped by the storage. """
+
+        digest = hashlib.sha1(('%s:%s:' % (source, number)).encode('utf-8'))
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode('utf-8'))
+        return 'import-%s' % digest.hexdigest()
+
+    def build_submission(self, field_schema, row, submission_token):
+        data = {}
+        for column, value in row.items():
+            # csv rows with more values than columns
+            if column is None:
+                continue
+            name = self.get_column_name(column)
+            if name is not None:
+                data[name] = value
+
+        submit_time = self.parse_submit_time(data.pop('submit_time', None))
+
+        return {
+            'form_data': encode_form_data(json.dumps(data, cls=FormSubmissionSerializer)),
+            'field_schema_id': field_schema.pk,
+            'submission_token': submission_token,
+            'submit_time': submit_time,
+        }
+
+    def read_checkpoint(self, path, source):
+        if not os.path.exists(path):
+            return 0
+
+        with open(path) as f:
+            checkpoint = json.load(f)
+
+        if checkpoint.get('file') != source:
+            raise CommandError('The checkpoint %s is for another file %s' % (path, checkpoint.get('file')))
+
+        return checkpoint['rows']
+
+    def write_checkpoint(self, path, source, rows):
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'file': source, 'rows': rows}, f)
+        os.replace(path + '.tmp', path)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        try:
+            form = Form.objects.get(slug=options['form'])
+        except Form.DoesNotExist:
+            raise CommandError('There is no form with the slug %s' % options['form'])
+
+        source = os.path.abspath(options['file'])
+        file_format = self.get_format(options)
+        checkpoint = options['checkpoint'] or source + '.checkpoint'
+        skip = self.read_checkpoint(checkpoint, source)
+        field_schema = form.get_field_schema()
+        self.field_names = self.get_field_names(form)
+        self.column_names = {}
+
+        imported = skip
+        start = time.time()
+
+        try:
+            f = open(source, encoding='utf-8', newline='')
+        except OSError as e:
+            raise CommandError('Could not read %s: %s' % (source, e))
+
+        storage = form.get_submission_storage()
+        using = router.db_for_write(form.get_submission_class())
+
+        with f:
+            rows = islice(self.read_rows(f, file_format), skip, None)
+
+            if skip:
+                self.stdout.write('Resuming after %s imported rows' % skip)
+
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+
+                submissions = [
+                    self.build_submission(field_schema, row, self.get_submission_token(source, imported + i, row))
+                    for i, row in enumerate(batch)
+                ]
+
+                # the checkpoint is only kept if the batch is saved
+                try:
+                    with transaction.atomic(using=using):
+                        storage.write(submissions)
+                        self.write_checkpoint(checkpoint, source, imported + len(batch))
+                except Exception:
+                    self.write_checkpoint(checkpoint, source, imported)
+                    raise
+
+                imported += len(batch)
+
+                if options['verbosity'] > 1:
+                    self.stdout.write('Imported %s rows (%.0f rows/sec)' % (
+                        imported, (imported - skip) / max(time.time() - start, 0.001)
+                    ))
+
+        # the import is complete so it should not be resumed
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        elapsed = max(time.time() - start, 0.001)
+        msg = 'Successfully imported %s form submissions in %.1fs (%.0f rows/sec)' % (
+            imported - skip, elapsed, (imported - skip) / elapsed
+        )
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 
 from django.core.management.base import BaseCommand
 
-from wagtailstreamforms.models import FormSubmission
+from wagtailstreamforms.models import Form
 
 
 class Command(BaseCommand):
@@ -11,16 +11,14 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('days_to_keep', type=int)
 
-    def get_queryset(self, date):
-        return FormSubmission.objects.filter(submit_time__lt=date)
+    def get_forms(self):
+        return Form.objects.with_advanced_settings()
 
     def handle(self, *args, **options):
         keep_from_date = datetime.today().date() - timedelta(days=options['days_to_keep'])
 
-        queryset = self.get_queryset(keep_from_date)
-
-        count = queryset.count()
-        queryset.delete()
+        # each form's submissions are deleted from wherever they are stored
+        count = sum(form.get_submission_storage().delete(until=keep_from_date) for form in self.get_forms())
 
         msg = 'Successfully deleted %s form submissions prior to %s' % (count, keep_from_date)
         self.stdout.write(self.style.SUCCESS(msg))
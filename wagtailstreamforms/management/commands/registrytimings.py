@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from wagtailstreamforms.fields import search_for_fields
+from wagtailstreamforms.hooks import search_for_hooks
+from wagtailstreamforms.utils.apps import get_registry_timings
+
+
+class Command(BaseCommand):
+    help = 'Reports the time taken at startup to import each field and hook registry module'
+
+    def handle(self, *args, **options):
+        # the registries are populated when the app is ready, this is just in case they were not
+        search_for_fields()
+        search_for_hooks()
+
+        total = 0
+
+        for submodule_name, timings in get_registry_timings().items():
+            self.stdout.write(self.style.MIGRATE_HEADING(submodule_name))
+            for module, seconds in timings:
+                total += seconds
+                self.stdout.write('  %8.2f ms  %s' % (seconds * 1000, module))
+
+        msg = 'Registries took %.2f ms to populate' % (total * 1000)
+        self.stdout.write(self.style.SUCCESS(msg))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtailstreamforms.utils.spool import get_fallback_spool, replay_spool
+
+
+class Command(BaseCommand):
+    help = 'Saves and processes the form submissions spooled in WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR ' \
+           'while the database was unavailable'
+
+    def handle(self, *args, **options):
+        spool = get_fallback_spool()
+        if spool is None:
+            raise CommandError('WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR is not set')
+
+        try:
+            replayed = replay_spool(spool)
+        except Exception as e:
+            # the segment that errored and those after it are kept to be replayed again
+            raise CommandError('Could not replay the spooled form submissions: %s' % e)
+
+        self.stdout.write(self.style.SUCCESS('Successfully replayed %s spooled form submissions' % replayed))
@@ -0,0 +1,58 @@
+from django.http import Http404
+from django.utils.deprecation import MiddlewareMixin
+
+from wagtail.core.models import Site
+from wagtail.core.views import serve
+from wagtailstreamforms.blocks import get_page_form_block_value
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.tokens import check_request_form_token
+
+
+class FormTokenMiddleware(MiddlewareMixin):
+    """
+    Lets form posts with a valid signed form token through in place of a CSRF token, to the views
+    that process the form: the page it is on and the submit and fragment views of the form.
+
+    Must be placed before ``django.middleware.csrf.CsrfViewMiddleware``.
+    """
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if not get_setting('SIGNED_FORM_TOKENS') or request.method != 'POST':
+            return
+
+        if check_request_form_token(request) and self.is_form_view(request, callback, callback_args, callback_kwargs):
+            request._dont_enforce_csrf_checks = True
+
+    def is_form_view(self, request, callback, callback_args, callback_kwargs):
+        """ Does the view process the posted form. """
+
+        from wagtailstreamforms.views import FormFragmentView, SubmitFormView
+
+        form_id = request.POST.get('form_id')
+        view_class = getattr(callback, 'view_class', None)
+
+        if view_class is not None and issubclass(view_class, (FormFragmentView, SubmitFormView)):
+            return str(callback_kwargs.get('pk')) == form_id
+
+        if callback is serve:
+            path = callback_args[0] if callback_args else callback_kwargs.get('path', '')
+            page = self.get_page(request, path)
+            return page is not None and get_page_form_block_value(
+                page, form_id, request.POST.get('form_reference')
+            ) is not None
+
+        return False
+
+    def get_page(self, request, path):
+        """ Returns the page wagtail serves at the path, or None if there is none. """
+
+        site = getattr(request, 'site', None) or Site.find_for_request(request)
+        if site is None:
+            return None
+
+        try:
+            page, args, kwargs = site.root_page.specific.route(request, [c for c in path.split('/') if c])
+        except Http404:
+            return None
+
+        return page
@@ -0,0 +1,35 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailstreamforms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormFieldSchema',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=40, unique=True, verbose_name='Hash')),
+                ('fields', models.TextField(verbose_name='Fields')),
+            ],
+            options={
+                'verbose_name': 'Form field schema',
+            },
+        ),
+        migrations.AddField(
+            model_name='form',
+            name='field_schema',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailstreamforms.FormFieldSchema', verbose_name='Field schema'),
+        ),
+        migrations.AddField(
+            model_name='formsubmission',
+            name='field_schema',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='submissions', to='wagtailstreamforms.FormFieldSchema', verbose_name='Field schema'),
+        ),
+    ]
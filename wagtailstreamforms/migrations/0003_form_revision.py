@@ -0,0 +1,27 @@
+# Generated by Django 2.2.28 on 2026-10-19 04:43
+
+import uuid
+
+from django.db import migrations, models
+
+
+def set_revisions(apps, schema_editor):
+    Form = apps.get_model('wagtailstreamforms', 'Form')
+    for pk in Form.objects.values_list('pk', flat=True):
+        Form.objects.filter(pk=pk).update(revision=uuid.uuid4().hex)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailstreamforms', '0002_form_field_schema'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='revision',
+            field=models.CharField(blank=True, editable=False, max_length=32, verbose_name='Revision'),
+        ),
+        migrations.RunPython(set_revisions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-19 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailstreamforms', '0003_form_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formsubmission',
+            name='submission_token',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='Submission token'),
+        ),
+    ]
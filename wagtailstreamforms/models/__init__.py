@@ -1,4 +1,5 @@
 from .abstract import AbstractFormSetting
 from .file import FormSubmissionFile
 from .form import Form
+from .schema import FormFieldSchema
 from .submission import FormSubmission
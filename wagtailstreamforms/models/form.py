@@ -1,6 +1,11 @@
+import copy
+import logging
 import uuid
+from collections import OrderedDict
 
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import pre_delete
 from django.utils.translation import ugettext_lazy as _
 
 from wagtail.admin.edit_handlers import (
@@ -14,15 +19,49 @@ from wagtail.admin.edit_handlers import (
 
 from wagtailstreamforms import hooks
 from wagtailstreamforms.conf import get_setting
-from wagtailstreamforms.fields import HookSelectField
+from wagtailstreamforms.fields import HookSelectField, get_fields_version
 from wagtailstreamforms.forms import FormBuilder
+from wagtailstreamforms.storage import get_storage_class
 from wagtailstreamforms.streamfield import FormFieldsStreamField
+from wagtailstreamforms.utils.dispatch import dispatch_hook
 from wagtailstreamforms.utils.general import get_slug_from_string
 from wagtailstreamforms.utils.loading import get_advanced_settings_model
+from wagtailstreamforms.utils.tokens import claim_submission_token, release_submission_token
 
+from .schema import FormFieldSchema
 from .submission import FormSubmission
 
 
+logger = logging.getLogger(__name__)
+
+# values of the most recently built revisions cached in the process, the oldest are removed first
+LOCAL_CACHE_SIZE = 256
+_local_cache = OrderedDict()
+
+
+def get_advanced_settings_relation():
+    """ The one to one relation of the advanced settings model to the form, or None if there is none. """
+
+    SettingsModel = get_advanced_settings_model()
+
+    if SettingsModel:
+        field = SettingsModel._meta.get_field('form')
+        if field.one_to_one:
+            return field.remote_field
+
+
+class FormQuerySet(models.QuerySet):
+
+    def with_advanced_settings(self):
+        """ Selects the advanced settings of each form along with it, so reading them is not another query. """
+
+        relation = get_advanced_settings_relation()
+
+        if relation is None:
+            return self
+        return self.select_related(relation.get_accessor_name())
+
+
 class Form(models.Model):
     """ The form class. """
 
@@ -76,6 +115,21 @@ class Form(models.Model):
         verbose_name=_('Submission hooks'),
         blank=True
     )
+    field_schema = models.ForeignKey(
+        'FormFieldSchema',
+        verbose_name=_('Field schema'),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    revision = models.CharField(
+        _('Revision'),
+        max_length=32,
+        blank=True,
+        editable=False
+    )
 
     settings_panels = [
         FieldPanel('title', classname='full'),
@@ -99,6 +153,8 @@ class Form(models.Model):
         ObjectList(field_panels, heading=_('Fields')),
     ])
 
+    objects = FormQuerySet.as_manager()
+
     def __str__(self):
         return self.title
 
@@ -107,6 +163,65 @@ class Form(models.Model):
         verbose_name = _('Form')
         verbose_name_plural = _('Forms')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the fields as loaded, values are only shared between
+        # instances of the same revision while the fields are not reassigned
+        instance._saved_fields = instance.__dict__.get('fields')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # every save is a new revision, so anything cached for the previous one is no longer used
+        self.revision = uuid.uuid4().hex
+        self.__dict__.pop('_revision_cache', None)
+
+        # snapshot the fields so submissions can reference the fields at the time they were made
+        self.field_schema = self.build_field_schema()
+        super().save(*args, **kwargs)
+
+        self._saved_fields = self.fields
+
+    def get_cached(self, name, fn, local=False):
+        """
+        Returns ``fn()`` cached for the current revision of the form.
+
+        The value is cached on the instance until the fields are reassigned or the form is saved,
+        and in the shared cache for any instance of the same saved revision. Values that can not
+        be pickled are cached with ``local=True`` in the memory of the process instead.
+        """
+
+        fields = self.fields
+        revision_cache = self.__dict__.get('_revision_cache')
+
+        if revision_cache is None or revision_cache[0] is not fields:
+            revision_cache = self.__dict__['_revision_cache'] = (fields, {})
+
+        values = revision_cache[1]
+
+        if name not in values:
+            shared = self.revision and getattr(self, '_saved_fields', None) is fields
+            key = 'wagtailstreamforms:form:%s:%s' % (self.revision, name)
+
+            if local:
+                key = '%s:%s' % (key, get_fields_version())
+                value = _local_cache.get(key) if shared else None
+            else:
+                value = cache.get(key) if shared else None
+
+            if value is None:
+                value = fn()
+                if shared and local:
+                    _local_cache[key] = value
+                    while len(_local_cache) > LOCAL_CACHE_SIZE:
+                        _local_cache.pop(next(iter(_local_cache)), None)
+                elif shared:
+                    cache.set(key, value, get_setting('CACHE_TIMEOUT'))
+
+            values[name] = value
+
+        return values[name]
+
     def copy(self):
         """ Copy this form and its fields. """
 
@@ -139,9 +254,29 @@ class Form(models.Model):
 
     copy.alters_data = True
 
+    def get_advanced_settings(self):
+        """ Returns the advanced settings of the form, or None if there are none. """
+
+        SettingsModel = get_advanced_settings_model()
+
+        if not SettingsModel or not self.pk:
+            return None
+
+        # selected along with the form by FormQuerySet.with_advanced_settings()
+        relation = get_advanced_settings_relation()
+        if relation is not None and relation.is_cached(self):
+            return relation.get_cached_value(self)
+
+        return SettingsModel.objects.filter(form=self).first()
+
     def get_data_fields(self):
         """ Returns a list of tuples with (field_name, field_label). """
 
+        return list(self.get_cached('data_fields', self.build_data_fields))
+
+    def build_data_fields(self):
+        """ Builds the list of tuples with (field_name, field_label). """
+
         data_fields = [
             ('submit_time', _('Submission date')),
         ]
@@ -152,6 +287,103 @@ class Form(models.Model):
 
         return data_fields
 
+    def get_definition(self):
+        """ Returns the form and its fields as a dict, for rendering the form without its template. """
+
+        return self.get_cached('definition', self.build_definition)
+
+    def build_definition(self):
+        """ Builds the dict of the form and its fields. """
+
+        formfields = self.get_form_class().base_fields
+        fields = []
+
+        for field in self.get_form_fields():
+            name = get_slug_from_string(field['value']['label'])
+            formfield = formfields[name]
+            definition = {
+                'name': name,
+                'type': field['type'],
+                'label': formfield.label,
+                'help_text': formfield.help_text,
+                'required': formfield.required,
+                'initial': formfield.initial,
+                'input_type': getattr(formfield.widget, 'input_type', None),
+            }
+            if hasattr(getattr(formfield, 'choices', None), 'name'):
+                # choices from a source can change without a new revision so are fetched separately
+                definition['choices_source'] = formfield.choices.name
+            elif hasattr(formfield, 'choices'):
+                definition['choices'] = [[value, label] for value, label in formfield.choices]
+            fields.append(definition)
+
+        return {
+            'id': self.pk,
+            'slug': self.slug,
+            'title': self.title,
+            'revision': self.revision,
+            'submit_button_text': self.submit_button_text,
+            'fields': fields,
+        }
+
+    def get_json_schema(self):
+        """ Returns the JSON Schema of the values of the form's fields, versioned by its revision. """
+
+        return self.get_cached('json_schema', self.build_json_schema)
+
+    def build_json_schema(self):
+        """ Builds the JSON Schema of the form. """
+
+        schema = FormBuilder(self.get_form_fields()).get_json_schema()
+        schema['title'] = self.title
+        schema['version'] = self.revision
+        return schema
+
+    def build_field_schema(self):
+        """ Returns the schema for the current fields, creating it if it does not exist. """
+
+        return FormFieldSchema.objects.get_for_fields(self.get_data_fields()[1:])
+
+    def get_field_schema(self):
+        """ Returns the field schema, creating one for forms saved before schemas existed. """
+
+        if self.field_schema_id is None:
+            self.field_schema = self.build_field_schema()
+            if self.pk:
+                Form.objects.filter(pk=self.pk).update(field_schema=self.field_schema)
+
+        return self.field_schema
+
+    def get_submission_data_fields(self, queryset=None):
+        """
+        Returns a list of tuples with (field_name, field_label) for the current fields
+        followed by any fields that only exist in the schemas of older submissions.
+        """
+
+        data_fields = self.get_data_fields()
+
+        if queryset is None:
+            queryset = self.get_submission_storage().filter()
+
+        if hasattr(queryset, 'get_field_schema_ids'):
+            field_schema_ids = queryset.get_field_schema_ids()
+        else:
+            field_schema_ids = queryset.order_by().values('field_schema_id')
+
+        schemas = FormFieldSchema.objects \
+            .filter(pk__in=field_schema_ids) \
+            .exclude(pk=self.field_schema_id) \
+            .order_by('-pk')
+
+        seen = set(name for name, label in data_fields)
+        for schema in schemas:
+            for name, label in schema.get_data_fields():
+                if name not in seen:
+                    seen.add(name)
+                    data_fields.append((name, label))
+
+        return data_fields
+
     def get_form(self, *args, **kwargs):
         """ Returns the form. """
 
@@ -159,23 +391,122 @@ class Form(models.Model):
         return form_class(*args, **kwargs)
 
     def get_form_class(self):
-        """ Returns the form class. """
+        """ Returns the form class, built once for each revision and shared by the forms of it. """
+
+        return self.get_cached('form_class', lambda: FormBuilder(self.get_form_fields()).get_form_class(), local=True)
+
+    def get_validator(self):
+        """ Returns the ``FormValidator`` of the fields, built once per revision. """
 
-        return FormBuilder(self.get_form_fields()).get_form_class()
+        return self.get_cached('validator', lambda: FormBuilder(self.get_form_fields()).get_validator(), local=True)
 
     def get_form_fields(self):
-        """ Returns the form fields stream_data. """
+        """ Returns the form fields as a list of dicts with the type, value and id of each field. """
 
-        return self.fields.stream_data
+        return list(self.get_cached('form_fields', lambda: self.fields.stream_block.get_prep_value(self.fields)))
 
     def get_submission_class(self):
         """ Returns submission class. """
 
         return FormSubmission
 
+    def get_submission_storage(self):
+        """
+        Returns the ``SubmissionStorage`` of the form's submissions, named by the ``submission_storage``
+        of the form's advanced settings, if it has one, or else ``WAGTAILSTREAMFORMS_SUBMISSION_STORAGE``.
+        """
+
+        name = None
+        SettingsModel = get_advanced_settings_model()
+
+        # only query for the settings of models that can choose the storage
+        if SettingsModel and hasattr(SettingsModel, 'submission_storage'):
+            name = getattr(self.get_advanced_settings(), 'submission_storage', None)
+
+        return get_storage_class(name or get_setting('SUBMISSION_STORAGE'))(self)
+
+    def pre_process_form_submission(self, request):
+        """
+        Runs each ``pre_process_form_submission`` hook before the form is built, returning the
+        message of the first that rejects the submission or None if none do.
+        """
+
+        for fn in hooks.get_hooks('pre_process_form_submission'):
+            message = fn(self, request)
+            if message:
+                return message
+
     def process_form_submission(self, form):
-        """ Runs each hook if selected in the form. """
+        """
+        Runs each hook if selected in the form, hooks registered with run_async in the background.
+
+        None are run for a form with a submission token that has already been processed.
+        """
+
+        token = getattr(form, 'cleaned_data', {}).get('submission_token')
+
+        if token and not claim_submission_token(self.pk, token):
+            logger.info('Skipping a duplicate submission of form %s', self.pk)
+            return
+
+        try:
+            for fn in hooks.get_hooks('process_form_submission'):
+                if fn.__name__ in self.process_form_submission_hooks:
+                    dispatch_hook(fn, self, form)
+        except Exception:
+            # the submission was not processed so can be tried again
+            if token:
+                release_submission_token(self.pk, token)
+            raise
+
+    def process_form_submissions(self, forms):
+        """
+        Runs each hook if selected in the form for many valid forms, hooks with a ``process_batch``
+        function are given all the forms at once.
+
+        Returns a dict for each form of the hooks that raised an error and the error, later
+        hooks are not run for forms that have errors.
+        """
+
+        errors = [{} for _ in forms]
 
         for fn in hooks.get_hooks('process_form_submission'):
-            if fn.__name__ in self.process_form_submission_hooks:
-                fn(self, form)
+            if fn.__name__ not in self.process_form_submission_hooks:
+                continue
+
+            pending = [(form, form_errors) for form, form_errors in zip(forms, errors) if not form_errors]
+            process_batch = getattr(fn, 'process_batch', None)
+
+            if process_batch is not None:
+                try:
+                    with transaction.atomic():
+                        process_batch(self, [form for form, form_errors in pending])
+                except Exception as e:
+                    logger.exception('Error running the %s hook for form %s', fn.__name__, self.pk)
+                    for form, form_errors in pending:
+                        form_errors[fn.__name__] = str(e)
+                continue
+
+            for form, form_errors in pending:
+                try:
+                    with transaction.atomic():
+                        dispatch_hook(fn, self, form)
+                except Exception as e:
+                    logger.exception('Error running the %s hook for form %s', fn.__name__, self.pk)
+                    form_errors[fn.__name__] = str(e)
+
+        return errors
+
+
+def delete_submission_storage(instance, **kwargs):
+    """ Cleanup the submissions stored outside the database once the form is deleted """
+
+    # the storage is chosen while the advanced settings still exist, and the
+    # form is copied as its pk is cleared when it is deleted
+    storage = copy.copy(instance).get_submission_storage()
+
+    if not storage.uses_database:
+        transaction.on_commit(storage.destroy)
+
+
+pre_delete.connect(delete_submission_storage, sender=Form)
@@ -0,0 +1,43 @@
+import hashlib
+import json
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class FormFieldSchemaManager(models.Manager):
+
+    def get_for_fields(self, data_fields):
+        """ Returns the schema for a list of (field_name, field_label), creating it if it does not exist. """
+
+        fields = json.dumps([[str(name), str(label)] for name, label in data_fields], separators=(',', ':'))
+        fields_hash = hashlib.sha1(fields.encode('utf-8')).hexdigest()
+
+        schema, _ = self.get_or_create(hash=fields_hash, defaults={'fields': fields})
+        return schema
+
+
+class FormFieldSchema(models.Model):
+    """ A snapshot of a form's data fields, shared by every form revision that has the same fields. """
+
+    hash = models.CharField(
+        _('Hash'),
+        max_length=40,
+        unique=True
+    )
+    fields = models.TextField(
+        _('Fields')
+    )
+
+    objects = FormFieldSchemaManager()
+
+    def __str__(self):
+        return self.hash
+
+    class Meta:
+        verbose_name = _('Form field schema')
+
+    def get_data_fields(self):
+        """ Returns a list of tuples with (field_name, field_label). """
+
+        return [tuple(field) for field in json.loads(self.fields)]
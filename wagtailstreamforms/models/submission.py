@@ -3,6 +3,8 @@ import json
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
+from wagtailstreamforms.serializers import decode_form_data
+
 
 class FormSubmission(models.Model):
     """ Data for a form submission. """
@@ -19,10 +21,27 @@ class FormSubmission(models.Model):
         _('Submit time'),
         auto_now_add=True
     )
+    field_schema = models.ForeignKey(
+        'FormFieldSchema',
+        verbose_name=_('Field schema'),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='submissions'
+    )
+    submission_token = models.CharField(
+        _('Submission token'),
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     def get_data(self):
         """ Returns dict with form data. """
-        form_data = json.loads(self.form_data)
+        form_data = json.loads(self.get_form_data_json())
 
         form_data.update(
             {'submit_time': self.submit_time, }
@@ -30,8 +49,16 @@ class FormSubmission(models.Model):
 
         return form_data
 
+    def get_form_data_json(self):
+        """ Returns the form data as a json string, decompressing it if required. """
+        return decode_form_data(self.form_data)
+
+    def get_files(self):
+        """ Returns the uploaded files of the submission. """
+        return self.files.all()
+
     def __str__(self):
-        return self.form_data
+        return self.get_form_data_json()
 
     class Meta:
         ordering = ['-submit_time', ]
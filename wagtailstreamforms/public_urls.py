@@ -0,0 +1,15 @@
+from django.urls import path
+
+from wagtailstreamforms import views
+
+
+urlpatterns = [
+    path('api/choices/<str:name>/', views.ChoiceSourceView.as_view(), name='streamforms_api_choices'),
+    path('api/forms/<str:slug>/', views.FormDefinitionView.as_view(), name='streamforms_api_form'),
+    path('api/forms/<str:slug>/schema/', views.FormJsonSchemaView.as_view(), name='streamforms_api_schema'),
+    path('api/forms/<str:slug>/submissions/', views.FormSubmissionApiView.as_view(), name='streamforms_api_submit'),
+    path('api/forms/<str:slug>/submissions/batch/', views.FormSubmissionBatchApiView.as_view(),
+         name='streamforms_api_submit_batch'),
+    path('<int:pk>/fragment/', views.FormFragmentView.as_view(), name='streamforms_fragment'),
+    path('submit/<int:pk>/', views.SubmitFormView.as_view(), name='streamforms_submit'),
+]
@@ -1,6 +1,13 @@
+import base64
+import lzma
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
+from wagtailstreamforms.conf import get_setting
+
 
 class FormSubmissionSerializer(DjangoJSONEncoder):
     """ Form submission serializer """
@@ -9,3 +16,66 @@ class FormSubmissionSerializer(DjangoJSONEncoder):
         if isinstance(o, models.Model):
             return str(o)
         return super().default(o)
+
+
+# Encoded form data is prefixed with a single version character followed by the
+# base64 encoded compressed json. Plain json always starts with '{' so can never
+# be confused with an encoded value.
+CODECS = {
+    'zlib': ('\x01', zlib.compress, zlib.decompress),
+    'lzma': ('\x02', lzma.compress, lzma.decompress),
+}
+
+CODEC_PREFIXES = {prefix: name for name, (prefix, _, _) in CODECS.items()}
+
+
+def get_codec(name):
+    """ Return the (prefix, compress, decompress) tuple for a codec name. """
+
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            "'%s' is not a valid submission compression, choose from %s" % (name, ', '.join(sorted(CODECS)))
+        )
+
+
+def encode_form_data(value, codec=None):
+    """
+    Encodes the json string of a submission for storage.
+
+    When ``codec`` is not given ``WAGTAILSTREAMFORMS_SUBMISSION_COMPRESSION`` is used,
+    the plain json is returned if compression is disabled or would not make the value smaller.
+    """
+
+    if codec is None:
+        codec = get_setting('SUBMISSION_COMPRESSION')
+
+    if not codec:
+        return value
+
+    prefix, compress, _ = get_codec(codec)
+    encoded = prefix + base64.b64encode(compress(value.encode('utf-8'))).decode('ascii')
+
+    if len(encoded) >= len(value):
+        return value
+
+    return encoded
+
+
+def decode_form_data(value):
+    """ Decodes a stored submission value, either plain or compressed, to its json string. """
+
+    codec = CODEC_PREFIXES.get(value[:1])
+
+    if codec is None:
+        return value
+
+    _, _, decompress = CODECS[codec]
+    return decompress(base64.b64decode(value[1:])).decode('utf-8')
+
+
+def get_form_data_codec(value):
+    """ Returns the name of the codec a stored value was encoded with or None if plain json. """
+
+    return CODEC_PREFIXES.get(value[:1])
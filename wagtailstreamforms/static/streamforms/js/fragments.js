@@ -0,0 +1,62 @@
+/*
+ * Loads the forms rendered as placeholders by WAGTAILSTREAMFORMS_DEFERRED_FORM_FRAGMENTS = 'fetch'
+ * and posts them back to the fragment url, replacing the form with the response.
+ */
+(function () {
+  if (window.streamformsFragments) {
+    return;
+  }
+
+  function load(container, response) {
+    if (response.redirected) {
+      window.location.href = response.url;
+      return;
+    }
+    return response.text().then(function (html) {
+      container.innerHTML = html;
+      bind(container);
+    });
+  }
+
+  function bind(container) {
+    var form = container.querySelector('form');
+    if (!form) {
+      return;
+    }
+    form.addEventListener('submit', function (event) {
+      event.preventDefault();
+      fetch(container.getAttribute('data-streamforms-fragment'), {
+        method: 'POST',
+        body: new FormData(form),
+        credentials: 'same-origin',
+        headers: {'X-Requested-With': 'XMLHttpRequest'}
+      }).then(function (response) {
+        return load(container, response);
+      });
+    });
+  }
+
+  function init() {
+    var containers = document.querySelectorAll('[data-streamforms-fragment]');
+    Array.prototype.forEach.call(containers, function (container) {
+      if (container.getAttribute('data-streamforms-loaded')) {
+        return;
+      }
+      container.setAttribute('data-streamforms-loaded', 'true');
+      fetch(container.getAttribute('data-streamforms-fragment'), {
+        credentials: 'same-origin',
+        headers: {'X-Requested-With': 'XMLHttpRequest'}
+      }).then(function (response) {
+        return load(container, response);
+      });
+    });
+  }
+
+  window.streamformsFragments = {init: init};
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+})();
@@ -0,0 +1,41 @@
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import SubmissionList, SubmissionStorage  # noqa: F401
+from .jsonl import JsonlSubmissionStorage
+from .orm import OrmSubmissionStorage
+from .sqlite import SqliteSubmissionStorage
+
+
+_backends = {
+    'jsonl': JsonlSubmissionStorage,
+    'orm': OrmSubmissionStorage,
+    'sqlite': SqliteSubmissionStorage,
+}
+
+
+def register(name, cls=None):
+    """
+    Register a submission storage class for ``name``. Can be used as a decorator::
+        @register('redis')
+        class RedisSubmissionStorage(SubmissionStorage):
+            ...
+    or as a function call::
+        register('redis', RedisSubmissionStorage)
+    """
+
+    if cls is None:
+        def decorator(cls):
+            register(name, cls)
+            return cls
+        return decorator
+
+    _backends[name] = cls
+
+
+def get_storage_class(name):
+    """ Return the submission storage class registered for ``name``. """
+
+    try:
+        return _backends[name]
+    except KeyError:
+        raise ImproperlyConfigured('"%s" is not a registered submission storage' % name)
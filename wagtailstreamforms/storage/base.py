@@ -0,0 +1,220 @@
+import json
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.serializers import decode_form_data
+
+
+class SubmissionStorage:
+    """
+    Where the submissions of a form are stored.
+
+    The submissions written are dicts of the encoded ``form_data``, ``field_schema_id``,
+    ``submission_token``, uploaded ``files`` and the ``submit_time``, which is now if it is
+    not given. They are read back as objects with an ``id``,
+    ``submit_time``, ``get_data()`` and ``get_files()``, such as ``FormSubmission``.
+
+    The submissions are filtered by a list of ``ids``, a ``since`` time they were submitted
+    at or after and an ``until`` time they were submitted before.
+    """
+
+    # whether the submissions are saved to the database, so can be buffered and spooled
+    uses_database = False
+
+    def __init__(self, form):
+        self.form = form
+
+    def write(self, submissions):
+        """ Store the submissions, skipping those with a token already stored. Returns the number stored. """
+
+        raise NotImplementedError
+
+    def iterate(self, ids=None, since=None, until=None, offset=0, limit=None):
+        """ Returns the submissions, newest first, from ``offset`` up to ``limit`` of them. """
+
+        raise NotImplementedError
+
+    def count(self, ids=None, since=None, until=None):
+        """ Returns the number of submissions. """
+
+        raise NotImplementedError
+
+    def delete(self, ids=None, since=None, until=None):
+        """ Delete the submissions and their files. Returns the number deleted. """
+
+        raise NotImplementedError
+
+    def destroy(self):
+        """ Delete all the submissions and anything else kept for them, once the form is deleted. """
+
+        self.delete()
+
+    def get(self, pk):
+        """ Returns the submission with the id, or None if there is none. """
+
+        submissions = list(self.iterate(ids=[pk], limit=1))
+        return submissions[0] if submissions else None
+
+    def get_field_schema_ids(self, ids=None, since=None, until=None):
+        """ Returns the ids of the field schemas of the submissions. """
+
+        return set(s.field_schema_id for s in self.iterate(ids, since, until) if s.field_schema_id)
+
+    def filter(self, ids=None, since=None, until=None):
+        """ Returns a ``SubmissionList`` of the submissions, read when it is used. """
+
+        return SubmissionList(self, ids=ids, since=since, until=until)
+
+
+class SubmissionList:
+    """
+    The submissions of a storage, read when they are iterated or sliced, so they can be
+    paginated and counted like a queryset.
+    """
+
+    def __init__(self, storage, **filters):
+        self.storage = storage
+        self.filters = filters
+
+    def count(self):
+        return self.storage.count(**self.filters)
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self.storage.iterate(**self.filters))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            if item.step is not None:
+                raise ValueError('Submissions can not be sliced with a step')
+            offset = item.start or 0
+            limit = None if item.stop is None else max(item.stop - offset, 0)
+            return list(self.storage.iterate(offset=offset, limit=limit, **self.filters))
+
+        submissions = list(self.storage.iterate(offset=item, limit=1, **self.filters))
+        if not submissions:
+            raise IndexError(item)
+        return submissions[0]
+
+    def delete(self):
+        return self.storage.delete(**self.filters)
+
+    def get_field_schema_ids(self):
+        return self.storage.get_field_schema_ids(**self.filters)
+
+
+class StoredFile:
+    """ A file of a submission kept outside the database, saved in the default storage. """
+
+    def __init__(self, field, name):
+        self.field = field
+        self.name = name
+
+    @property
+    def url(self):
+        return default_storage.url(self.name)
+
+    def __str__(self):
+        return self.name
+
+
+class StoredSubmission:
+    """ A submission kept outside the database. """
+
+    def __init__(self, id, submit_time, form_data, field_schema_id=None, submission_token=None, files=()):
+        self.id = self.pk = id
+        self.submit_time = submit_time
+        self.form_data = form_data
+        self.field_schema_id = field_schema_id
+        self.submission_token = submission_token
+        self.files = [StoredFile(field, name) for field, name in files]
+
+    def get_data(self):
+        """ Returns dict with form data. """
+
+        form_data = json.loads(self.get_form_data_json())
+        form_data.update({'submit_time': self.submit_time})
+        return form_data
+
+    def get_form_data_json(self):
+        return decode_form_data(self.form_data)
+
+    def get_files(self):
+        return self.files
+
+    def __str__(self):
+        return self.get_form_data_json()
+
+
+class FileSubmissionStorage(SubmissionStorage):
+    """
+    A storage of submissions in files of ``WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR``, the
+    uploaded files are saved in the default storage.
+    """
+
+    def get_path(self, name):
+        directory = get_setting('SUBMISSION_STORAGE_DIR')
+
+        if not directory:
+            raise ImproperlyConfigured(
+                'WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR must be set to store submissions in files'
+            )
+
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    def save_files(self, files):
+        """ Save the uploaded files, returns a list of the (field, name) of each. """
+
+        saved = []
+
+        for field in files or {}:
+            for file in files.getlist(field):
+                saved.append((field, default_storage.save('streamforms/' + file.name, file)))
+
+        return saved
+
+    def delete_files(self, submissions):
+        for submission in submissions:
+            for file in submission.get_files():
+                default_storage.delete(file.name)
+
+
+def to_stored_time(value):
+    """ The text a time is stored as, in UTC when ``USE_TZ`` is on, so that stored times sort and compare as text. """
+
+    if value is None:
+        return None
+
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+
+    if settings.USE_TZ:
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        value = timezone.make_naive(value, timezone.utc)
+    elif timezone.is_aware(value):
+        value = timezone.make_naive(value)
+
+    return value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+def from_stored_time(value):
+    submit_time = parse_datetime(value)
+
+    if settings.USE_TZ:
+        return timezone.make_aware(submit_time, timezone.utc)
+    return submit_time
+
+
+def now():
+    return to_stored_time(timezone.now())
@@ -0,0 +1,282 @@
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+
+from .base import FileSubmissionStorage, StoredSubmission, from_stored_time, now, to_stored_time
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# the lines read from each segment by path and the submissions loaded from each form's
+# directory, kept between reads as segments are only ever appended to or removed
+_segments = {}
+_loaded = {}
+
+
+class JsonlSubmissionStorage(FileSubmissionStorage):
+    """
+    Submissions appended as json lines to segment files in a directory of their own for each
+    form, ``form-<id>/`` in ``WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR``.
+
+    A deleted submission is recorded by appending a tombstone line, a segment is removed once
+    all its submissions are deleted. Each process keeps the submissions it has loaded and only
+    reads the lines appended since, and a submission token is only checked against the
+    submissions of the segment being appended to.
+    """
+
+    segment_size = 1000
+
+    def get_dir(self):
+        path = self.get_path('form-%s' % self.form.pk)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def get_segment_path(self, number):
+        return os.path.join(self.get_dir(), 'segment-%06d.jsonl' % number)
+
+    @contextmanager
+    def lock(self):
+        """ Writes to the form's segments one process at a time. """
+
+        with open(os.path.join(self.get_dir(), 'lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def read_meta(self):
+        try:
+            with open(os.path.join(self.get_dir(), 'meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'next_id': 1, 'segment': 1, 'rows': 0}
+
+    def write_meta(self, meta):
+        path = os.path.join(self.get_dir(), 'meta.json')
+
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+    def get_segments(self):
+        return sorted(
+            int(name[8:-6]) for name in os.listdir(self.get_dir())
+            if name.startswith('segment-') and name.endswith('.jsonl')
+        )
+
+    def get_segment(self, number):
+        """
+        Returns the inode of a segment, the offset read up to and its lines, reading only the
+        lines appended since it was last read and skipping any that were only partly written.
+        """
+
+        path = self.get_segment_path(number)
+
+        try:
+            with open(path, 'rb') as f:
+                inode = os.fstat(f.fileno()).st_ino
+                cached_inode, offset, lines = _segments.get(path, (None, 0, []))
+                if cached_inode != inode:
+                    offset, lines = 0, []
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            _segments.pop(path, None)
+            return None, 0, []
+
+        # a line still being written is only kept once it is complete
+        end = data.rfind(b'\n') + 1
+        if data[end:]:
+            logger.error('Skipped an invalid line of %s', path)
+        if end:
+            lines = lines + list(self.parse_lines(path, data[:end]))
+            offset += end
+            _segments[path] = (inode, offset, lines)
+
+        return inode, offset, lines
+
+    def parse_lines(self, path, data):
+        for line in data.split(b'\n')[:-1]:
+            try:
+                yield json.loads(line.decode('utf-8'))
+            except ValueError:
+                logger.error('Skipped an invalid line of %s', path)
+
+    def read_segment(self, number):
+        """ Returns the lines of a segment. """
+
+        return self.get_segment(number)[2]
+
+    def append(self, number, lines):
+        with open(self.get_segment_path(number), 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(line) + '\n' for line in lines))
+
+    def load(self):
+        """
+        Returns the submissions that are not deleted by id, the segment each is in, and the
+        submissions newest first. These are loaded again only once a segment has changed, and
+        are shared so are never modified.
+        """
+
+        path = self.get_dir()
+        read = [(number, self.get_segment(number)) for number in self.get_segments()]
+        key = tuple((number, inode, offset) for number, (inode, offset, lines) in read)
+
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        submissions = {}
+        segments = {}
+        deleted = set()
+
+        for number, (inode, offset, lines) in read:
+            for line in lines:
+                if 'deleted' in line:
+                    deleted.update(line['deleted'])
+                else:
+                    submissions[line['id']] = line
+                    segments[line['id']] = number
+
+        for pk in deleted:
+            submissions.pop(pk, None)
+
+        ordered = sorted(submissions.values(), key=lambda line: (line['submit_time'], line['id']), reverse=True)
+
+        # forget the segments that have since been removed
+        for removed in set(_segments) - set(self.get_segment_path(number) for number, segment in read):
+            if os.path.dirname(removed) == path:
+                _segments.pop(removed, None)
+
+        _loaded[path] = (key, (submissions, segments, ordered))
+        return submissions, segments, ordered
+
+    def select_lines(self, ids=None, since=None, until=None):
+        """ Returns the lines of the stored submissions, newest first. """
+
+        submissions, segments, lines = self.load()
+        since = to_stored_time(since)
+        until = to_stored_time(until)
+
+        if ids is not None:
+            ids = set(int(pk) for pk in ids if str(pk).isdigit())
+            lines = sorted(
+                (submissions[pk] for pk in ids if pk in submissions),
+                key=lambda line: (line['submit_time'], line['id']), reverse=True
+            )
+        if since:
+            lines = [line for line in lines if line['submit_time'] >= since]
+        if until:
+            lines = [line for line in lines if line['submit_time'] < until]
+
+        return lines
+
+    def to_submissions(self, lines):
+        return [
+            StoredSubmission(line['id'], from_stored_time(line['submit_time']), line['form_data'],
+                             line['field_schema_id'], line['submission_token'], line['files'])
+            for line in lines
+        ]
+
+    def select(self, ids=None, since=None, until=None):
+        """ Returns the stored submissions, newest first. """
+
+        return self.to_submissions(self.select_lines(ids, since, until))
+
+    def write(self, submissions):
+        submit_time = now()
+
+        with self.lock():
+            meta = self.read_meta()
+            if meta['rows'] >= self.segment_size:
+                meta.update(segment=meta['segment'] + 1, rows=0)
+
+            seen = set()
+            if any(submission.get('submission_token') for submission in submissions):
+                seen.update(
+                    line['submission_token'] for line in self.read_segment(meta['segment'])
+                    if line.get('submission_token')
+                )
+
+            lines = []
+            for submission in submissions:
+                submission_token = submission.get('submission_token') or None
+                if submission_token in seen:
+                    continue
+                if submission_token:
+                    seen.add(submission_token)
+                lines.append({
+                    'id': meta['next_id'] + len(lines),
+                    'submit_time': to_stored_time(submission.get('submit_time')) or submit_time,
+                    'form_data': submission['form_data'],
+                    'field_schema_id': submission.get('field_schema_id'),
+                    'submission_token': submission_token,
+                    'files': self.save_files(submission.get('files'))
+                })
+
+            # the ids are taken before they are written so they are never reused
+            meta.update(next_id=meta['next_id'] + len(lines), rows=meta['rows'] + len(lines))
+            self.write_meta(meta)
+            self.append(meta['segment'], lines)
+
+        return len(lines)
+
+    def iterate(self, ids=None, since=None, until=None, offset=0, limit=None):
+        lines = self.select_lines(ids, since, until)
+
+        if limit is None:
+            return self.to_submissions(lines[offset:])
+        return self.to_submissions(lines[offset:offset + limit])
+
+    def count(self, ids=None, since=None, until=None):
+        return len(self.select_lines(ids, since, until))
+
+    def delete(self, ids=None, since=None, until=None):
+        with self.lock():
+            deleted = self.select(ids, since, until)
+            if not deleted:
+                return 0
+
+            meta = self.read_meta()
+            self.append(meta['segment'], [{'deleted': [s.id for s in deleted]}])
+            self.delete_files(deleted)
+            self.remove_segments(meta['segment'])
+
+        return len(deleted)
+
+    def destroy(self):
+        with self.lock():
+            self.delete_files(self.select())
+
+        path = self.get_dir()
+        shutil.rmtree(path, ignore_errors=True)
+
+        _loaded.pop(path, None)
+        for removed in [segment for segment in _segments if os.path.dirname(segment) == path]:
+            _segments.pop(removed, None)
+
+    def remove_segments(self, active):
+        """ Remove the segments other than the ``active`` one that have no submissions left. """
+
+        submissions, segments, ordered = self.load()
+        remaining = set(segments[pk] for pk in submissions)
+        removed = [number for number in self.get_segments() if number != active and number not in remaining]
+
+        if not removed:
+            return
+
+        # the tombstones in the removed segments that still apply are kept
+        kept = sorted(pk for pk in segments if pk not in submissions and segments[pk] not in removed)
+        if kept:
+            self.append(active, [{'deleted': kept}])
+
+        for number in removed:
+            os.remove(self.get_segment_path(number))
@@ -0,0 +1,129 @@
+from django.db import IntegrityError, transaction
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.spool import save_submit_times
+
+from .base import SubmissionStorage
+
+
+class OrmSubmissionStorage(SubmissionStorage):
+    """ Submissions saved in the database as ``Form.get_submission_class()``, the default storage. """
+
+    uses_database = True
+
+    def get_submission_class(self):
+        return self.form.get_submission_class()
+
+    def get_queryset(self, ids=None, since=None, until=None):
+        queryset = self.get_submission_class()._default_manager.filter(form=self.form)
+
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        if since:
+            queryset = queryset.filter(submit_time__gte=since)
+        if until:
+            queryset = queryset.filter(submit_time__lt=until)
+
+        return queryset
+
+    def write_one(self, submission):
+        """ Saves a submission and its files, in a savepoint when it can be a duplicate or spooled. """
+
+        from wagtailstreamforms.models import FormSubmissionFile
+
+        submission_class = self.get_submission_class()
+        submission_token = submission.get('submission_token') or None
+        files = submission.get('files') or {}
+
+        try:
+            with transaction.atomic(savepoint=bool(submission_token or get_setting('SUBMISSION_SPOOL_DIR'))):
+                saved = submission_class.objects.create(
+                    form_data=submission['form_data'],
+                    form=self.form,
+                    field_schema_id=submission.get('field_schema_id'),
+                    submission_token=submission_token
+                )
+
+                for field in files:
+                    for file in files.getlist(field):
+                        FormSubmissionFile.objects.create(
+                            submission=saved,
+                            field=field,
+                            file=file
+                        )
+
+                # the submit time is set to now when it is created
+                if submission.get('submit_time'):
+                    submission_class.objects.filter(pk=saved.pk).update(submit_time=submission['submit_time'])
+        except IntegrityError:
+            # the same submission has already been saved
+            if submission_token and submission_class.objects.filter(submission_token=submission_token).exists():
+                return 0
+            raise
+
+        return 1
+
+    def write(self, submissions):
+        """ Saves the submissions, in a single query for those without files. """
+
+        if len(submissions) == 1:
+            return self.write_one(submissions[0])
+
+        submission_class = self.get_submission_class()
+        objs = []
+        submit_times = []
+        written = 0
+
+        # the submissions that have already been saved
+        tokens = [submission.get('submission_token') for submission in submissions]
+        seen = set()
+        if any(tokens):
+            seen.update(submission_class.objects.filter(submission_token__in=[t for t in tokens if t])
+                        .values_list('submission_token', flat=True))
+
+        for submission, submission_token in zip(submissions, tokens):
+            if submission_token in seen:
+                continue
+            if submission_token:
+                seen.add(submission_token)
+
+            # the files need the saved submission, and the submit time is set by the token
+            if submission.get('files') or (submission.get('submit_time') and not submission_token):
+                written += self.write_one(submission)
+            else:
+                objs.append(submission_class(
+                    form_data=submission['form_data'],
+                    form=self.form,
+                    field_schema_id=submission.get('field_schema_id'),
+                    submission_token=submission_token or None
+                ))
+                if submission.get('submit_time'):
+                    submit_times.append((submission_token, submission['submit_time']))
+
+        submission_class.objects.bulk_create(objs)
+        if submit_times:
+            save_submit_times(submission_class, submit_times)
+
+        return written + len(objs)
+
+    def iterate(self, ids=None, since=None, until=None, offset=0, limit=None):
+        queryset = self.get_queryset(ids, since, until).prefetch_related('files')
+
+        if limit is None:
+            return queryset[offset:]
+        return queryset[offset:offset + limit]
+
+    def count(self, ids=None, since=None, until=None):
+        return self.get_queryset(ids, since, until).count()
+
+    def delete(self, ids=None, since=None, until=None):
+        submission_class = self.get_submission_class()
+        deleted = self.get_queryset(ids, since, until).delete()[1]
+        return deleted.get(submission_class._meta.label, 0)
+
+    def get(self, pk):
+        return self.get_queryset(ids=[pk]).first()
+
+    def get_field_schema_ids(self, ids=None, since=None, until=None):
+        # a subquery rather than a list of ids
+        return self.get_queryset(ids, since, until).order_by().values('field_schema_id')
@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+
+from .base import FileSubmissionStorage, StoredSubmission, from_stored_time, now, to_stored_time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submission (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submit_time TEXT NOT NULL,
+    form_data TEXT NOT NULL,
+    field_schema_id INTEGER,
+    submission_token TEXT UNIQUE,
+    files TEXT
+);
+CREATE INDEX IF NOT EXISTS submission_submit_time ON submission (submit_time);
+"""
+
+_local = threading.local()
+
+
+class SqliteSubmissionStorage(FileSubmissionStorage):
+    """
+    Submissions saved in a sqlite database of their own for each form, ``form-<id>.sqlite3``
+    in ``WAGTAILSTREAMFORMS_SUBMISSION_STORAGE_DIR``.
+    """
+
+    def connect(self):
+        """ Returns the thread's connection to the form's database, kept open as closing it checkpoints the log. """
+
+        path = self.get_path('form-%s.sqlite3' % self.form.pk)
+        connections = _local.__dict__.setdefault('connections', {})
+
+        if path not in connections:
+            connection = sqlite3.connect(path, timeout=30)
+            # readers do not block the writer, commits survive the process dying without waiting on the disk
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            connections[path] = connection
+
+        return connections[path]
+
+    def destroy(self):
+        self.delete()
+
+        path = self.get_path('form-%s.sqlite3' % self.form.pk)
+        connection = _local.__dict__.get('connections', {}).pop(path, None)
+        if connection is not None:
+            connection.close()
+
+        for name in [path, path + '-wal', path + '-shm']:
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+    def get_where(self, ids=None, since=None, until=None):
+        """ Returns the sql where clause and its params. """
+
+        clauses = []
+        params = []
+
+        if ids is not None:
+            ids = [int(pk) for pk in ids if str(pk).isdigit()]
+            clauses.append('id IN (%s)' % ', '.join('?' * len(ids)) if ids else '0')
+            params += ids
+        if since:
+            clauses.append('submit_time >= ?')
+            params.append(to_stored_time(since))
+        if until:
+            clauses.append('submit_time < ?')
+            params.append(to_stored_time(until))
+
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def write(self, submissions):
+        submit_time = now()
+
+        with self.connect() as connection:
+            tokens = [s['submission_token'] for s in submissions if s.get('submission_token')]
+            seen = set()
+            # sqlite allows 999 params per query
+            for start in range(0, len(tokens), 900):
+                batch = tokens[start:start + 900]
+                sql = 'SELECT submission_token FROM submission WHERE submission_token IN (%s)'
+                seen.update(token for token, in connection.execute(sql % ', '.join('?' * len(batch)), batch))
+
+            rows = []
+            for submission in submissions:
+                submission_token = submission.get('submission_token') or None
+                if submission_token in seen:
+                    continue
+                if submission_token:
+                    seen.add(submission_token)
+                rows.append((
+                    to_stored_time(submission.get('submit_time')) or submit_time,
+                    submission['form_data'],
+                    submission.get('field_schema_id'),
+                    submission_token,
+                    json.dumps(self.save_files(submission.get('files')))
+                ))
+
+            connection.executemany(
+                'INSERT INTO submission (submit_time, form_data, field_schema_id, submission_token, files) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+
+        return len(rows)
+
+    def iterate(self, ids=None, since=None, until=None, offset=0, limit=None):
+        where, params = self.get_where(ids, since, until)
+        sql = 'SELECT id, submit_time, form_data, field_schema_id, submission_token, files FROM submission%s ' \
+              'ORDER BY submit_time DESC, id DESC LIMIT ? OFFSET ?' % where
+
+        with self.connect() as connection:
+            rows = connection.execute(sql, params + [-1 if limit is None else limit, offset]).fetchall()
+
+        return [
+            StoredSubmission(pk, from_stored_time(submit_time), form_data, field_schema_id, submission_token,
+                             json.loads(files or '[]'))
+            for pk, submit_time, form_data, field_schema_id, submission_token, files in rows
+        ]
+
+    def count(self, ids=None, since=None, until=None):
+        where, params = self.get_where(ids, since, until)
+
+        with self.connect() as connection:
+            return connection.execute('SELECT COUNT(*) FROM submission%s' % where, params).fetchone()[0]
+
+    def delete(self, ids=None, since=None, until=None):
+        where, params = self.get_where(ids, since, until)
+
+        # the files are only read for the submissions that have them
+        self.delete_files(self.iterate_with_files(where, params))
+
+        with self.connect() as connection:
+            return connection.execute('DELETE FROM submission%s' % where, params).rowcount
+
+    def iterate_with_files(self, where, params):
+        sql = "SELECT files FROM submission%s%s files != '[]'" % (where, ' AND' if where else ' WHERE')
+
+        with self.connect() as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        return [StoredSubmission(None, None, '{}', files=json.loads(files)) for files, in rows]
+
+    def get_field_schema_ids(self, ids=None, since=None, until=None):
+        where, params = self.get_where(ids, since, until)
+
+        with self.connect() as connection:
+            rows = connection.execute('SELECT DISTINCT field_schema_id FROM submission%s' % where, params)
+            return set(pk for pk, in rows if pk)
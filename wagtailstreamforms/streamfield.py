@@ -1,24 +1,31 @@
+from collections import OrderedDict
+
 from django.core.exceptions import ImproperlyConfigured
 
 from wagtail.core import blocks
 from wagtail.core.fields import StreamField
-from wagtailstreamforms.fields import get_fields, BaseField
+from wagtailstreamforms.fields import get_fields, get_fields_version, BaseField
 
 
-class FormFieldStreamBlock(blocks.StreamBlock):
-    """ Add all registered instances of BaseField's get_form_block method to the streamfield. """
+_form_blocks = (None, None)
 
-    def __init__(self, local_blocks=None, **kwargs):
-        self._constructor_kwargs = kwargs
 
-        # Note, this is calling BaseStreamBlock's super __init__, not FormFieldStreamBlock's.
-        # We don't want BaseStreamBlock.__init__() to run, because it tries to assign to self.child_blocks,
-        # which we've overridden with a @property. But we DO want Block.__init__() to run.
-        super(blocks.BaseStreamBlock, self).__init__()
+def get_form_blocks():
+    """
+    Return the blocks of all registered fields. These are built once for each version of
+    the registered fields and shared between every ``FormFieldStreamBlock``.
+    """
 
-        self._child_blocks = self.base_blocks.copy()
+    global _form_blocks
+
+    registered_fields = get_fields()
+    version = get_fields_version()
+    built_version, form_blocks = _form_blocks
 
-        for name, field_class in get_fields().items():
+    if built_version != version:
+        form_blocks = OrderedDict()
+
+        for name, field_class in registered_fields.items():
 
             # ensure the field is a subclass of BaseField.
             if not issubclass(field_class, BaseField):
@@ -27,7 +34,26 @@ class FormFieldStreamBlock(blocks.StreamBlock):
             # assign the block
             block = field_class().get_form_block()
             block.set_name(name)
-            self._child_blocks[name] = block
+            form_blocks[name] = block
+
+        _form_blocks = (version, form_blocks)
+
+    return form_blocks
+
+
+class FormFieldStreamBlock(blocks.StreamBlock):
+    """ Add all registered instances of BaseField's get_form_block method to the streamfield. """
+
+    def __init__(self, local_blocks=None, **kwargs):
+        self._constructor_kwargs = kwargs
+
+        # Note, this is calling BaseStreamBlock's super __init__, not FormFieldStreamBlock's.
+        # We don't want BaseStreamBlock.__init__() to run, because it tries to assign to self.child_blocks,
+        # which we've overridden with a @property. But we DO want Block.__init__() to run.
+        super(blocks.BaseStreamBlock, self).__init__()
+
+        self._child_blocks = self.base_blocks.copy()
+        self._child_blocks.update(get_form_blocks())
 
         self._dependencies = self._child_blocks.values()
 
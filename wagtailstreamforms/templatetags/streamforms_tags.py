@@ -1,6 +1,9 @@
+import json
 from urllib.parse import urlencode
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.template import Library
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
 from wagtailstreamforms.blocks import WagtailFormBlock
@@ -8,6 +11,13 @@ from wagtailstreamforms.models import Form
 
 register = Library()
 
+# characters escaped so the json can not close the script tag it is rendered in
+_json_script_escapes = {
+    ord('>'): '\\u003E',
+    ord('<'): '\\u003C',
+    ord('&'): '\\u0026',
+}
+
 
 @register.simple_tag(takes_context=True)
 def url_replace(context, **kwargs):
@@ -42,3 +52,28 @@ def streamforms_form(context, slug, reference, action='.', **kwargs):
 
     except Form.DoesNotExist:
         return mark_safe('')
+
+
+@register.simple_tag
+def streamforms_json_schema(form, element_id=None):
+    """
+    Renders the JSON Schema of a form's fields in a script tag, the form can be
+    the form or its slug.
+
+    {% load streamforms_tags %}
+    {% streamforms_json_schema "the-form-slug" "the-element-id" %}
+    """
+
+    if not isinstance(form, Form):
+        try:
+            form = Form.objects.get(slug=form)
+        except Form.DoesNotExist:
+            return mark_safe('')
+
+    schema = json.dumps(form.get_json_schema(), cls=DjangoJSONEncoder).translate(_json_script_escapes)
+
+    return format_html(
+        '<script id="{}" type="application/schema+json">{}</script>',
+        element_id or 'streamforms-schema-%s' % form.slug,
+        mark_safe(schema)
+    )
@@ -1,3 +1,5 @@
+import time
+from collections import OrderedDict
 from importlib import import_module
 
 from django.apps import apps
@@ -23,3 +25,43 @@ def get_app_submodules(submodule_name):
     for name, module in get_app_modules():
         if module_has_submodule(module, submodule_name):
             yield name, import_module('%s.%s' % (name, submodule_name))
+
+
+_registry_timings = OrderedDict()
+
+
+def import_registry_modules(submodule_name, module_paths=None):
+    """
+    Imports the registry modules named ``submodule_name``, recording how long each one takes.
+
+    When ``module_paths`` is given only those modules are imported, after the one in
+    wagtailstreamforms itself, instead of searching every installed app for the submodule.
+    """
+
+    timings = _registry_timings.setdefault(submodule_name, [])
+
+    if module_paths is None:
+        start = time.perf_counter()
+        module_paths = [
+            '%s.%s' % (name, submodule_name)
+            for name, module in get_app_modules()
+            if module_has_submodule(module, submodule_name)
+        ]
+        timings.append(('search installed apps', time.perf_counter() - start))
+    else:
+        builtin = 'wagtailstreamforms.%s' % submodule_name
+        module_paths = [builtin] + [path for path in module_paths if path != builtin]
+
+    modules = []
+    for path in module_paths:
+        start = time.perf_counter()
+        modules.append(import_module(path))
+        timings.append((path, time.perf_counter() - start))
+
+    return modules
+
+
+def get_registry_timings():
+    """ Returns a dict of the registry submodule name to a list of (module, seconds) taken to import. """
+
+    return _registry_timings
@@ -0,0 +1,61 @@
+from django.forms.utils import ErrorDict
+from django.utils.translation import ugettext as _
+
+from wagtailstreamforms.utils.tokens import claim_submission_token, release_submission_token
+
+
+def process_submission_batch(form_def, items, user=None):
+    """
+    Validates each dict of field values in ``items`` with the form and processes the valid
+    ones together with ``Form.process_form_submissions``.
+
+    Returns a report for each item of its index, its status of ``processed``, ``invalid``,
+    ``duplicate`` or ``error`` and any validation or hook errors.
+    """
+
+    form_class = form_def.get_form_class()
+    validator = form_def.get_validator()
+    results = []
+    valid = []
+
+    for index, data in enumerate(items):
+        if not isinstance(data, dict):
+            results.append({
+                'index': index,
+                'status': 'invalid',
+                'errors': {'__all__': [{'message': _('Expected an object of field values.'), 'code': 'invalid'}]}
+            })
+            continue
+
+        data = dict(data, form_id=str(form_def.pk))
+        data.setdefault('form_reference', 'batch')
+
+        cleaned_data, errors = validator(data)
+
+        if errors:
+            results.append({'index': index, 'status': 'invalid', 'errors': errors.get_json_data()})
+            continue
+
+        # a submission already processed is not processed again
+        token = cleaned_data.get('submission_token')
+        if token and not claim_submission_token(form_def.pk, token):
+            results.append({'index': index, 'status': 'duplicate'})
+            continue
+
+        # the hooks are given a valid form as usual, without cleaning the data again
+        form = form_class(data, user=user)
+        form.cleaned_data = cleaned_data
+        form._errors = ErrorDict()
+
+        valid.append((index, form))
+        results.append({'index': index, 'status': 'processed'})
+
+    hook_errors = form_def.process_form_submissions([form for index, form in valid])
+
+    for (index, form), errors in zip(valid, hook_errors):
+        if errors:
+            results[index].update(status='error', errors=errors)
+            if form.cleaned_data.get('submission_token'):
+                release_submission_token(form_def.pk, form.cleaned_data['submission_token'])
+
+    return results
@@ -0,0 +1,64 @@
+import logging
+from concurrent import futures
+from threading import Lock
+
+from django.db import connections, transaction
+
+from wagtailstreamforms.conf import get_setting
+
+
+logger = logging.getLogger(__name__)
+
+_executor = (None, None)
+_executor_lock = Lock()
+_pending = set()
+
+
+def get_executor():
+    """ The thread pool hooks are run in, sized by ``WAGTAILSTREAMFORMS_ASYNC_HOOK_WORKERS``. """
+
+    global _executor
+
+    workers = get_setting('ASYNC_HOOK_WORKERS')
+
+    with _executor_lock:
+        if _executor[0] != workers:
+            if _executor[1] is not None:
+                _executor[1].shutdown(wait=False)
+            _executor = (workers, futures.ThreadPoolExecutor(max_workers=workers))
+
+    return _executor[1]
+
+
+def run_hook(fn, instance, form):
+    try:
+        fn(instance, form)
+    except Exception:
+        logger.exception('Error running the %s hook for form %s', fn.__name__, instance.pk)
+    finally:
+        # the thread does not belong to a request so close its connections
+        connections.close_all()
+
+
+def dispatch_hook(fn, instance, form):
+    """
+    Runs a hook registered with ``run_async=True`` in a background thread once the
+    current transaction has been committed, or immediately if async hooks are disabled.
+    """
+
+    if not get_setting('ASYNC_HOOK_WORKERS') or not getattr(fn, 'run_async', False):
+        fn(instance, form)
+        return
+
+    def submit():
+        future = get_executor().submit(run_hook, fn, instance, form)
+        _pending.add(future)
+        future.add_done_callback(_pending.discard)
+
+    transaction.on_commit(submit)
+
+
+def wait_for_hooks(timeout=None):
+    """ Wait for the hooks running in the background to finish. """
+
+    return futures.wait(list(_pending), timeout=timeout)
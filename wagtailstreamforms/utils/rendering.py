@@ -0,0 +1,57 @@
+import re
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import Template
+from django.template.loader import get_template
+
+
+INCLUDE_RE = re.compile(r'{%\s*include\s+([\'"])(?P<name>[^\'"]+)\1\s*%}')
+EXTENDS_RE = re.compile(r'{%\s*extends\s')
+
+_flattened_templates = {}
+
+
+def flatten_template_source(source, engine, depth=0):
+    """
+    Replaces every ``{% include "template_name" %}`` that has a literal template name and no
+    extra arguments with the source of the included template, so it is only resolved once.
+    """
+
+    def replace(match):
+        try:
+            included = engine.get_template(match.group('name'))
+        except TemplateDoesNotExist:
+            return match.group(0)
+
+        # templates that extend others can not simply be inlined
+        if depth > 10 or EXTENDS_RE.search(included.source):
+            return match.group(0)
+
+        return flatten_template_source(included.source, engine, depth + 1)
+
+    return INCLUDE_RE.sub(replace, source)
+
+
+def get_flattened_template(template_name):
+    """
+    Returns the template with its includes flattened into a single template,
+    compiled once per template name unless ``DEBUG`` is on.
+
+    Templates of other template backends are returned unchanged.
+    """
+
+    template = _flattened_templates.get(template_name)
+
+    if template is None:
+        template = get_template(template_name)
+
+        if isinstance(template, Template):
+            engine = template.template.engine
+            source = flatten_template_source(template.template.source, engine)
+            template = Template(engine.from_string(source), template.backend)
+
+        if not settings.DEBUG:
+            _flattened_templates[template_name] = template
+
+    return template
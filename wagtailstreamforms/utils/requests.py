@@ -1,3 +1,7 @@
+import json
+
+from django.utils.http import is_safe_url
+
 from wagtailstreamforms.models import Form
 
 
@@ -7,7 +11,42 @@ def get_form_instance_from_request(request):
     form_id = request.POST.get('form_id')
     if form_id and form_id.isdigit():
         try:
-            return Form.objects.get(pk=int(form_id))
+            return Form.objects.with_advanced_settings().get(pk=int(form_id))
         except Form.DoesNotExist:
             pass
     return None
+
+
+def get_submitted_data(request):
+    """
+    The submitted values, parsed from the body of an ``application/json`` request or else the
+    posted form data. Returns None if the json is not an object.
+    """
+
+    if request.content_type != 'application/json':
+        return request.POST
+
+    # parsed once for the checks run before the submission and the view
+    if not hasattr(request, '_streamforms_data'):
+        try:
+            data = json.loads(request.body.decode(request.encoding or 'utf-8'))
+        except ValueError:
+            data = None
+        request._streamforms_data = data if isinstance(data, dict) else None
+
+    return request._streamforms_data
+
+
+def accepts_json(request):
+    """ Does the request ask for a json response. """
+
+    return 'application/json' in request.META.get('HTTP_ACCEPT', '')
+
+
+def get_next_url(request, default='/'):
+    """ The url to return to after a submission, from the next parameter or the referring page. """
+
+    for url in [request.POST.get('next'), request.GET.get('next'), request.META.get('HTTP_REFERER')]:
+        if url and is_safe_url(url, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+            return url
+    return default
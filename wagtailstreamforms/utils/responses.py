@@ -0,0 +1,95 @@
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.translation import ugettext as _
+
+from wagtail.core.blocks import StructValue
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.utils.requests import accepts_json
+from wagtailstreamforms.utils.throttle import throttle_submission
+
+
+def valid_json_response(form_def, redirect_url):
+    """ The response to a valid submission from a request that accepts json. """
+
+    return JsonResponse({
+        'message': form_def.success_message,
+        'redirect_url': redirect_url
+    })
+
+
+def invalid_json_response(form_def, form):
+    """ The response to an invalid submission from a request that accepts json. """
+
+    return JsonResponse({
+        'message': form_def.error_message,
+        'errors': form.errors.get_json_data()
+    }, status=400)
+
+
+def rejected_response(request, form_def, message):
+    """ The response to a submission rejected before the form is built. """
+
+    if accepts_json(request) or request.content_type == 'application/json':
+        return JsonResponse({
+            'message': form_def.error_message,
+            'errors': {'__all__': [{'message': str(message), 'code': 'rejected'}]}
+        }, status=400)
+
+    return HttpResponseBadRequest(message)
+
+
+def throttled_response(request, form_def, retry_after):
+    """ The response to a submission over the form's rate limit. """
+
+    if accepts_json(request) or request.content_type == 'application/json':
+        response = JsonResponse({
+            'message': form_def.error_message,
+            'errors': {'__all__': [{'message': _('Too many submissions, please try again later.'),
+                                    'code': 'throttled'}]}
+        }, status=429)
+    else:
+        response = HttpResponse(_('Too many submissions, please try again later.'), status=429)
+
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def pre_process_response(request, form_def):
+    """
+    The response to a submission that is rejected by a ``pre_process_form_submission`` hook or is over
+    the form's rate limit, or None if the submission can be processed.
+    """
+
+    # spam is rejected first so it does not use up the rate limit
+    message = form_def.pre_process_form_submission(request)
+    if message:
+        return rejected_response(request, form_def, message)
+
+    retry_after = throttle_submission(form_def, request)
+    if retry_after is not None:
+        return throttled_response(request, form_def, retry_after)
+
+
+def render_form_fragment(request, form_def, form, form_action, page=None):
+    """ Renders just the html of the form with its errors. """
+
+    block = WagtailFormBlock()
+    form_reference = form.data.get('form_reference')
+    value = StructValue(block, [
+        ('form', form_def),
+        ('form_action', form_action),
+        ('form_reference', form_reference),
+    ])
+
+    return block.render(value, {
+        'request': request,
+        'page': page,
+        'streamforms_fragment': True,
+        'invalid_stream_form_reference': form_reference,
+        'invalid_stream_form': form
+    })
+
+
+def invalid_fragment_response(request, form_def, form, form_action, page=None):
+    """ The response to an invalid submission from an ajax request. """
+
+    return HttpResponse(render_form_fragment(request, form_def, form, form_action, page))
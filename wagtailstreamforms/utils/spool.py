@@ -0,0 +1,634 @@
+import atexit
+import json
+import logging
+import os
+import shutil
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import ExitStack
+from threading import Event, Lock, Thread, Timer
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.files.uploadedfile import UploadedFile
+from django.db import DatabaseError, IntegrityError, connections, router, transaction
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from django.utils.dateparse import parse_datetime
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.tokens import get_submission_key, make_submission_token
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+_spools = {}
+_spools_lock = Lock()
+_flusher = None
+_flusher_lock = Lock()
+
+
+def lock_file(f):
+    """ Returns whether the file could be locked, the lock is released when the file is closed. """
+
+    if fcntl is None:  # pragma: no cover
+        return True
+
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+class Spool:
+    """
+    A directory of json lines segment files that records are appended to.
+
+    Each process appends to its own ``.open`` segment, which is renamed to ``.jsonl`` once it
+    is closed and then renamed to ``.flushing`` while it is being read. The open and flushing
+    segments are locked so the segments of a process that has died are recovered. A segment
+    is closed once it is ``max_age`` seconds old, even if nothing more is appended to it.
+    """
+
+    def __init__(self, path, fsync=False, max_rows=500, max_age=1):
+        self.path = path
+        self.fsync = fsync
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self.lock = Lock()
+        self.segment = None
+        self.name = None
+        self.rows = 0
+        self.opened = None
+        self.timer = None
+        os.makedirs(path, exist_ok=True)
+
+    def get_path(self, name):
+        return os.path.join(self.path, name)
+
+    def open_segment(self):
+        stem = '%016d-%s-%s' % (time.time() * 1000000, socket.gethostname(), os.getpid())
+
+        # the segment is locked before it is given the name other processes recover
+        segment = open(self.get_path(stem + '.new'), 'a', encoding='utf-8')
+        lock_file(segment)
+        os.rename(self.get_path(stem + '.new'), self.get_path(stem + '.open'))
+
+        self.segment, self.name, self.rows, self.opened = segment, stem, 0, time.monotonic()
+
+        # the segment of an idle process is closed without the flusher thread
+        if self.max_age:
+            self.timer = Timer(self.max_age, self.expire, [stem])
+            self.timer.daemon = True
+            self.timer.start()
+
+    def close_segment(self):
+        os.rename(self.get_path(self.name + '.open'), self.get_path(self.name + '.jsonl'))
+        self.segment.close()
+        self.segment = self.name = None
+
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def expire(self, name):
+        """ Close the segment ``name`` if it is still open. """
+
+        with self.lock:
+            if self.name != name:
+                return
+            try:
+                self.close_segment()
+            except OSError:
+                logger.exception('Could not close the submission spool segment %s', name)
+
+    def append(self, record):
+        """
+        Append a record to the open segment, returns whether the segment was then closed for
+        having ``max_rows`` records or being open for ``max_age`` seconds.
+        """
+
+        line = json.dumps(record, cls=DjangoJSONEncoder) + '\n'
+
+        with self.lock:
+            if self.segment is None:
+                self.open_segment()
+
+            self.segment.write(line)
+            self.segment.flush()
+            if self.fsync:
+                os.fsync(self.segment.fileno())
+            self.rows += 1
+
+            if self.rows >= self.max_rows or time.monotonic() - self.opened >= self.max_age:
+                self.close_segment()
+                return True
+
+        return False
+
+    def rotate(self, max_age=None):
+        """ Close the open segment, if it is older than ``max_age`` seconds, so it can be read. """
+
+        with self.lock:
+            if self.segment is not None and time.monotonic() - self.opened >= (max_age or 0):
+                self.close_segment()
+
+    def recover(self):
+        """ Return the open and flushing segments of processes that have died to the closed segments. """
+
+        # without file locks there is no telling whether the process has died
+        if fcntl is None:  # pragma: no cover
+            return
+
+        for name in sorted(os.listdir(self.path)):
+            stem, ext = os.path.splitext(name)
+            if ext not in ['.open', '.flushing'] or stem == self.name:
+                continue
+
+            try:
+                f = open(self.get_path(name), 'a')
+            except OSError:
+                continue
+
+            with f:
+                if lock_file(f):
+                    logger.warning('Recovering the submission spool segment %s', name)
+                    os.rename(self.get_path(name), self.get_path(stem + '.jsonl'))
+
+    def read(self, f, name):
+        for line_number, line in enumerate(f, start=1):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # the last line is cut short if the process died while writing it
+                logger.error('Skipping line %s of the submission spool segment %s that is not valid json',
+                             line_number, name)
+
+    def drain(self, fn):
+        """
+        Call ``fn`` with a list of the records of each closed segment, the segment is removed
+        once ``fn`` returns and kept to be read again if it raises an error.
+
+        Returns the number of records read.
+        """
+
+        count = 0
+
+        for name in sorted(os.listdir(self.path)):
+            stem, ext = os.path.splitext(name)
+            if ext != '.jsonl':
+                continue
+
+            try:
+                f = open(self.get_path(name), encoding='utf-8')
+            except OSError:
+                continue
+
+            with f:
+                # another process is reading the segment or has already read it
+                if not lock_file(f):
+                    continue
+                try:
+                    os.rename(self.get_path(name), self.get_path(stem + '.flushing'))
+                except OSError:
+                    continue
+
+                records = list(self.read(f, name))
+
+                try:
+                    fn(records)
+                except Exception:
+                    os.rename(self.get_path(stem + '.flushing'), self.get_path(name))
+                    raise
+
+                os.remove(self.get_path(stem + '.flushing'))
+                count += len(records)
+
+        return count
+
+
+def open_spool(*config):
+    """ The spool of the (path, fsync, max rows, max age) config, shared by the threads of the process. """
+
+    with _spools_lock:
+        if config not in _spools:
+            _spools[config] = Spool(*config)
+
+    return _spools[config]
+
+
+def get_spool():
+    """ The spool of buffered submissions in ``WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR``. """
+
+    path = get_setting('SUBMISSION_BUFFER_DIR')
+
+    if not path:
+        raise ImproperlyConfigured('WAGTAILSTREAMFORMS_SUBMISSION_BUFFER_DIR must be set to buffer submissions')
+
+    return open_spool(
+        path,
+        get_setting('SUBMISSION_BUFFER_FSYNC'),
+        get_setting('SUBMISSION_BUFFER_FLUSH_SIZE'),
+        get_setting('SUBMISSION_BUFFER_FLUSH_INTERVAL'),
+    )
+
+
+def get_fallback_spool():
+    """
+    The spool of submissions that could not be saved in ``WAGTAILSTREAMFORMS_SUBMISSION_SPOOL_DIR``,
+    or None if there is none.
+    """
+
+    path = get_setting('SUBMISSION_SPOOL_DIR')
+
+    # each submission is synced to disk in a segment of its own so it can be replayed straight away
+    return open_spool(path, True, 1, 0) if path else None
+
+
+def make_record(instance, form_data, submission_token=None, submit_time=None):
+    """ The record of a submission of the form ``instance`` kept in the spool. """
+
+    return OrderedDict([
+        ('form', instance.pk),
+        # a form saved before schemas existed is given one when the record is saved
+        ('field_schema', instance.field_schema_id),
+        ('form_data', form_data),
+        # every record has a token so it is only saved once however many times it is read
+        ('submission_token', submission_token or uuid.uuid4().hex),
+        ('submit_time', submit_time or timezone.now()),
+    ])
+
+
+def buffer_submission(instance, form_data, submission_token=None):
+    """ Append a submission to the spool to be saved by the next flush. """
+
+    closed = get_spool().append(make_record(instance, form_data, submission_token))
+
+    if get_setting('SUBMISSION_BUFFER_THREAD'):
+        flusher = get_flusher()
+        # flush a closed segment now rather than waiting for the interval
+        if closed:
+            flusher.event.set()
+
+
+def parse_submit_time(value):
+    submit_time = parse_datetime(value)
+
+    # the setting can have changed since the submission was spooled
+    if settings.USE_TZ and timezone.is_naive(submit_time):
+        return timezone.make_aware(submit_time)
+    if not settings.USE_TZ and timezone.is_aware(submit_time):
+        return timezone.make_naive(submit_time)
+    return submit_time
+
+
+def save_records(records):
+    """ Save the spooled submissions that have not already been saved, grouped by their form. """
+
+    from wagtailstreamforms.models import Form
+
+    by_form = OrderedDict()
+    for record in records:
+        by_form.setdefault(record['form'], []).append(record)
+
+    forms = Form.objects.in_bulk(list(by_form))
+    saved = 0
+
+    for form_id, form_records in by_form.items():
+        if form_id not in forms:
+            logger.warning('Dropping %s spooled submissions of the deleted form %s', len(form_records), form_id)
+            continue
+
+        form = forms[form_id]
+        submission_class = form.get_submission_class()
+        tokens = [record['submission_token'] for record in form_records]
+        seen = set(submission_class.objects.filter(submission_token__in=tokens)
+                   .values_list('submission_token', flat=True))
+
+        submissions = []
+        submit_times = []
+        for record in form_records:
+            if record['submission_token'] in seen:
+                continue
+            seen.add(record['submission_token'])
+            submissions.append(submission_class(
+                form_id=form_id,
+                field_schema_id=record['field_schema'] or form.get_field_schema().pk,
+                form_data=record['form_data'],
+                submission_token=record['submission_token']
+            ))
+            submit_times.append((record['submission_token'], parse_submit_time(record['submit_time'])))
+
+        with transaction.atomic(using=router.db_for_write(submission_class)):
+            submission_class.objects.bulk_create(submissions, batch_size=get_setting('SUBMISSION_BUFFER_FLUSH_SIZE'))
+            save_submit_times(submission_class, submit_times)
+
+        saved += len(submissions)
+
+    return saved
+
+
+def save_submit_times(submission_class, submit_times):
+    """
+    Set the submit time of the created submissions, which ``bulk_create`` sets to now, to when
+    they were submitted from a list of their (token, submit time).
+    """
+
+    connection = connections[router.db_for_write(submission_class)]
+    opts = submission_class._meta
+    field = opts.get_field('submit_time')
+    sql = 'UPDATE %s SET %s = %%s WHERE %s = %%s' % (
+        connection.ops.quote_name(opts.db_table),
+        connection.ops.quote_name(field.column),
+        connection.ops.quote_name(opts.get_field('submission_token').column),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (field.get_db_prep_value(submit_time, connection), token) for token, submit_time in submit_times
+        ])
+
+
+def flush_submissions(spool=None):
+    """
+    Save the submissions in the closed segments of the spool, and those of processes
+    that have died, in batches. Returns the number of submissions saved.
+    """
+
+    spool = spool or get_spool()
+    spool.recover()
+
+    saved = []
+    spool.drain(lambda records: saved.append(save_records(records)))
+    return sum(saved)
+
+
+def write_files(spool, files):
+    """ Copy the uploaded files to the spool, returns a list of the (field, path, name, content type) of each. """
+
+    directory = os.path.join('files', uuid.uuid4().hex)
+    written = []
+
+    for field in files:
+        for file in files.getlist(field):
+            path = os.path.join(directory, str(len(written)))
+            os.makedirs(spool.get_path(directory), exist_ok=True)
+
+            with open(spool.get_path(path), 'wb') as f:
+                for chunk in file.chunks():
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            written.append((field, path, file.name, getattr(file, 'content_type', None)))
+
+    return written
+
+
+def open_files(spool, record, stack):
+    """ The spooled files of the record as uploaded files, closed when the ``stack`` is. """
+
+    files = MultiValueDict()
+
+    for field, path, name, content_type in record.get('files') or []:
+        f = stack.enter_context(open(spool.get_path(path), 'rb'))
+        files.appendlist(field, UploadedFile(f, name, content_type, os.path.getsize(spool.get_path(path))))
+
+    return files
+
+
+def spool_submission(instance, form_data, submission_token=None, files=None):
+    """ Write a submission that could not be saved, and its files, to the fallback spool. """
+
+    spool = get_fallback_spool()
+    record = make_record(instance, form_data, submission_token)
+    record['kind'] = 'submission'
+    record['files'] = write_files(spool, files or {})
+    spool.append(record)
+
+
+def spool_form_submission(instance, form):
+    """ Write a valid form that could not be processed, and its files, to the fallback spool. """
+
+    # the form data saved if the form is no longer valid when it is replayed
+    from wagtailstreamforms.wagtailstreamforms_hooks import get_submission_data
+
+    # the form is spooled with the token it was rendered with, so it is cleaned again into the key
+    # of the record and of any submission the save hook spooled for it, and only saved once
+    token = getattr(form, 'rendered_submission_token', None) or make_submission_token()
+
+    spool = get_fallback_spool()
+    record = make_record(instance, get_submission_data(form), get_submission_key(token, form.cleaned_data))
+
+    if isinstance(form.data, MultiValueDict):
+        data, data_lists = dict(form.data.lists()), True
+    else:
+        data, data_lists = dict(form.data), False
+
+    data['submission_token'] = [token] if data_lists else token
+
+    record.update(kind='form', data=data, data_lists=data_lists)
+    record['files'] = write_files(spool, form.files)
+    spool.append(record)
+
+
+def process_form_submission(instance, form):
+    """
+    Process a valid form, writing it to the fallback spool to be processed by the ``replayspool``
+    command if it can not be processed as the database is unavailable.
+    """
+
+    if get_fallback_spool() is None:
+        instance.process_form_submission(form)
+        return
+
+    # a form without a token is given one, so the submission the save hook spools and the form
+    # spooled here share it
+    if not form.cleaned_data.get('submission_token'):
+        form.rendered_submission_token = make_submission_token()
+        form.cleaned_data['submission_token'] = get_submission_key(form.rendered_submission_token, form.cleaned_data)
+
+    # the hooks are rolled back together so the form can be processed again from the spool
+    try:
+        with transaction.atomic():
+            instance.process_form_submission(form)
+    except DatabaseError as e:
+        # an integrity error would only happen again
+        if isinstance(e, IntegrityError):
+            raise
+        logger.exception('Could not process a submission of form %s, writing it to the spool', instance.pk)
+        spool_form_submission(instance, form)
+
+
+def save_record(spool, instance, record):
+    """ Save a spooled submission and its files, unless it has already been saved. """
+
+    from wagtailstreamforms.models import FormSubmissionFile
+
+    submission_class = instance.get_submission_class()
+
+    if submission_class.objects.filter(submission_token=record['submission_token']).exists():
+        return 0
+
+    with transaction.atomic(using=router.db_for_write(submission_class)), ExitStack() as stack:
+        submission = submission_class.objects.create(
+            form=instance,
+            field_schema_id=record['field_schema'] or instance.get_field_schema().pk,
+            form_data=record['form_data'],
+            submission_token=record['submission_token']
+        )
+        save_submit_times(submission_class, [(record['submission_token'], parse_submit_time(record['submit_time']))])
+
+        files = open_files(spool, record, stack)
+        for field in files:
+            for file in files.getlist(field):
+                FormSubmissionFile.objects.create(submission=submission, field=field, file=file)
+
+    return 1
+
+
+def replay_form(spool, instance, record):
+    """ Process a spooled form as if it had just been submitted. """
+
+    if record['data_lists']:
+        data = MultiValueDict(record['data'])
+    else:
+        data = record['data']
+
+    with ExitStack() as stack:
+        form = instance.get_form(data, open_files(spool, record, stack))
+
+        if form.is_valid():
+            instance.process_form_submission(form)
+            return 1
+
+    # the form has changed since it was submitted so the submission is saved as it was
+    logger.warning('A spooled submission of form %s is no longer valid, saving it without processing it',
+                   instance.pk)
+    return save_record(spool, instance, record)
+
+
+def replay_records(spool, records):
+    """
+    Save each spooled submission and process each spooled form, the submissions and forms that
+    have already been saved or processed are skipped. Returns the number of records replayed.
+    """
+
+    from wagtailstreamforms.models import Form
+
+    replayed = save_records([r for r in records if r.get('kind', 'submission') == 'submission' and not r.get('files')])
+
+    forms = Form.objects.in_bulk([record['form'] for record in records])
+
+    for record in records:
+        if record.get('kind') != 'form' and not record.get('files'):
+            continue
+
+        instance = forms.get(record['form'])
+        if instance is None:
+            logger.warning('Dropping a spooled submission of the deleted form %s', record['form'])
+        elif record.get('kind') == 'form':
+            replayed += replay_form(spool, instance, record)
+        else:
+            replayed += save_record(spool, instance, record)
+
+    # the files are only removed once every record that uses them is saved
+    for record in records:
+        if record.get('files'):
+            shutil.rmtree(spool.get_path(os.path.dirname(record['files'][0][1])), ignore_errors=True)
+
+    return replayed
+
+
+def replay_spool(spool=None):
+    """
+    Replay the submissions in the fallback spool, and those of processes that have died.
+    Returns the number of submissions replayed.
+    """
+
+    spool = spool or get_fallback_spool()
+    spool.recover()
+
+    replayed = []
+    spool.drain(lambda records: replayed.append(replay_records(spool, records)))
+    return sum(replayed)
+
+
+class Flusher(Thread):
+    """ A background thread that flushes the spool every interval, or as soon as a segment is full. """
+
+    daemon = True
+
+    def __init__(self, interval):
+        super().__init__(name='wagtailstreamforms-flusher')
+        self.interval = interval
+        self.event = Event()
+        self.stopped = False
+
+    def flush(self):
+        try:
+            spool = get_spool()
+            spool.rotate(self.interval)
+            flush_submissions(spool)
+        except Exception:
+            logger.exception('Error flushing the buffered form submissions, they will be retried')
+        finally:
+            # the thread does not belong to a request so close its connections
+            connections.close_all()
+
+    def run(self):
+        while not self.stopped:
+            self.event.wait(self.interval)
+            self.event.clear()
+            self.flush()
+
+    def stop(self, timeout=None):
+        """ Stop the thread once it has flushed the spool. """
+
+        self.stopped = True
+        self.event.set()
+        self.join(timeout)
+
+
+def get_flusher():
+    """ The thread flushing buffered submissions, started with the first buffered submission. """
+
+    global _flusher
+
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = Flusher(get_setting('SUBMISSION_BUFFER_FLUSH_INTERVAL'))
+            _flusher.start()
+
+    return _flusher
+
+
+def stop_flusher(timeout=None):
+    """
+    Close the open segment of the spool and stop the flusher thread, if it was started,
+    once it has saved the buffered submissions.
+    """
+
+    global _flusher
+
+    with _flusher_lock:
+        flusher, _flusher = _flusher, None
+
+    for spool in list(_spools.values()):
+        spool.rotate()
+
+    if flusher is not None and flusher.is_alive():
+        flusher.stop(timeout)
+
+
+atexit.register(stop_flusher)
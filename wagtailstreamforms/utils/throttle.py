@@ -0,0 +1,178 @@
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from threading import Lock
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+from wagtailstreamforms.conf import get_setting
+
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+# the most buckets kept in the process when the cache is not used, the oldest are removed first
+LOCAL_BUCKETS_SIZE = 10000
+
+_counts = Counter()
+
+
+def parse_rate(rate):
+    """ Returns a tuple of (number, seconds) from a rate such as ``'10/m'``, or None if there is no rate. """
+
+    if not rate:
+        return None
+
+    try:
+        number, period = rate.split('/')
+        return int(number), PERIODS[period[0].lower()]
+    except (ValueError, KeyError, IndexError):
+        raise ImproperlyConfigured(
+            "The rate %r must be of the form 'number/period' with a period of s, m, h or d" % rate
+        )
+
+
+class LocalBuckets:
+    """
+    Token buckets kept in the memory of the process, each holds ``number`` tokens and is refilled
+    at ``number`` tokens each ``period`` seconds.
+    """
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        return self.buckets.get(key)
+
+    def take(self, key, number, period):
+        """ Takes a token from the bucket ``key``, returns None if there was one or the seconds until there will be. """
+
+        # the bucket is read and updated under the lock so each token is only taken once
+        with self.lock:
+            now = time.time()
+            state = self.buckets.pop(key, None)
+
+            if state is None:
+                tokens = number
+            else:
+                tokens = min(number, state[0] + (now - state[1]) * number / period)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = None
+            else:
+                retry_after = (1 - tokens) * period / number
+
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > LOCAL_BUCKETS_SIZE:
+                self.buckets.popitem(last=False)
+
+        return retry_after
+
+
+local_buckets = LocalBuckets()
+
+
+def get_buckets():
+    """ The cache the buckets are kept in, shared by processes, or the process when there is none. """
+
+    alias = get_setting('RATE_LIMIT_CACHE')
+    return caches[alias] if alias else local_buckets
+
+
+def take_cache_token(cache, key, number, period):
+    """
+    Takes a token from the ``number`` tokens of the current ``period`` seconds, counted in the cache.
+
+    The count is added and incremented by the cache so processes can not overwrite each other's
+    counts. Returns None if there was a token, or the seconds until the next period.
+    """
+
+    now = time.time()
+    window = int(now // period)
+    key = '%s:%s' % (key, window)
+
+    try:
+        count = 1 if cache.add(key, 1, period) else cache.incr(key)
+    except ValueError:
+        # the count expired after it was added
+        cache.set(key, 1, period)
+        count = 1
+
+    if count <= number:
+        return None
+    return (window + 1) * period - now
+
+
+def take_token(key, number, period):
+    """
+    Takes a token from the rate limit ``key`` of ``number`` tokens each ``period`` seconds.
+
+    Returns None if there was a token, or the seconds until there will be one.
+    """
+
+    buckets = get_buckets()
+
+    if buckets is not local_buckets:
+        try:
+            return take_cache_token(buckets, key, number, period)
+        except Exception:
+            logger.exception('Could not update the rate limit in the cache, using the process instead')
+
+    return local_buckets.take(key, number, period)
+
+
+def get_client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def get_rate_limits(form_def, request):
+    """
+    Returns a list of the (bucket key, rate, scope) of each rate limit of the submission.
+
+    The rates are the ``rate_limit`` and ``client_rate_limit`` of the form's advanced settings,
+    if it has them, or else the ``WAGTAILSTREAMFORMS_RATE_LIMIT`` and ``WAGTAILSTREAMFORMS_CLIENT_RATE_LIMIT``.
+    """
+
+    advanced_settings = form_def.get_advanced_settings()
+    rate = getattr(advanced_settings, 'rate_limit', None) or get_setting('RATE_LIMIT')
+    client_rate = getattr(advanced_settings, 'client_rate_limit', None) or get_setting('CLIENT_RATE_LIMIT')
+
+    limits = []
+    if rate:
+        limits.append(('wagtailstreamforms:throttle:%s' % form_def.pk, rate, 'form'))
+    if client_rate:
+        key = 'wagtailstreamforms:throttle:%s:%s' % (form_def.pk, get_client_ip(request))
+        limits.append((key, client_rate, 'client'))
+    return limits
+
+
+def throttle_submission(form_def, request):
+    """ Returns None if the submission is within the form's rate limits, or the seconds until it will be. """
+
+    for key, rate, scope in get_rate_limits(form_def, request):
+        retry_after = take_token(key, *parse_rate(rate))
+
+        if retry_after is not None:
+            _counts[(form_def.pk, scope, 'throttled')] += 1
+            logger.warning('Throttled a submission of form %s by its %s rate limit', form_def.pk, scope)
+            return int(math.ceil(retry_after))
+
+        _counts[(form_def.pk, scope, 'allowed')] += 1
+
+
+def get_throttle_counts():
+    """
+    Returns a dict of (form id, scope, 'allowed' or 'throttled') to the number of submissions
+    this process has checked against each rate limit, for monitoring.
+    """
+
+    return dict(_counts)
+
+
+def reset_throttle_counts():
+    _counts.clear()
@@ -0,0 +1,202 @@
+import hashlib
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.files import File
+from django.utils import baseconv
+
+from wagtailstreamforms.conf import get_setting
+
+
+FORM_TOKEN_SALT = 'wagtailstreamforms.form_token'
+FORM_RENDERED_SALT = 'wagtailstreamforms.form_rendered'
+FRAGMENT_SALT = 'wagtailstreamforms.fragment'
+
+
+def get_form_token_value(form_id, form_reference):
+    return '%s:%s' % (form_id, form_reference)
+
+
+def make_form_token(form_id, form_reference):
+    """ Returns a signed, timestamped token bound to the form id and form reference. """
+
+    signer = signing.TimestampSigner(salt=FORM_TOKEN_SALT)
+    return signer.sign(get_form_token_value(form_id, form_reference))
+
+
+def check_form_token(token, form_id, form_reference):
+    """ Returns True if the token is valid for the form id and form reference and has not expired. """
+
+    if not token:
+        return False
+
+    signer = signing.TimestampSigner(salt=FORM_TOKEN_SALT)
+
+    try:
+        value = signer.unsign(token, max_age=get_setting('FORM_TOKEN_MAX_AGE'))
+    except signing.BadSignature:
+        return False
+
+    return value == get_form_token_value(form_id, form_reference)
+
+
+def check_request_form_token(request):
+    """ Returns True if the request posted a valid form token. """
+
+    return check_form_token(
+        request.POST.get('form_token'),
+        request.POST.get('form_id'),
+        request.POST.get('form_reference')
+    )
+
+
+def get_request_form_token_key(request):
+    """ Returns the cache key of the form token in the request and the data posted with it. """
+
+    digest = hashlib.sha1(request.POST['form_token'].encode('utf-8'))
+    for key, values in sorted(request.POST.lists()):
+        digest.update(repr((key, values)).encode('utf-8'))
+    for key, files in sorted(request.FILES.lists()):
+        digest.update(repr((key, [(f.name, f.size) for f in files])).encode('utf-8'))
+
+    return 'wagtailstreamforms:form_token:%s' % digest.hexdigest()
+
+
+def consume_request_form_token(request):
+    """
+    Returns True if the form token in the request is valid and has not already been posted with
+    the same data, recording it in the cache so any replay of the request is detected.
+    """
+
+    if not check_request_form_token(request):
+        return False
+
+    return cache.add(get_request_form_token_key(request), True, get_setting('FORM_TOKEN_MAX_AGE'))
+
+
+def release_request_form_token(request):
+    """ Releases a consumed form token so the same data can be posted with it again. """
+
+    cache.delete(get_request_form_token_key(request))
+
+
+@contextmanager
+def claim_request_form_token(request):
+    """
+    Yields False if the request's form token was already posted with the same data, otherwise
+    consumes it and yields True. The token is released if the block raises, so a submission that
+    could not be processed can be posted again.
+
+    Requests without a form token always yield True.
+    """
+
+    if not get_setting('SIGNED_FORM_TOKENS') or 'form_token' not in request.POST:
+        yield True
+        return
+
+    if not consume_request_form_token(request):
+        yield False
+        return
+
+    try:
+        yield True
+    except Exception:
+        release_request_form_token(request)
+        raise
+
+
+def make_form_rendered(form_id):
+    """ Returns a signed timestamp of when the form was rendered. """
+
+    signer = signing.TimestampSigner(salt=FORM_RENDERED_SALT)
+    return signer.sign(str(form_id))
+
+
+def get_form_rendered_age(value, form_id):
+    """ Returns the seconds since the form was rendered, or None if the value is not valid for the form. """
+
+    if not value or not isinstance(value, str):
+        return None
+
+    # unsigned by the base signer to get the timestamp along with the form id
+    signer = signing.Signer(salt=FORM_RENDERED_SALT)
+
+    try:
+        signed_form_id, timestamp = signer.unsign(value).rsplit(signer.sep, 1)
+    except (signing.BadSignature, ValueError):
+        return None
+
+    if signed_form_id != str(form_id):
+        return None
+
+    return time.time() - baseconv.base62.decode(timestamp)
+
+
+def make_fragment_key(form_id, form_reference, form_action, page_id=None):
+    """ Returns the signed reference, action and page of a form rendered by the fragment view. """
+
+    return signing.dumps([str(form_id), form_reference, form_action, page_id], salt=FRAGMENT_SALT)
+
+
+def load_fragment_key(key, form_id):
+    """ Returns a tuple of the (form reference, form action, page id) of the key, or None if it is not for the form. """
+
+    try:
+        signed_form_id, form_reference, form_action, page_id = signing.loads(key, salt=FRAGMENT_SALT)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+
+    if signed_form_id != str(form_id):
+        return None
+
+    return form_reference, form_action, page_id
+
+
+def make_submission_token():
+    """ Returns a unique token for a rendered form, so submitting it more than once can be detected. """
+
+    return uuid.uuid4().hex
+
+
+def get_submission_key(token, cleaned_data):
+    """
+    Returns the key a submission of a form rendered with ``token`` is recorded by, a digest of the token
+    and the submitted values. A page served from a cache gives every visitor the same token, so only
+    the same values posted with it again are the same submission.
+    """
+
+    digest = hashlib.sha1(token.encode('utf-8'))
+
+    for name, value in sorted(cleaned_data.items()):
+        if name == 'submission_token':
+            continue
+        # files are compared by their name and size
+        if isinstance(value, (list, tuple)):
+            value = [(v.name, v.size) if isinstance(v, File) else v for v in value]
+        elif isinstance(value, File):
+            value = (value.name, value.size)
+        digest.update(repr((name, value)).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def get_submission_token_key(form_id, token):
+    return 'wagtailstreamforms:submission_token:%s:%s' % (form_id, token)
+
+
+def claim_submission_token(form_id, token):
+    """
+    Returns True if the submission token has not been claimed within
+    ``WAGTAILSTREAMFORMS_DUPLICATE_SUBMISSION_WINDOW`` seconds, claiming it.
+    """
+
+    return cache.add(get_submission_token_key(form_id, token), True, get_setting('DUPLICATE_SUBMISSION_WINDOW'))
+
+
+def release_submission_token(form_id, token):
+    """ Releases a claimed submission token so the submission can be retried. """
+
+    cache.delete(get_submission_token_key(form_id, token))
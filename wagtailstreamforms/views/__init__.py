@@ -1,4 +1,13 @@
 from .advanced_settings import AdvancedSettingsView
+from .api import (
+    ChoiceSourceView,
+    FormDefinitionView,
+    FormJsonSchemaView,
+    FormSubmissionApiView,
+    FormSubmissionBatchApiView
+)
 from .copy import CopyFormView
+from .fragment import FormFragmentView
 from .submission_delete import SubmissionDeleteView
 from .submission_list import SubmissionListView
+from .submit import SubmitFormView
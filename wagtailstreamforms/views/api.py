@@ -0,0 +1,158 @@
+import json
+
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import View
+
+from wagtailstreamforms.choices import get_choice_sources, get_choices
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.batch import process_submission_batch
+from wagtailstreamforms.utils.requests import get_submitted_data
+from wagtailstreamforms.utils.responses import invalid_json_response, pre_process_response, valid_json_response
+from wagtailstreamforms.utils.spool import process_form_submission
+
+
+class FormDefinitionView(View):
+    """ Returns the form and its fields as json, with an etag of the form revision. """
+
+    http_method_names = ['get', 'head']
+    content_type = 'application/json'
+
+    def get_data(self, form_def):
+        return form_def.get_definition()
+
+    def get(self, request, slug):
+        form_def = get_object_or_404(Form, slug=slug)
+        etag = quote_etag(form_def.revision) if form_def.revision else None
+
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = JsonResponse(self.get_data(form_def), content_type=self.content_type)
+
+        if etag:
+            response['ETag'] = etag
+
+        patch_cache_control(response, public=True, max_age=get_setting('DEFINITION_MAX_AGE'))
+
+        return response
+
+
+class FormJsonSchemaView(FormDefinitionView):
+    """ Returns the JSON Schema of the form's fields, with an etag of the form revision. """
+
+    content_type = 'application/schema+json'
+
+    def get_data(self, form_def):
+        return form_def.get_json_schema()
+
+
+class ChoiceSourceView(View):
+    """ Returns the choices of a registered source, for fields that use the source. """
+
+    http_method_names = ['get', 'head']
+
+    def get(self, request, name):
+        if name not in get_choice_sources():
+            raise Http404
+
+        response = JsonResponse({
+            'name': name,
+            'choices': [[value, label] for value, label in get_choices(name)],
+        })
+
+        patch_cache_control(response, public=True, max_age=get_setting('DEFINITION_MAX_AGE'))
+
+        return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class FormSubmissionApiView(View):
+    """
+    Processes a json submission.
+
+    Only ``application/json`` is accepted, which browsers can not post cross site
+    without a CORS preflight, so the CSRF check is not needed.
+    """
+
+    http_method_names = ['post']
+
+    def post(self, request, slug):
+        # only process if settings.WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING is True
+        if not get_setting('ENABLE_FORM_PROCESSING'):
+            raise Http404
+
+        form_def = get_object_or_404(Form.objects.with_advanced_settings(), slug=slug)
+
+        if request.content_type != 'application/json':
+            return HttpResponse(status=415)
+
+        # reject spam and submissions over the rate limit before reading the submission
+        response = pre_process_response(request, form_def)
+        if response:
+            return response
+
+        data = get_submitted_data(request)
+
+        if data is None:
+            return HttpResponseBadRequest()
+
+        data = dict(data, form_id=str(form_def.pk))
+        data.setdefault('form_reference', 'api')
+
+        form = form_def.get_form(data, user=request.user)
+
+        if not form.is_valid():
+            return invalid_json_response(form_def, form)
+
+        # process the form submission
+        process_form_submission(form_def, form)
+
+        redirect_page = form_def.post_redirect_page
+        return valid_json_response(form_def, redirect_page.get_url(request) if redirect_page else None)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class FormSubmissionBatchApiView(View):
+    """
+    Processes a json list of submissions, for users with permission to add submissions.
+
+    Returns a report of the status of each submission.
+    """
+
+    http_method_names = ['post']
+
+    def post(self, request, slug):
+        # only process if settings.WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING is True
+        if not get_setting('ENABLE_FORM_PROCESSING'):
+            raise Http404
+
+        if not request.user.has_perm('wagtailstreamforms.add_formsubmission'):
+            return HttpResponseForbidden()
+
+        form_def = get_object_or_404(Form.objects.with_advanced_settings(), slug=slug)
+
+        if request.content_type != 'application/json':
+            return HttpResponse(status=415)
+
+        try:
+            items = json.loads(request.body.decode(request.encoding or 'utf-8'))
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        if not isinstance(items, list):
+            return HttpResponseBadRequest()
+
+        if len(items) > get_setting('BATCH_MAX_SIZE'):
+            return HttpResponse(status=413)
+
+        results = process_submission_batch(form_def, items, user=request.user)
+
+        return JsonResponse({
+            'processed': sum(1 for result in results if result['status'] == 'processed'),
+            'results': results,
+        })
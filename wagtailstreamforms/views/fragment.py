@@ -0,0 +1,118 @@
+from django.contrib import messages
+from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotAllowed
+from django.shortcuts import redirect
+from django.views.generic import View
+
+from wagtail.core.models import Page
+from wagtailstreamforms.blocks import WagtailFormBlock
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.utils.requests import accepts_json
+from wagtailstreamforms.utils.responses import (
+    invalid_fragment_response,
+    invalid_json_response,
+    pre_process_response,
+    valid_json_response
+)
+from wagtailstreamforms.utils.spool import process_form_submission
+from wagtailstreamforms.utils.tokens import check_request_form_token, claim_request_form_token, load_fragment_key
+
+
+class FormFragmentView(View):
+    """
+    Renders just the html of a form and processes its submissions, for pages
+    that render a placeholder in place of their forms.
+
+    The form's reference, action and page are signed into the ``key`` of the url
+    by ``WagtailFormBlock.get_fragment_url()``.
+    """
+
+    block_class = WagtailFormBlock
+
+    def dispatch(self, request, *args, **kwargs):
+        values = load_fragment_key(request.GET.get('key', ''), kwargs['pk'])
+
+        if values is None:
+            raise Http404
+
+        form_reference, form_action, page_id = values
+
+        self.block = self.block_class()
+        self.value = self.block.to_python({
+            'form': kwargs['pk'],
+            'form_action': form_action,
+            'form_reference': form_reference,
+        })
+        self.form_def = self.value.get('form')
+
+        if not self.form_def:
+            raise Http404
+
+        self.page = self.get_page(page_id)
+
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_page(self, page_id):
+        if page_id is not None:
+            page = Page.objects.live().filter(pk=page_id).first()
+            if page:
+                return page.specific
+
+    def render_fragment(self):
+        return HttpResponse(self.block.render(self.value, {
+            'request': self.request,
+            'page': self.page,
+            'streamforms_fragment': True,
+        }))
+
+    def get(self, request, *args, **kwargs):
+        return self.render_fragment()
+
+    def post(self, request, *args, **kwargs):
+        if not get_setting('ENABLE_FORM_PROCESSING'):
+            return HttpResponseNotAllowed(['GET'])
+
+        # reject spam and submissions over the rate limit before building the form
+        response = pre_process_response(request, self.form_def)
+        if response:
+            return response
+
+        # a signed form token must be valid, it is only claimed once the form is processed
+        if get_setting('SIGNED_FORM_TOKENS') and 'form_token' in request.POST:
+            if not check_request_form_token(request):
+                return HttpResponseForbidden()
+
+        form_def = self.form_def
+        form = form_def.get_form(request.POST, request.FILES, page=self.page, user=request.user)
+
+        if form.is_valid():
+            # process the form submission, a form token posted again with the same data
+            # is answered like a duplicate submission without processing it again
+            with claim_request_form_token(request) as claimed:
+                if claimed:
+                    process_form_submission(form_def, form)
+
+            # redirect to the page defined in the form or the page the form is on,
+            # without either serve a new empty form
+            redirect_page = form_def.post_redirect_page or self.page
+            redirect_url = redirect_page.get_url(request) if redirect_page else None
+
+            if accepts_json(request):
+                return valid_json_response(form_def, redirect_url)
+
+            # create success message
+            if form_def.success_message:
+                messages.success(request, form_def.success_message, fail_silently=True)
+
+            if redirect_url:
+                return redirect(redirect_url)
+
+            return self.render_fragment()
+
+        if accepts_json(request):
+            return invalid_json_response(form_def, form)
+
+        # create error message
+        if form_def.error_message:
+            messages.error(request, form_def.error_message, fail_silently=True)
+
+        return invalid_fragment_response(request, form_def, form, self.value.get('form_action'), self.page)
@@ -29,8 +29,7 @@ class SubmissionDeleteView(DeleteView):
 
     def get_submissions(self):
         submission_ids = self.request.GET.getlist('selected-submissions')
-        submission_class = self.object.get_submission_class()
-        return submission_class._default_manager.filter(id__in=submission_ids)
+        return self.object.get_submission_storage().filter(ids=submission_ids)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -48,7 +48,7 @@ class SubmissionListView(SingleObjectMixin, ListView):
 
     def csv(self):
         queryset = self.get_queryset()
-        data_fields = self.object.get_data_fields()
+        data_fields = self.object.get_submission_data_fields(queryset)
         data_headings = [smart_str(label) for name, label in data_fields]
 
         response = HttpResponse(content_type='text/csv; charset=utf-8')
@@ -66,32 +66,29 @@ class SubmissionListView(SingleObjectMixin, ListView):
         return response
 
     def get_queryset(self):
-        submission_class = self.object.get_submission_class()
-        self.queryset = submission_class._default_manager.filter(form=self.object)
+        since = until = None
 
-        # filter the queryset by the required dates
+        # filter the submissions by the required dates
         if self.filter_form.is_valid():
-            date_from = self.filter_form.cleaned_data.get('date_from')
-            date_to = self.filter_form.cleaned_data.get('date_to')
-            if date_from:
-                self.queryset = self.queryset.filter(submit_time__gte=date_from)
-            if date_to:
-                date_to += datetime.timedelta(days=1)
-                self.queryset = self.queryset.filter(submit_time__lte=date_to)
+            since = self.filter_form.cleaned_data.get('date_from')
+            until = self.filter_form.cleaned_data.get('date_to')
+            if until:
+                until += datetime.timedelta(days=1)
 
-        return self.queryset.prefetch_related('files')
+        self.queryset = self.object.get_submission_storage().filter(since=since, until=until)
+        return self.queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        data_fields = self.object.get_data_fields()
+        data_fields = self.object.get_submission_data_fields(self.object_list)
         data_headings = [label for name, label in data_fields]
 
         # populate data rows from paginator
         data_rows = []
         for s in context['page_obj']:
             form_data = s.get_data()
-            form_files = s.files.all()
+            form_files = s.get_files()
             data_row = [form_data.get(name) for name, label in data_fields]
             data_rows.append({'model_id': s.id, 'fields': data_row, 'files': form_files})
 
@@ -0,0 +1,92 @@
+from urllib.parse import urlencode
+
+from django.contrib import messages
+from django.http import Http404, HttpResponseForbidden
+from django.shortcuts import get_object_or_404, redirect
+from django.template.response import TemplateResponse
+from django.views.generic import View
+
+from wagtailstreamforms.conf import get_setting
+from wagtailstreamforms.models import Form
+from wagtailstreamforms.utils.requests import accepts_json, get_next_url
+from wagtailstreamforms.utils.responses import (
+    invalid_fragment_response,
+    invalid_json_response,
+    pre_process_response,
+    render_form_fragment,
+    valid_json_response
+)
+from wagtailstreamforms.utils.spool import process_form_submission
+from wagtailstreamforms.utils.tokens import check_request_form_token, claim_request_form_token
+
+
+class SubmitFormView(View):
+    """
+    Processes a form submission without serving the page the form is on.
+
+    Valid submissions redirect to the form's redirect page, or the ``next`` url or
+    referring page, invalid submissions render the form with its errors.
+    """
+
+    http_method_names = ['post']
+    template_name = 'streamforms/submit_form.html'
+
+    def post(self, request, pk):
+        # only process if settings.WAGTAILSTREAMFORMS_ENABLE_FORM_PROCESSING is True
+        if not get_setting('ENABLE_FORM_PROCESSING'):
+            raise Http404
+
+        form_def = get_object_or_404(Form.objects.with_advanced_settings(), pk=pk)
+
+        # reject spam and submissions over the rate limit before building the form
+        response = pre_process_response(request, form_def)
+        if response:
+            return response
+
+        # a signed form token must be valid, it is only claimed once the form is processed
+        if get_setting('SIGNED_FORM_TOKENS') and 'form_token' in request.POST:
+            if not check_request_form_token(request):
+                return HttpResponseForbidden()
+
+        form = form_def.get_form(request.POST, request.FILES, user=request.user)
+        next_url = get_next_url(request)
+
+        if form.is_valid():
+            # process the form submission, a form token posted again with the same data
+            # is answered like a duplicate submission without processing it again
+            with claim_request_form_token(request) as claimed:
+                if claimed:
+                    process_form_submission(form_def, form)
+
+            # redirect to the page defined in the form or back to where the form was posted from
+            if form_def.post_redirect_page:
+                redirect_url = form_def.post_redirect_page.get_url(request)
+            else:
+                redirect_url = next_url
+
+            if accepts_json(request):
+                return valid_json_response(form_def, redirect_url)
+
+            # create success message
+            if form_def.success_message:
+                messages.success(request, form_def.success_message, fail_silently=True)
+
+            return redirect(redirect_url)
+
+        if accepts_json(request):
+            return invalid_json_response(form_def, form)
+
+        # the form posts back here remembering where it was originally posted from
+        form_action = '%s?%s' % (request.path, urlencode({'next': next_url}))
+
+        if request.is_ajax():
+            return invalid_fragment_response(request, form_def, form, form_action)
+
+        # create error message
+        if form_def.error_message:
+            messages.error(request, form_def.error_message, fail_silently=True)
+
+        return TemplateResponse(request, self.template_name, {
+            'form_def': form_def,
+            'form_html': render_form_fragment(request, form_def, form, form_action),
+        })
@@ -1,6 +1,7 @@
 from django.conf.urls import include
 from django.contrib import messages
 from django.contrib.admin.utils import quote
+from django.http import HttpResponseForbidden
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
@@ -13,7 +14,15 @@ from wagtail.core import hooks
 from wagtailstreamforms.conf import get_setting
 from wagtailstreamforms.models import Form
 from wagtailstreamforms.utils.loading import get_advanced_settings_model
-from wagtailstreamforms.utils.requests import get_form_instance_from_request
+from wagtailstreamforms.utils.requests import accepts_json, get_form_instance_from_request
+from wagtailstreamforms.utils.responses import (
+    invalid_fragment_response,
+    invalid_json_response,
+    pre_process_response,
+    valid_json_response
+)
+from wagtailstreamforms.utils.spool import process_form_submission
+from wagtailstreamforms.utils.tokens import check_request_form_token, claim_request_form_token
 
 
 SettingsModel = get_advanced_settings_model()
@@ -98,15 +107,18 @@ class FormModelAdmin(ModelAdmin):
     button_helper_class = FormButtonHelper
     url_helper_class = FormURLHelper
 
+    def get_queryset(self, request):
+        # the advanced settings choose the storage the submission columns are read from
+        return super().get_queryset(request).with_advanced_settings()
+
     def latest_submission(self, obj):
-        submission_class = obj.get_submission_class()
-        return submission_class._default_manager.filter(form=obj).latest('submit_time').submit_time
+        for submission in obj.get_submission_storage().iterate(limit=1):
+            return submission.submit_time
 
     latest_submission.short_description = _('Latest submission')
 
     def saved_submissions(self, obj):
-        submission_class = obj.get_submission_class()
-        return submission_class._default_manager.filter(form=obj).count()
+        return obj.get_submission_storage().count()
 
     saved_submissions.short_description = _('Saved submissions')
 
@@ -131,25 +143,50 @@ def process_form(page, request, *args, **kwargs):
         form_def = get_form_instance_from_request(request)
 
         if form_def:
+            # reject spam and submissions over the rate limit before building the form
+            response = pre_process_response(request, form_def)
+            if response:
+                return response
+
+            # a signed form token must be valid, it is only claimed once the form is processed
+            if get_setting('SIGNED_FORM_TOKENS') and 'form_token' in request.POST:
+                if not check_request_form_token(request):
+                    return HttpResponseForbidden()
+
             form = form_def.get_form(request.POST, request.FILES, page=page, user=request.user)
-            context = page.get_context(request, *args, **kwargs)
 
             if form.is_valid():
-                # process the form submission
-                form_def.process_form_submission(form)
-
-                # create success message
-                if form_def.success_message:
-                    messages.success(request, form_def.success_message, fail_silently=True)
+                # process the form submission, a form token posted again with the same data
+                # is answered like a duplicate submission without processing it again
+                with claim_request_form_token(request) as claimed:
+                    if claimed:
+                        process_form_submission(form_def, form)
 
                 # redirect to the page defined in the form
                 # or the current page as a fallback - this will avoid refreshing and submitting again
                 redirect_page = form_def.post_redirect_page or page
 
-                return redirect(redirect_page.get_url(request), context=context)
+                # json requests are given the message and the url to redirect to
+                if accepts_json(request):
+                    return valid_json_response(form_def, redirect_page.get_url(request))
+
+                # create success message
+                if form_def.success_message:
+                    messages.success(request, form_def.success_message, fail_silently=True)
+
+                return redirect(redirect_page.get_url(request))
 
             else:
+                # json requests are only given the errors
+                if accepts_json(request):
+                    return invalid_json_response(form_def, form)
+
+                # ajax requests are only given the form with its errors
+                if request.is_ajax():
+                    return invalid_fragment_response(request, form_def, form, request.path, page)
+
                 # update the context with the invalid form and serve the page
+                context = page.get_context(request, *args, **kwargs)
                 context.update({
                     'invalid_stream_form_reference': form.data.get('form_reference'),
                     'invalid_stream_form': form
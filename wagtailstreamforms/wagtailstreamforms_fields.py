@@ -2,7 +2,53 @@ from django import forms
 from django.utils.translation import ugettext_lazy as _
 from wagtail.core import blocks
 
+from wagtailstreamforms.choices import SourceChoices, get_choice_sources
 from wagtailstreamforms.fields import BaseField, register
+from wagtailstreamforms.forms import IndexedChoiceField, IndexedMultipleChoiceField, ISODateTimeField
+
+
+def get_choices(block_value):
+    """ Returns a tuple of the (value, label) of each of the block's choices. """
+
+    return tuple((c.strip(), c.strip()) for c in block_value.get('choices'))
+
+
+def get_source_choices():
+    """ Returns the (name, label) of each registered source of choices. """
+
+    return sorted((name, label) for name, (source, label, timeout) in get_choice_sources().items())
+
+
+def choices_schema(schema, block_value, multiple=False):
+    """ Returns the schema of a field's value that is one of its choices, or a list of them if ``multiple``. """
+
+    values = [value for value, label in get_choices(block_value)]
+
+    if multiple:
+        schema.pop('minLength', None)
+        schema.update({
+            'type': 'array',
+            'items': {'type': 'string', 'enum': values},
+            'uniqueItems': True,
+        })
+        if block_value.get('required'):
+            schema['minItems'] = 1
+    else:
+        schema['enum'] = values if block_value.get('required') else [''] + values
+
+    return schema
+
+
+def allow_empty(schema, block_value):
+    """ Returns the schema of a field's value that can also be an empty string if the field is optional. """
+
+    if block_value.get('required'):
+        return schema
+
+    # the title, description and default describe either value
+    annotations = dict((key, schema.pop(key)) for key in ['title', 'description', 'default'] if key in schema)
+    annotations['anyOf'] = [schema, {'type': 'string', 'maxLength': 0}]
+    return annotations
 
 
 @register('singleline')
@@ -24,13 +70,23 @@ class DateField(BaseField):
     icon = 'date'
     label = _("Date field")
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema['format'] = 'date'
+        return allow_empty(schema, block_value)
+
 
 @register('datetime')
 class DateTimeField(BaseField):
-    field_class = forms.DateTimeField
+    field_class = ISODateTimeField
     icon = 'time'
     label = _("Time field")
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema['format'] = 'date-time'
+        return allow_empty(schema, block_value)
+
 
 @register('email')
 class EmailField(BaseField):
@@ -38,6 +94,11 @@ class EmailField(BaseField):
     icon = 'mail'
     label = _("Email field")
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema['format'] = 'email'
+        return allow_empty(schema, block_value)
+
 
 @register('url')
 class URLField(BaseField):
@@ -51,21 +112,30 @@ class NumberField(BaseField):
     field_class = forms.DecimalField
     label = _("Number field")
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema.pop('minLength', None)
+        schema['type'] = 'number'
+        return allow_empty(schema, block_value)
+
 
 @register('dropdown')
 class DropdownField(BaseField):
-    field_class = forms.ChoiceField
+    field_class = IndexedChoiceField
     icon = 'arrow-down-big'
     label = _("Dropdown field")
 
     def get_options(self, block_value):
         options = super().get_options(block_value)
-        choices = [(c.strip(), c.strip()) for c in block_value.get('choices')]
+        choices = get_choices(block_value)
         if block_value.get('empty_label'):
-            choices.insert(0, ('', block_value.get('empty_label')))
+            choices = (('', block_value.get('empty_label')),) + choices
         options.update({'choices': choices})
         return options
 
+    def get_json_schema(self, block_value):
+        return choices_schema(super().get_json_schema(block_value), block_value)
+
     def get_form_block(self):
         return blocks.StructBlock([
             ('label', blocks.CharBlock()),
@@ -78,16 +148,18 @@ class DropdownField(BaseField):
 
 @register('multiselect')
 class MultiSelectField(BaseField):
-    field_class = forms.MultipleChoiceField
+    field_class = IndexedMultipleChoiceField
     icon = 'list-ul'
     label = _("Multiselect field")
 
     def get_options(self, block_value):
         options = super().get_options(block_value)
-        choices = [(c.strip(), c.strip()) for c in block_value.get('choices')]
-        options.update({'choices': choices})
+        options.update({'choices': get_choices(block_value)})
         return options
 
+    def get_json_schema(self, block_value):
+        return choices_schema(super().get_json_schema(block_value), block_value, multiple=True)
+
     def get_form_block(self):
         return blocks.StructBlock([
             ('label', blocks.CharBlock()),
@@ -99,17 +171,19 @@ class MultiSelectField(BaseField):
 
 @register('radio')
 class RadioField(BaseField):
-    field_class = forms.ChoiceField
+    field_class = IndexedChoiceField
     widget = forms.widgets.RadioSelect
     icon = 'radio-empty'
     label = _("Radio buttons")
 
     def get_options(self, block_value):
         options = super().get_options(block_value)
-        choices = [(c.strip(), c.strip()) for c in block_value.get('choices')]
-        options.update({'choices': choices})
+        options.update({'choices': get_choices(block_value)})
         return options
 
+    def get_json_schema(self, block_value):
+        return choices_schema(super().get_json_schema(block_value), block_value)
+
     def get_form_block(self):
         return blocks.StructBlock([
             ('label', blocks.CharBlock()),
@@ -121,17 +195,19 @@ class RadioField(BaseField):
 
 @register('checkboxes')
 class CheckboxesField(BaseField):
-    field_class = forms.MultipleChoiceField
+    field_class = IndexedMultipleChoiceField
     widget = forms.widgets.CheckboxSelectMultiple
     icon = 'tick-inverse'
     label = _("Checkboxes")
 
     def get_options(self, block_value):
         options = super().get_options(block_value)
-        choices = [(c.strip(), c.strip()) for c in block_value.get('choices')]
-        options.update({'choices': choices})
+        options.update({'choices': get_choices(block_value)})
         return options
 
+    def get_json_schema(self, block_value):
+        return choices_schema(super().get_json_schema(block_value), block_value, multiple=True)
+
     def get_form_block(self):
         return blocks.StructBlock([
             ('label', blocks.CharBlock()),
@@ -141,12 +217,58 @@ class CheckboxesField(BaseField):
         ], icon=self.icon, label=self.label)
 
 
+@register('choicesource')
+class ChoiceSourceField(BaseField):
+    field_class = IndexedChoiceField
+    icon = 'list-ul'
+    label = _("Choices from a source")
+
+    def get_formfield(self, block_value):
+        if block_value.get('multiple'):
+            return IndexedMultipleChoiceField(**self.get_options(block_value))
+        return super().get_formfield(block_value)
+
+    def get_options(self, block_value):
+        options = super().get_options(block_value)
+        empty_label = None if block_value.get('multiple') else block_value.get('empty_label')
+        options.update({'choices': SourceChoices(block_value.get('source'), empty_label)})
+        return options
+
+    def get_json_schema(self, block_value):
+        # the choices can change without a new revision so are not part of the schema
+        schema = super().get_json_schema(block_value)
+        if block_value.get('multiple'):
+            schema.pop('minLength', None)
+            schema.update({'type': 'array', 'items': {'type': 'string'}, 'uniqueItems': True})
+            if block_value.get('required'):
+                schema['minItems'] = 1
+        return schema
+
+    def get_form_block(self):
+        return blocks.StructBlock([
+            ('label', blocks.CharBlock()),
+            ('help_text', blocks.CharBlock(required=False)),
+            ('required', blocks.BooleanBlock(required=False)),
+            ('source', blocks.ChoiceBlock(choices=get_source_choices)),
+            ('multiple', blocks.BooleanBlock(required=False)),
+            ('empty_label', blocks.CharBlock(required=False)),
+        ], icon=self.icon, label=self.label)
+
+
 @register('checkbox')
 class CheckboxField(BaseField):
     field_class = forms.BooleanField
     icon = 'tick-inverse'
     label = _("Checkbox field")
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema.pop('minLength', None)
+        schema['type'] = 'boolean'
+        if block_value.get('required'):
+            schema['enum'] = [True]
+        return schema
+
     def get_form_block(self):
         return blocks.StructBlock([
             ('label', blocks.CharBlock()),
@@ -177,6 +299,12 @@ class SingleFileField(BaseField):
             ('required', blocks.BooleanBlock(required=False)),
         ], icon=self.icon, label=self.label)
 
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema.pop('minLength', None)
+        schema['format'] = 'binary'
+        return schema
+
 
 @register('multifile')
 class MultiFileField(BaseField):
@@ -191,3 +319,9 @@ class MultiFileField(BaseField):
             ('help_text', blocks.CharBlock(required=False)),
             ('required', blocks.BooleanBlock(required=False)),
         ], icon=self.icon, label=self.label)
+
+    def get_json_schema(self, block_value):
+        schema = super().get_json_schema(block_value)
+        schema.pop('minLength', None)
+        schema['format'] = 'binary'
+        return schema
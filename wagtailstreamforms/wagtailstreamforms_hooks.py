@@ -1,35 +1,131 @@
 import json
+import logging
 
+from django.db import DatabaseError, IntegrityError
 from django.template.defaultfilters import pluralize
+from django.utils.translation import ugettext as _
 
+from wagtailstreamforms.conf import get_setting
 from wagtailstreamforms.hooks import register
-from wagtailstreamforms.models import FormSubmissionFile
-from wagtailstreamforms.serializers import FormSubmissionSerializer
+from wagtailstreamforms.serializers import FormSubmissionSerializer, encode_form_data
+from wagtailstreamforms.utils.requests import get_submitted_data
+from wagtailstreamforms.utils.spool import buffer_submission, spool_submission
+from wagtailstreamforms.utils.tokens import get_form_rendered_age
 
 
-@register('process_form_submission')
-def save_form_submission_data(instance, form):
-    """ saves the form submission data """
+logger = logging.getLogger(__name__)
+
+
+def get_submission_data(form):
+    """ the json stored for a submitted form """
 
     # copy the cleaned_data so we dont mess with the original
     submission_data = form.cleaned_data.copy()
 
+    # the submission token is saved in its own column
+    submission_data.pop('submission_token', None)
+
     # change the submission data to a count of the files
     for field in form.files.keys():
         count = len(form.files.getlist(field))
         submission_data[field] = '{} file{}'.format(count, pluralize(count))
 
-    # save the submission data
-    submission = instance.get_submission_class().objects.create(
-        form_data=json.dumps(submission_data, cls=FormSubmissionSerializer),
-        form=instance
-    )
-
-    # save the form files
-    for field in form.files:
-        for file in form.files.getlist(field):
-            FormSubmissionFile.objects.create(
-                submission=submission,
-                field=field,
-                file=file
-            )
+    return encode_form_data(json.dumps(submission_data, cls=FormSubmissionSerializer))
+
+
+def get_submission(instance, form):
+    """ the submission written to the form's storage """
+
+    return {
+        'form_data': get_submission_data(form),
+        'field_schema_id': instance.get_field_schema().pk,
+        'submission_token': form.cleaned_data.get('submission_token') or None,
+        'files': form.files,
+    }
+
+
+@register('process_form_submission')
+def save_form_submission_data(instance, form):
+    """ saves the form submission data """
+
+    storage = instance.get_submission_storage()
+    submission_token = form.cleaned_data.get('submission_token') or None
+
+    # the submission is saved by the next flush of the buffer, the files need the saved submission
+    if storage.uses_database and get_setting('SUBMISSION_BUFFER') and not form.files:
+        buffer_submission(instance, get_submission_data(form), submission_token)
+        return
+
+    submission = get_submission(instance, form)
+
+    try:
+        storage.write([submission])
+    except IntegrityError:
+        # saving it again would fail the same way
+        raise
+    except DatabaseError:
+        # the submission is saved by the replayspool command once the database is available
+        if not storage.uses_database or not get_setting('SUBMISSION_SPOOL_DIR'):
+            raise
+        logger.exception('Could not save a submission of form %s, writing it to the spool', instance.pk)
+        spool_submission(instance, submission['form_data'], submission_token, form.files)
+
+
+def save_form_submission_data_batch(instance, forms):
+    """ saves the data of many form submissions, in a single query for those without files """
+
+    storage = instance.get_submission_storage()
+
+    if storage.uses_database and get_setting('SUBMISSION_BUFFER'):
+        for form in forms:
+            save_form_submission_data(instance, form)
+        return
+
+    storage.write([get_submission(instance, form) for form in forms])
+
+
+save_form_submission_data.process_batch = save_form_submission_data_batch
+
+
+@register('pre_process_form_submission')
+def check_submission_size(instance, request):
+    """ rejects submissions larger than settings.WAGTAILSTREAMFORMS_MAX_SUBMISSION_SIZE bytes """
+
+    max_size = get_setting('MAX_SUBMISSION_SIZE')
+
+    try:
+        size = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        size = 0
+
+    if max_size and size > max_size:
+        return _('The submission is too large.')
+
+
+@register('pre_process_form_submission')
+def check_honeypot(instance, request):
+    """ rejects submissions that filled in the hidden settings.WAGTAILSTREAMFORMS_HONEYPOT_FIELD """
+
+    field = get_setting('HONEYPOT_FIELD')
+
+    if field and (get_submitted_data(request) or {}).get(field):
+        return _('The submission was rejected.')
+
+
+@register('pre_process_form_submission')
+def check_min_fill_time(instance, request):
+    """ rejects submissions posted within settings.WAGTAILSTREAMFORMS_MIN_FILL_TIME seconds of rendering """
+
+    min_fill_time = get_setting('MIN_FILL_TIME')
+
+    if not min_fill_time:
+        return
+
+    # json submissions need the value rendered in the form as well
+    age = get_form_rendered_age((get_submitted_data(request) or {}).get('form_rendered'), instance.pk)
+
+    if age is None:
+        return _('The form has expired, please try again.')
+
+    if age < min_fill_time:
+        return _('The form was submitted too quickly, please try again.')